@@ -0,0 +1,34 @@
+"""Add ventas (vendedor_id, fecha) index
+
+Revision ID: 3f1c9a7d2b64
+Revises: ea8ff56aacb8
+Create Date: 2026-10-19 15:20:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = 'ea8ff56aacb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existe_ventas() -> bool:
+    """Las migraciones iniciales no crean la tabla ventas"""
+    return 'ventas' in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    # En ventas particionada el índice se crea en cada partición
+    if _existe_ventas():
+        op.create_index('ix_ventas_vendedor_fecha', 'ventas', ['vendedor_id', 'fecha'])
+
+
+def downgrade() -> None:
+    if _existe_ventas():
+        op.drop_index('ix_ventas_vendedor_fecha', table_name='ventas')
@@ -0,0 +1,57 @@
+"""Money columns as numeric
+
+Revision ID: b835552dfa57
+Revises: edcc763a9d94
+Create Date: 2026-10-19 13:05:52.379368
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b835552dfa57'
+down_revision: Union[str, None] = 'edcc763a9d94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columnas de dinero: (tabla, columna)
+COLUMNAS = [('productos', 'precio'), ('ventas', 'total')]
+
+
+def _tablas() -> set:
+    """Tablas existentes (las migraciones iniciales no crean productos ni ventas)"""
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    # Float -> NUMERIC(12, 2): los montos existentes se redondean a centavos
+    tablas = _tablas()
+    for tabla, columna in COLUMNAS:
+        if tabla not in tablas:
+            continue
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.alter_column(
+                columna,
+                existing_type=sa.Float(),
+                type_=sa.Numeric(12, 2),
+                existing_nullable=False,
+                postgresql_using=f'round({columna}::numeric, 2)'
+            )
+
+
+def downgrade() -> None:
+    tablas = _tablas()
+    for tabla, columna in reversed(COLUMNAS):
+        if tabla not in tablas:
+            continue
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.alter_column(
+                columna,
+                existing_type=sa.Numeric(12, 2),
+                type_=sa.Float(),
+                existing_nullable=False
+            )
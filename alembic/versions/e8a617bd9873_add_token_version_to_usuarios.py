@@ -0,0 +1,30 @@
+"""Add token_version to usuarios for stateless auth
+
+Revision ID: e8a617bd9873
+Revises: 56ffef2608ca
+Create Date: 2026-10-19 12:38:46.363806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a617bd9873'
+down_revision: Union[str, None] = '56ffef2608ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'usuarios',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('usuarios') as batch_op:
+        batch_op.drop_column('token_version')
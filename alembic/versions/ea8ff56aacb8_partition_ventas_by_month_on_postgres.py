@@ -0,0 +1,96 @@
+"""Partition ventas by month on postgres (VENTAS_PARTICIONADAS=true)
+
+Revision ID: ea8ff56aacb8
+Revises: b835552dfa57
+Create Date: 2026-10-19 13:08:05.547194
+
+"""
+from typing import Sequence, Union
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils import particiones
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ea8ff56aacb8'
+down_revision: Union[str, None] = 'b835552dfa57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNAS = "id, producto_id, vendedor_id, cantidad, total, fecha"
+
+
+def _aplica(bind) -> bool:
+    """Solo PostgreSQL con VENTAS_PARTICIONADAS=true y la tabla ventas existente"""
+    return (
+        bind.dialect.name == "postgresql"
+        and particiones.VENTAS_PARTICIONADAS
+        and "ventas" in sa.inspect(bind).get_table_names()
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not _aplica(bind) or particiones.esta_particionada(bind):
+        return
+
+    op.execute("ALTER TABLE ventas RENAME TO ventas_legado")
+    op.execute("ALTER TABLE ventas_legado RENAME CONSTRAINT ventas_pkey TO ventas_legado_pkey")
+    op.execute("ALTER INDEX IF EXISTS ix_ventas_id RENAME TO ix_ventas_legado_id")
+
+    # La clave de partición debe formar parte de la primary key
+    op.execute("""
+        CREATE TABLE ventas (
+            id INTEGER NOT NULL DEFAULT nextval('ventas_id_seq'),
+            producto_id INTEGER NOT NULL REFERENCES productos (id),
+            vendedor_id INTEGER NOT NULL REFERENCES usuarios (id),
+            cantidad INTEGER NOT NULL,
+            total NUMERIC(12, 2) NOT NULL,
+            fecha TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, fecha)
+        ) PARTITION BY RANGE (fecha)
+    """)
+    op.execute("CREATE INDEX ix_ventas_id ON ventas (id)")
+
+    hoy = date.today()
+    primera = bind.execute(sa.text("SELECT min(fecha) FROM ventas_legado")).scalar()
+    desde = primera.date() if primera else hoy
+    particiones.crear_particiones(
+        bind, desde, particiones.sumar_meses(hoy, particiones.PARTICIONES_MESES_FUTUROS)
+    )
+
+    op.execute(
+        f"INSERT INTO ventas ({COLUMNAS}) "
+        "SELECT id, producto_id, vendedor_id, cantidad, total, COALESCE(fecha, now()) FROM ventas_legado"
+    )
+    op.execute("ALTER SEQUENCE ventas_id_seq OWNED BY ventas.id")
+    op.execute("DROP TABLE ventas_legado")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not particiones.esta_particionada(bind):
+        return
+
+    op.execute("""
+        CREATE TABLE ventas_plana (
+            id INTEGER NOT NULL DEFAULT nextval('ventas_id_seq'),
+            producto_id INTEGER NOT NULL REFERENCES productos (id),
+            vendedor_id INTEGER NOT NULL REFERENCES usuarios (id),
+            cantidad INTEGER NOT NULL,
+            total NUMERIC(12, 2) NOT NULL,
+            fecha TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+            CONSTRAINT ventas_plana_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO ventas_plana ({COLUMNAS}) SELECT {COLUMNAS} FROM ventas")
+    op.execute("ALTER SEQUENCE ventas_id_seq OWNED BY ventas_plana.id")
+    op.execute("DROP TABLE ventas CASCADE")
+    op.execute("ALTER TABLE ventas_plana RENAME TO ventas")
+    op.execute("ALTER TABLE ventas RENAME CONSTRAINT ventas_plana_pkey TO ventas_pkey")
+    op.execute("CREATE INDEX ix_ventas_id ON ventas (id)")
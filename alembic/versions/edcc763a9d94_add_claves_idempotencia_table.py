@@ -0,0 +1,39 @@
+"""Add claves_idempotencia table
+
+Revision ID: edcc763a9d94
+Revises: 83e434716142
+Create Date: 2026-10-19 13:00:59.630631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'edcc763a9d94'
+down_revision: Union[str, None] = '83e434716142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'claves_idempotencia',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('ruta', sa.String(), nullable=False),
+        sa.Column('clave', sa.String(), nullable=False),
+        sa.Column('huella', sa.String(), nullable=False),
+        sa.Column('estado_http', sa.Integer(), nullable=True),
+        sa.Column('respuesta', sa.Text(), nullable=True),
+        sa.Column('expira', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('usuario_id', 'ruta', 'clave', name='uq_claves_idempotencia')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('claves_idempotencia')
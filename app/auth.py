@@ -2,24 +2,50 @@
 Autenticación JWT y Password Hashing
 Funciones para generación de tokens y validación de contraseñas
 """
+import hashlib
+import hmac
+import os
+import secrets
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app import schemas, crud
 from app.database import get_db
+from app.utils.jwt_cache import cache_tokens
+from app.utils.revocacion import registro_versiones_token
 
 # Configuración de seguridad
 SECRET_KEY = "tu-clave-secreta-super-segura-cambiala-en-produccion"  # Cambiar en producción
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+# Validación sin consultas a BD usando los claims uid/rol/ver del token
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "true").lower() == "true"
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+class TokenInvalido(Exception):
+    """Token JWT inválido, mal formado o expirado"""
+
+@lru_cache(maxsize=None)
+def _jose():
+    """
+    Importa python-jose en el primer uso
+
+    La importación arrastra cryptography y retrasa el arranque en frío,
+    así que se difiere hasta el primer token emitido o validado
+
+    Returns:
+        Tupla (módulo jwt, excepción JWTError)
+    """
+    from jose import JWTError, jwt
+    return jwt, JWTError
+
 def verificar_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica si la contraseña plana coincide con el hash
@@ -31,6 +57,7 @@ def verificar_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True si coinciden, False caso contrario
     """
+    import bcrypt
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 def hashear_password(password: str) -> str:
@@ -43,6 +70,7 @@ def hashear_password(password: str) -> str:
     Returns:
         Hash de la contraseña
     """
+    import bcrypt
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
@@ -65,9 +93,136 @@ def crear_access_token(data: dict, expires_delta: Optional[timedelta] = None) ->
         expire = datetime.utcnow() + timedelta(minutes=15)
 
     to_encode.update({"exp": expire})
+    jwt, _ = _jose()
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def claims_usuario(usuario) -> dict:
+    """
+    Construye los claims del token de acceso para un usuario
+
+    Incluye uid, rol y token_version para que la autorización
+    no requiera consultar la base de datos
+
+    Args:
+        usuario: Usuario autenticado
+
+    Returns:
+        Dict con los claims sub, uid, rol y ver
+    """
+    return {
+        "sub": usuario.email,
+        "uid": usuario.id,
+        "rol": usuario.rol,
+        "ver": usuario.token_version or 0
+    }
+
+def decodificar_token(token: str) -> dict:
+    """
+    Decodifica y valida un token JWT
+
+    Los claims de tokens ya verificados se sirven desde cache_tokens
+    hasta su expiración, sin repetir la verificación HMAC
+
+    Args:
+        token: Token JWT
+
+    Returns:
+        Claims contenidos en el token (no deben modificarse)
+
+    Raises:
+        TokenInvalido: Si el token es inválido o expiró
+    """
+    claims = cache_tokens.obtener(token) if cache_tokens.habilitado else None
+    if claims is None:
+        jwt, JWTError = _jose()
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError as e:
+            raise TokenInvalido(str(e)) from e
+        cache_tokens.guardar(token, claims)
+    return claims
+
+def hashear_refresh_token(token: str) -> str:
+    """
+    Calcula el HMAC-SHA256 de un refresh token
+
+    Los refresh tokens son aleatorios, así que un HMAC basta para
+    guardarlos de forma segura (no requiere bcrypt)
+
+    Args:
+        token: Refresh token en claro
+
+    Returns:
+        Digest hexadecimal usado como clave en la base de datos
+    """
+    return hmac.new(SECRET_KEY.encode('utf-8'), token.encode('utf-8'), hashlib.sha256).hexdigest()
+
+def emitir_refresh_token(db: Session, usuario_id: int, familia: Optional[str] = None) -> str:
+    """
+    Genera y registra un refresh token para un usuario
+
+    Args:
+        db: Sesión de base de datos
+        usuario_id: ID del usuario
+        familia: Familia de rotación (se crea una nueva si no se indica)
+
+    Returns:
+        Refresh token en claro (solo se entrega una vez al cliente)
+    """
+    token = secrets.token_urlsafe(32)
+    crud.crear_refresh_token(
+        db,
+        usuario_id=usuario_id,
+        token_hash=hashear_refresh_token(token),
+        familia=familia or secrets.token_hex(16),
+        expira=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return token
+
+def renovar_sesion(db: Session, refresh_token: str):
+    """
+    Renueva una sesión rotando el refresh token
+
+    Cuesta una consulta indexada y un HMAC, sin verificar contraseña.
+    Presentar un refresh token ya rotado se considera robo del token
+    y revoca toda su familia.
+
+    Args:
+        db: Sesión de base de datos
+        refresh_token: Refresh token en claro
+
+    Returns:
+        Tupla (access_token, refresh_token nuevo) o None si el token no es válido
+    """
+    resultado = crud.obtener_refresh_token(db, hashear_refresh_token(refresh_token))
+    if resultado is None:
+        return None
+
+    db_token, usuario = resultado
+    if db_token.revocado:
+        crud.revocar_familia_refresh(db, db_token.familia)
+        return None
+    if db_token.expira <= datetime.utcnow():
+        return None
+
+    nuevo_refresh = secrets.token_urlsafe(32)
+    rotado = crud.rotar_refresh_token(
+        db,
+        db_token,
+        nuevo_hash=hashear_refresh_token(nuevo_refresh),
+        expira=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    if rotado is None:
+        # Otro request lo rotó primero: mismo tratamiento que un reuso
+        crud.revocar_familia_refresh(db, db_token.familia)
+        return None
+    access_token = crear_access_token(
+        data=claims_usuario(usuario),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return access_token, nuevo_refresh
+
 def verificar_credenciales(db: Session, email: str, password: str):
     """
     Verifica credenciales de usuario
@@ -111,12 +266,12 @@ async def obtener_usuario_actual(
     )
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decodificar_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = schemas.TokenData(email=email)
-    except JWTError:
+    except TokenInvalido:
         raise credentials_exception
 
     usuario = crud.obtener_usuario_por_email(db, email=token_data.email)
@@ -125,6 +280,71 @@ async def obtener_usuario_actual(
 
     return usuario
 
+def usuario_de_token(token: str, db: Session):
+    """
+    Valida un token de acceso y obtiene su usuario
+
+    Con AUTH_STATELESS activo y un token que incluye uid y rol, no consulta
+    la base de datos: solo verifica el claim `ver` contra el registro de
+    versiones en memoria (refrescado cada AUTH_REVOCACION_TTL segundos).
+    En otro caso busca al usuario por el email del token.
+
+    Args:
+        token: Token JWT
+        db: Sesión de base de datos (solo se usa al refrescar o en modo con BD)
+
+    Returns:
+        schemas.UsuarioToken con id, email y rol, o el Usuario de BD
+
+    Raises:
+        TokenInvalido: Si el token es inválido, fue revocado o el usuario no existe
+    """
+    payload = decodificar_token(token)
+    email: str = payload.get("sub")
+    if email is None:
+        raise TokenInvalido("El token no identifica al usuario")
+
+    if not AUTH_STATELESS or "uid" not in payload or "rol" not in payload:
+        usuario = crud.obtener_usuario_por_email(db, email=email)
+        if usuario is None:
+            raise TokenInvalido("El usuario del token no existe")
+        return usuario
+
+    if registro_versiones_token.expirado():
+        registro_versiones_token.refrescar(crud.listar_versiones_token(db))
+    if payload.get("ver", 0) != registro_versiones_token.version(payload["uid"]):
+        raise TokenInvalido("El token fue revocado")
+
+    return schemas.UsuarioToken(id=payload["uid"], email=email, rol=payload["rol"])
+
+async def obtener_usuario_token(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene el usuario actual desde los claims del token JWT
+
+    Ver usuario_de_token: con claims uid/rol no consulta la base de datos.
+
+    Args:
+        token: Token JWT
+        db: Sesión de base de datos (solo se usa al refrescar o en modo con BD)
+
+    Returns:
+        schemas.UsuarioToken con id, email y rol, o el Usuario de BD
+
+    Raises:
+        HTTPException: Si el token es inválido o fue revocado
+    """
+    try:
+        return usuario_de_token(token, db)
+    except TokenInvalido:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 def rol_requerido(roles_permitidos: list[str]):
     """
     Dependency factory para verificar que el usuario tenga uno de los roles permitidos
@@ -138,7 +358,7 @@ def rol_requerido(roles_permitidos: list[str]):
     Raises:
         HTTPException: Si el usuario no tiene un rol permitido
     """
-    async def verificar_rol(usuario_actual = Depends(obtener_usuario_actual)):
+    async def verificar_rol(usuario_actual = Depends(obtener_usuario_token)):
         if usuario_actual.rol not in roles_permitidos:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -3,9 +3,44 @@ CRUD Operations
 Operaciones de base de datos para cada modelo
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime
+from sqlalchemy import exists, func, desc
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime, timedelta
+from typing import Callable
+from decimal import Decimal, ROUND_HALF_UP
 from app import models, schemas
+from app.utils import analitica
+from app.utils.archivo_ventas import archivo_ventas
+from app.utils.directorio_vendedores import directorio_vendedores
+from app.utils.inventario import canal_inventario
+
+# Precisión de los montos de dinero (Numeric(12, 2))
+CENTAVO = Decimal("0.01")
+
+def _centavos(monto) -> Decimal:
+    """
+    Redondea un monto a centavos con redondeo comercial
+
+    Args:
+        monto: Monto como Decimal (o convertible a Decimal)
+
+    Returns:
+        Decimal con dos decimales
+    """
+    return Decimal(str(monto)).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+
+def _columnas(modelo, schema):
+    """
+    Columnas del modelo que corresponden a los campos de un schema de respuesta
+
+    Args:
+        modelo: Modelo SQLAlchemy
+        schema: Schema Pydantic de respuesta
+
+    Returns:
+        Lista de columnas para usar en db.query(...)
+    """
+    return [getattr(modelo, campo) for campo in schema.model_fields]
 
 def crear_vendedor(db: Session, vendedor: schemas.VendedorRegistro):
     """
@@ -21,7 +56,6 @@ def crear_vendedor(db: Session, vendedor: schemas.VendedorRegistro):
     db_vendedor = models.Vendedor(**vendedor.model_dump())
     db.add(db_vendedor)
     db.commit()
-    db.refresh(db_vendedor)
     return db_vendedor
 
 # CRUD de Usuarios (Autenticación)
@@ -58,20 +92,275 @@ def crear_usuario(db: Session, usuario: schemas.UsuarioRegistro, password_hash:
     )
     db.add(db_usuario)
     db.commit()
-    db.refresh(db_usuario)
     return db_usuario
 
-def listar_usuarios(db: Session):
+def _filtrar_usuarios(query, rol: str = None, email_prefijo: str = None):
+    """
+    Aplica los filtros de rol y prefijo de email a una consulta de usuarios
+
+    Args:
+        query: Consulta sobre models.Usuario
+        rol: Rol exacto (opcional)
+        email_prefijo: Inicio del email (opcional, los comodines se escapan)
+
+    Returns:
+        Consulta filtrada
+    """
+    if rol is not None:
+        query = query.filter(models.Usuario.rol == rol)
+    if email_prefijo:
+        escapado = email_prefijo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.filter(models.Usuario.email.like(f"{escapado}%", escape="\\"))
+    return query
+
+def listar_usuarios_filas(
+    db: Session,
+    limite: int = 50,
+    despues_de: int = None,
+    rol: str = None,
+    email_prefijo: str = None
+):
+    """
+    Lista una página de usuarios como filas de solo lectura
+
+    Selecciona solo las columnas de UsuarioResponse (el hash de password
+    nunca sale de la base) y pagina por id: cada página continúa después
+    del último id de la anterior, con costo constante sin importar la
+    profundidad
+
+    Args:
+        db: Sesión de base de datos
+        limite: Cantidad máxima de filas
+        despues_de: Último id de la página anterior (opcional)
+        rol: Rol exacto (opcional)
+        email_prefijo: Inicio del email (opcional)
+
+    Returns:
+        Lista de filas con los campos de UsuarioResponse ordenadas por id
+    """
+    query = _filtrar_usuarios(db.query(*_columnas(models.Usuario, schemas.UsuarioResponse)), rol, email_prefijo)
+    if despues_de is not None:
+        query = query.filter(models.Usuario.id > despues_de)
+    return query.order_by(models.Usuario.id).limit(limite).all()
+
+def contar_usuarios(db: Session, rol: str = None, email_prefijo: str = None) -> int:
+    """
+    Cuenta los usuarios que cumplen los filtros
+
+    Args:
+        db: Sesión de base de datos
+        rol: Rol exacto (opcional)
+        email_prefijo: Inicio del email (opcional)
+
+    Returns:
+        Cantidad de usuarios
+    """
+    return _filtrar_usuarios(db.query(func.count(models.Usuario.id)), rol, email_prefijo).scalar()
+
+def listar_versiones_token(db: Session):
+    """
+    Lista las versiones de token de los usuarios con tokens revocados
+
+    Solo retorna usuarios con token_version > 0, que son los únicos
+    cuyos tokens pueden haber quedado obsoletos
+
+    Args:
+        db: Sesión de base de datos
+
+    Returns:
+        Dict de usuario_id a token_version
+    """
+    resultados = db.query(models.Usuario.id, models.Usuario.token_version).filter(
+        models.Usuario.token_version > 0
+    ).all()
+    return {r.id: r.token_version for r in resultados}
+
+def revocar_tokens_usuario(db: Session, usuario_id: int):
+    """
+    Invalida todos los tokens emitidos para un usuario incrementando su token_version
+
+    También revoca sus refresh tokens activos
+
+    Args:
+        db: Sesión de base de datos
+        usuario_id: ID del usuario
+
+    Returns:
+        Usuario actualizado o None si no existe
+    """
+    db_usuario = db.query(models.Usuario).filter(models.Usuario.id == usuario_id).first()
+    if db_usuario is None:
+        return None
+
+    db_usuario.token_version = (db_usuario.token_version or 0) + 1
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.usuario_id == usuario_id,
+        models.RefreshToken.revocado == False
+    ).update({"revocado": True}, synchronize_session=False)
+    db.commit()
+    return db_usuario
+
+# CRUD de Refresh Tokens (Sesiones)
+def crear_refresh_token(db: Session, usuario_id: int, token_hash: str, familia: str, expira: datetime):
+    """
+    Registra un refresh token emitido para un usuario
+
+    Args:
+        db: Sesión de base de datos
+        usuario_id: ID del usuario
+        token_hash: HMAC del refresh token (nunca se guarda el token en claro)
+        familia: Identificador de la cadena de rotaciones
+        expira: Fecha de expiración
+
+    Returns:
+        RefreshToken creado
+    """
+    db_token = models.RefreshToken(
+        usuario_id=usuario_id,
+        token_hash=token_hash,
+        familia=familia,
+        expira=expira
+    )
+    db.add(db_token)
+    db.commit()
+    return db_token
+
+def obtener_refresh_token(db: Session, token_hash: str):
+    """
+    Obtiene un refresh token y su usuario en una sola consulta indexada
+
+    Args:
+        db: Sesión de base de datos
+        token_hash: HMAC del refresh token
+
+    Returns:
+        Tupla (RefreshToken, Usuario) o None si no existe
+    """
+    return db.query(models.RefreshToken, models.Usuario).join(
+        models.Usuario, models.RefreshToken.usuario_id == models.Usuario.id
+    ).filter(models.RefreshToken.token_hash == token_hash).first()
+
+def rotar_refresh_token(db: Session, db_token: models.RefreshToken, nuevo_hash: str, expira: datetime):
     """
-    Lista todos los usuarios del sistema
+    Revoca un refresh token y emite su reemplazo en la misma familia
+
+    La revocación es un UPDATE condicionado a que el token siga vigente:
+    si dos requests rotan el mismo token a la vez, solo uno afecta la fila
+    y el otro se trata como reuso.
 
     Args:
         db: Sesión de base de datos
+        db_token: Refresh token a rotar
+        nuevo_hash: HMAC del nuevo refresh token
+        expira: Fecha de expiración del nuevo token
 
     Returns:
-        Lista de todos los usuarios
+        RefreshToken nuevo, o None si el token ya había sido rotado
     """
-    return db.query(models.Usuario).all()
+    revocados = db.query(models.RefreshToken).filter(
+        models.RefreshToken.id == db_token.id,
+        models.RefreshToken.revocado == False
+    ).update({"revocado": True}, synchronize_session=False)
+    if revocados == 0:
+        db.rollback()
+        return None
+
+    nuevo = models.RefreshToken(
+        usuario_id=db_token.usuario_id,
+        token_hash=nuevo_hash,
+        familia=db_token.familia,
+        expira=expira
+    )
+    db.add(nuevo)
+    db.commit()
+    return nuevo
+
+def revocar_familia_refresh(db: Session, familia: str):
+    """
+    Revoca todos los refresh tokens de una familia (cierre de sesión o reuso detectado)
+
+    Args:
+        db: Sesión de base de datos
+        familia: Identificador de la cadena de rotaciones
+
+    Returns:
+        Cantidad de tokens revocados
+    """
+    revocados = db.query(models.RefreshToken).filter(
+        models.RefreshToken.familia == familia,
+        models.RefreshToken.revocado == False
+    ).update({"revocado": True}, synchronize_session=False)
+    db.commit()
+    return revocados
+
+# CRUD de Claves de Idempotencia
+def reclamar_clave_idempotencia(db: Session, usuario_id: int, ruta: str, clave: str, huella: str, expira: datetime):
+    """
+    Reclama una clave de idempotencia para procesar un request
+
+    El INSERT contra la restricción única (usuario_id, ruta, clave) decide
+    un único ganador entre requests concurrentes. Antes de insertar se
+    eliminan las claves expiradas del usuario.
+
+    La clave ganadora queda pendiente en la transacción (no se confirma):
+    se confirma junto con la escritura y su respuesta, así que un fallo
+    en cualquier punto la descarta. Un duplicado concurrente espera en el
+    INSERT hasta que la transacción ganadora termine.
+
+    Args:
+        db: Sesión de base de datos
+        usuario_id: ID del usuario que envía el request
+        ruta: Ruta del endpoint
+        clave: Valor del header Idempotency-Key
+        huella: Hash del cuerpo del request
+        expira: Fecha de expiración de la clave
+
+    Returns:
+        Tupla (ClaveIdempotencia, ganador). Si no se ganó la clave retorna el
+        registro existente (o None si fue liberado entre medio)
+    """
+    db.query(models.ClaveIdempotencia).filter(
+        models.ClaveIdempotencia.usuario_id == usuario_id,
+        models.ClaveIdempotencia.expira <= datetime.utcnow()
+    ).delete()
+
+    db_clave = models.ClaveIdempotencia(
+        usuario_id=usuario_id,
+        ruta=ruta,
+        clave=clave,
+        huella=huella,
+        expira=expira
+    )
+    db.add(db_clave)
+    try:
+        db.flush()
+        return db_clave, True
+    except IntegrityError:
+        db.rollback()
+
+    existente = db.query(models.ClaveIdempotencia).filter(
+        models.ClaveIdempotencia.usuario_id == usuario_id,
+        models.ClaveIdempotencia.ruta == ruta,
+        models.ClaveIdempotencia.clave == clave
+    ).first()
+    return existente, False
+
+def guardar_respuesta_idempotencia(db: Session, db_clave: models.ClaveIdempotencia, estado_http: int, respuesta: str):
+    """
+    Guarda la respuesta del request original para repetirla en reintentos
+
+    No confirma: se llama antes del commit de la escritura, en la misma
+    transacción que la reclamó
+
+    Args:
+        db: Sesión de base de datos
+        db_clave: Clave reclamada
+        estado_http: Código HTTP de la respuesta
+        respuesta: Cuerpo JSON de la respuesta
+    """
+    db_clave.estado_http = estado_http
+    db_clave.respuesta = respuesta
+    db.flush()
 
 # CRUD de Productos (Inventario)
 def crear_producto(db: Session, producto: schemas.ProductoCrear):
@@ -88,20 +377,22 @@ def crear_producto(db: Session, producto: schemas.ProductoCrear):
     db_producto = models.Producto(**producto.model_dump())
     db.add(db_producto)
     db.commit()
-    db.refresh(db_producto)
     return db_producto
 
-def listar_productos(db: Session):
+def listar_productos_filas(db: Session):
     """
-    Lista todos los productos del inventario
+    Lista los productos como filas de solo lectura
+
+    Selecciona únicamente las columnas de ProductoResponse y retorna filas
+    ligeras: no se crean entidades ORM ni se registran en el identity map
 
     Args:
         db: Sesión de base de datos
 
     Returns:
-        Lista de todos los productos
+        Lista de filas con los campos de ProductoResponse
     """
-    return db.query(models.Producto).all()
+    return db.query(*_columnas(models.Producto, schemas.ProductoResponse)).order_by(models.Producto.id).all()
 
 def obtener_producto_por_id(db: Session, producto_id: int):
     """
@@ -138,11 +429,14 @@ def actualizar_producto(db: Session, producto_id: int, producto_update: schemas.
         setattr(db_producto, field, value)
 
     db.commit()
-    db.refresh(db_producto)
+
+    # Notificar el stock nuevo al canal de inventario
+    if "stock" in update_data:
+        canal_inventario.publicar(db_producto.id, db_producto.stock)
     return db_producto
 
 # CRUD de Ventas
-def crear_venta(db: Session, venta: schemas.VentaCrear, vendedor_id: int):
+def crear_venta(db: Session, venta: schemas.VentaCrear, vendedor_id: int, antes_de_confirmar: Callable = None):
     """
     Crea una nueva venta en la base de datos
 
@@ -152,6 +446,8 @@ def crear_venta(db: Session, venta: schemas.VentaCrear, vendedor_id: int):
         db: Sesión de base de datos
         venta: Datos de la venta a crear
         vendedor_id: ID del vendedor que realiza la venta
+        antes_de_confirmar: Función que recibe la venta ya insertada y se
+            ejecuta en la misma transacción, antes del commit (opcional)
 
     Returns:
         Venta creada o None si no hay stock suficiente
@@ -168,8 +464,8 @@ def crear_venta(db: Session, venta: schemas.VentaCrear, vendedor_id: int):
     if producto.stock < venta.cantidad:
         raise ValueError(f"Stock insuficiente. Disponible: {producto.stock}, solicitado: {venta.cantidad}")
 
-    # Calcular total
-    total = producto.precio * venta.cantidad
+    # Calcular total (Decimal exacto)
+    total = _centavos(producto.precio * venta.cantidad)
 
     # Crear venta
     db_venta = models.Venta(
@@ -183,11 +479,16 @@ def crear_venta(db: Session, venta: schemas.VentaCrear, vendedor_id: int):
     # Reducir stock del producto
     producto.stock -= venta.cantidad
 
+    if antes_de_confirmar is not None:
+        db.flush()
+        antes_de_confirmar(db_venta)
     db.commit()
-    db.refresh(db_venta)
+
+    # Notificar el stock nuevo al canal de inventario
+    canal_inventario.publicar(producto.id, producto.stock)
     return db_venta
 
-def crear_venta_admin(db: Session, venta: schemas.VentaCrearAdmin):
+def crear_venta_admin(db: Session, venta: schemas.VentaCrearAdmin, antes_de_confirmar: Callable = None):
     """
     Crea una nueva venta como admin (especifica vendedor_id y precio_unitario)
 
@@ -196,6 +497,8 @@ def crear_venta_admin(db: Session, venta: schemas.VentaCrearAdmin):
     Args:
         db: Sesión de base de datos
         venta: Datos de la venta (incluye vendedor_id y precio_unitario)
+        antes_de_confirmar: Función que recibe la venta ya insertada y se
+            ejecuta en la misma transacción, antes del commit (opcional)
 
     Returns:
         Venta creada
@@ -208,13 +511,12 @@ def crear_venta_admin(db: Session, venta: schemas.VentaCrearAdmin):
     if producto is None:
         raise ValueError("Producto no encontrado")
 
-    # Validar que vendedor existe
-    vendedor = db.query(models.Usuario).filter(models.Usuario.id == venta.vendedor_id).first()
-    if vendedor is None:
+    # Validar que vendedor existe (perfil cacheado en el directorio)
+    if directorio_vendedores.obtener(db, venta.vendedor_id) is None:
         raise ValueError("Vendedor no encontrado")
 
     # Calcular total usando precio_unitario especificado
-    total = venta.precio_unitario * venta.cantidad
+    total = _centavos(venta.precio_unitario * venta.cantidad)
 
     # Crear venta
     db_venta = models.Venta(
@@ -224,34 +526,57 @@ def crear_venta_admin(db: Session, venta: schemas.VentaCrearAdmin):
         total=total
     )
     db.add(db_venta)
+    if antes_de_confirmar is not None:
+        db.flush()
+        antes_de_confirmar(db_venta)
     db.commit()
-    db.refresh(db_venta)
     return db_venta
 
-def listar_ventas(db: Session):
+def listar_ventas_filas(db: Session, vendedor_id: int = None):
     """
-    Lista todas las ventas del sistema
+    Lista las ventas como filas de solo lectura
+
+    Selecciona únicamente las columnas de VentaResponse y retorna filas
+    ligeras: no se crean entidades ORM ni se registran en el identity map
 
     Args:
         db: Sesión de base de datos
+        vendedor_id: ID del vendedor para filtrar (opcional, todas si es None)
 
     Returns:
-        Lista de todas las ventas
+        Lista de filas con los campos de VentaResponse
     """
-    return db.query(models.Venta).all()
+    query = db.query(*_columnas(models.Venta, schemas.VentaResponse))
+    if vendedor_id is not None:
+        query = query.filter(models.Venta.vendedor_id == vendedor_id)
+    return query.order_by(models.Venta.id).all()
 
-def listar_ventas_por_vendedor(db: Session, vendedor_id: int):
+def iterar_ventas(db: Session, fecha_desde: datetime = None, fecha_hasta: datetime = None, lote: int = 5000):
     """
-    Lista las ventas de un vendedor específico
+    Itera las ventas de la tabla en lotes (para exportaciones en streaming)
 
     Args:
         db: Sesión de base de datos
-        vendedor_id: ID del vendedor
+        fecha_desde: Fecha de inicio del período (opcional)
+        fecha_hasta: Fecha de fin del período (opcional)
+        lote: Filas leídas por vez desde el cursor
 
     Returns:
-        Lista de ventas del vendedor
+        Iterable de filas con id, producto_id, vendedor_id, cantidad, total y fecha
     """
-    return db.query(models.Venta).filter(models.Venta.vendedor_id == vendedor_id).all()
+    query = db.query(
+        models.Venta.id,
+        models.Venta.producto_id,
+        models.Venta.vendedor_id,
+        models.Venta.cantidad,
+        models.Venta.total,
+        models.Venta.fecha
+    )
+    if fecha_desde:
+        query = query.filter(models.Venta.fecha >= fecha_desde)
+    if fecha_hasta:
+        query = query.filter(models.Venta.fecha <= fecha_hasta)
+    return query.order_by(models.Venta.id).yield_per(lote)
 
 def obtener_resumen_ventas(db: Session):
     """
@@ -263,16 +588,164 @@ def obtener_resumen_ventas(db: Session):
     Returns:
         Dict con total de ventas y monto total recaudado
     """
-    ventas = listar_ventas(db)
-    total_ventas = len(ventas)
-    monto_total = sum(venta.total for venta in ventas)
+    resumen = obtener_resumen_por_periodo(db)
+    return {
+        "total_ventas": resumen["total_ventas"],
+        "monto_total": resumen["monto_total"]
+    }
+
+def version_ventas_vendedor(db: Session, vendedor_id: int):
+    """
+    Versión de las ventas de un vendedor para el cache de estadísticas
+
+    Es la fecha e id de su última venta, leída con una búsqueda en el
+    índice (vendedor_id, fecha): cambia con cada venta nueva
+
+    Args:
+        db: Sesión de base de datos
+        vendedor_id: ID del vendedor
+
+    Returns:
+        Tupla (fecha, id) de la última venta, o None si no tiene ventas
+    """
+    fila = db.query(models.Venta.fecha, models.Venta.id).filter(
+        models.Venta.vendedor_id == vendedor_id
+    ).order_by(desc(models.Venta.fecha), desc(models.Venta.id)).first()
+    return tuple(fila) if fila else None
+
+def obtener_estadisticas_vendedor(db: Session, vendedor_id: int, dias: int = 30, mejores: int = 5) -> dict:
+    """
+    Calcula el desempeño de un vendedor en los últimos `dias` días
 
+    Una sola consulta agrupada por día y producto recorre el índice
+    (vendedor_id, fecha); totales, ticket promedio, mejores productos y
+    serie diaria se derivan de esas filas
+
+    Args:
+        db: Sesión de base de datos
+        vendedor_id: ID del vendedor
+        dias: Días hacia atrás, incluido hoy
+        mejores: Cantidad de productos en el ranking
+
+    Returns:
+        Dict con los campos de schemas.EstadisticasVendedor; la serie
+        diaria incluye los días sin ventas
+    """
+    hoy = datetime.utcnow().date()
+    desde = hoy - timedelta(days=dias - 1)
+    dia = func.date(models.Venta.fecha)
+    filas = db.query(
+        dia,
+        models.Venta.producto_id,
+        models.Producto.nombre,
+        func.count(models.Venta.id),
+        func.sum(models.Venta.cantidad),
+        func.sum(models.Venta.total)
+    ).join(
+        models.Producto, models.Producto.id == models.Venta.producto_id
+    ).filter(
+        models.Venta.vendedor_id == vendedor_id,
+        models.Venta.fecha >= datetime(desde.year, desde.month, desde.day)
+    ).group_by(dia, models.Venta.producto_id, models.Producto.nombre).all()
+
+    por_dia = {desde + timedelta(days=i): [0, Decimal("0")] for i in range(dias)}
+    por_producto = {}
+    for fecha, producto_id, nombre, ventas, unidades, monto in filas:
+        # SQLite retorna date() como texto
+        fecha = date.fromisoformat(fecha) if isinstance(fecha, str) else fecha
+        monto = _centavos(monto)
+        punto = por_dia.setdefault(fecha, [0, Decimal("0")])
+        punto[0] += ventas
+        punto[1] += monto
+        producto = por_producto.setdefault(producto_id, [nombre, 0, Decimal("0")])
+        producto[1] += unidades
+        producto[2] += monto
+
+    total_ventas = sum(p[0] for p in por_dia.values())
+    monto_total = sum((p[1] for p in por_dia.values()), Decimal("0"))
+    ranking = sorted(por_producto.items(), key=lambda item: (-item[1][2], item[0]))[:mejores]
     return {
+        "vendedor_id": vendedor_id,
+        "fecha_desde": desde,
         "total_ventas": total_ventas,
-        "monto_total": monto_total
+        "unidades_vendidas": sum(p[1] for p in por_producto.values()),
+        "monto_total": monto_total,
+        "ticket_promedio": _centavos(monto_total / total_ventas) if total_ventas else Decimal("0.00"),
+        "mejores_productos": [
+            {"producto_id": producto_id, "nombre_producto": nombre, "cantidad_vendida": unidades, "monto_total": monto}
+            for producto_id, (nombre, unidades, monto) in ranking
+        ],
+        "serie_diaria": [
+            {"fecha": fecha, "total_ventas": ventas, "monto_total": monto}
+            for fecha, (ventas, monto) in sorted(por_dia.items())
+        ],
     }
 
 # CRUD de Reportes y Comisiones
+def _snapshot(db: Session):
+    """
+    Copia columnar de ventas actualizada con las ventas nuevas
+
+    Args:
+        db: Sesión de base de datos
+
+    Returns:
+        analitica.SnapshotVentas
+    """
+    snapshot = analitica.obtener_snapshot()
+    snapshot.actualizar(db)
+    return snapshot
+
+def _sumar_totales(totales: dict, archivados: dict) -> dict:
+    """
+    Suma campo a campo los totales archivados sobre los de la tabla
+
+    Args:
+        totales: Dict de id a dict de totales (se modifica)
+        archivados: Dict de id a dict de totales archivados
+
+    Returns:
+        El mismo dict `totales`
+    """
+    for clave, valores in archivados.items():
+        actual = totales.setdefault(clave, dict.fromkeys(valores, 0))
+        for campo, valor in valores.items():
+            actual[campo] += valor
+    return totales
+
+def _con_nombres(db: Session, modelo, ranking: list, limite: int | None = None) -> list:
+    """
+    Agrega el nombre a cada entrada de un ranking
+
+    Las entidades que ya no existen se omiten (igual que el JOIN de las
+    consultas agregadas)
+
+    Args:
+        db: Sesión de base de datos
+        modelo: models.Producto o models.Usuario
+        ranking: Lista ordenada de tuplas (id, totales)
+        limite: Cantidad máxima de entradas (None = todas)
+
+    Returns:
+        Lista de tuplas (id, totales, nombre)
+    """
+    resultado = []
+    lote = max(limite or 0, 500)
+    for inicio in range(0, len(ranking), lote):
+        tramo = ranking[inicio:inicio + lote]
+        ids = [clave for clave, _ in tramo]
+        if modelo is models.Usuario:
+            # Vendedores desde el directorio en memoria
+            nombres = {i: perfil.nombre for i, perfil in directorio_vendedores.obtener_varios(db, ids).items()}
+        else:
+            nombres = dict(db.query(modelo.id, modelo.nombre).filter(modelo.id.in_(ids)).all())
+        for clave, totales in tramo:
+            if clave in nombres:
+                resultado.append((clave, totales, nombres[clave]))
+                if limite is not None and len(resultado) == limite:
+                    return resultado
+    return resultado
+
 def obtener_resumen_por_periodo(db: Session, fecha_desde: datetime = None, fecha_hasta: datetime = None):
     """
     Obtiene resumen de ventas filtrado por período
@@ -285,21 +758,29 @@ def obtener_resumen_por_periodo(db: Session, fecha_desde: datetime = None, fecha
     Returns:
         Dict con total_ventas, monto_total y fechas del período
     """
-    query = db.query(models.Venta)
+    if analitica.activa():
+        total_ventas, monto_total = _snapshot(db).resumen(fecha_desde, fecha_hasta)
+    else:
+        # Agregados en SQL: SUM sobre NUMERIC es exacto
+        query = db.query(
+            func.count(models.Venta.id).label('total_ventas'),
+            func.coalesce(func.sum(models.Venta.total), 0).label('monto_total')
+        )
 
-    # Aplicar filtros de fecha si se proporcionan
-    if fecha_desde:
-        query = query.filter(models.Venta.fecha >= fecha_desde)
-    if fecha_hasta:
-        query = query.filter(models.Venta.fecha <= fecha_hasta)
+        # Aplicar filtros de fecha si se proporcionan
+        if fecha_desde:
+            query = query.filter(models.Venta.fecha >= fecha_desde)
+        if fecha_hasta:
+            query = query.filter(models.Venta.fecha <= fecha_hasta)
+
+        total_ventas, monto_total = query.one()
 
-    ventas = query.all()
-    total_ventas = len(ventas)
-    monto_total = sum(venta.total for venta in ventas)
+    # Sumar las ventas archivadas que caen en el período
+    archivadas, monto_archivado = archivo_ventas.resumen(fecha_desde, fecha_hasta)
 
     return {
-        "total_ventas": total_ventas,
-        "monto_total": monto_total,
+        "total_ventas": total_ventas + archivadas,
+        "monto_total": _centavos(monto_total + monto_archivado),
         "fecha_desde": fecha_desde,
         "fecha_hasta": fecha_hasta
     }
@@ -315,30 +796,82 @@ def obtener_top_productos(db: Session, limite: int = 5):
     Returns:
         Lista de dicts con producto_id, nombre, cantidad_vendida y monto_total
     """
-    # Agrupar ventas por producto y calcular totales
-    resultados = db.query(
-        models.Venta.producto_id,
-        models.Producto.nombre.label('nombre_producto'),
-        func.sum(models.Venta.cantidad).label('cantidad_vendida'),
-        func.sum(models.Venta.total).label('monto_total')
-    ).join(
-        models.Producto, models.Venta.producto_id == models.Producto.id
-    ).group_by(
-        models.Venta.producto_id, models.Producto.nombre
-    ).order_by(
-        desc('cantidad_vendida')
-    ).limit(limite).all()
+    archivados = archivo_ventas.totales_por_producto()
+
+    if not archivados and not analitica.activa():
+        # Agrupar ventas por producto y calcular totales
+        resultados = db.query(
+            models.Venta.producto_id,
+            models.Producto.nombre.label('nombre_producto'),
+            func.sum(models.Venta.cantidad).label('cantidad_vendida'),
+            func.sum(models.Venta.total).label('monto_total')
+        ).join(
+            models.Producto, models.Venta.producto_id == models.Producto.id
+        ).group_by(
+            models.Venta.producto_id, models.Producto.nombre
+        ).order_by(
+            desc('cantidad_vendida')
+        ).limit(limite).all()
+
+        return [
+            {
+                "producto_id": r.producto_id,
+                "nombre_producto": r.nombre_producto,
+                "cantidad_vendida": r.cantidad_vendida,
+                "monto_total": r.monto_total
+            }
+            for r in resultados
+        ]
+
+    # Totales combinados de la tabla (o la copia columnar) y el archivo
+    if analitica.activa():
+        totales = _snapshot(db).por_producto()
+    else:
+        totales = {
+            r.producto_id: {"cantidad": r.cantidad, "monto": r.monto}
+            for r in db.query(
+                models.Venta.producto_id,
+                func.sum(models.Venta.cantidad).label('cantidad'),
+                func.sum(models.Venta.total).label('monto')
+            ).group_by(models.Venta.producto_id)
+        }
+    _sumar_totales(totales, archivados)
+    ranking = sorted(totales.items(), key=lambda t: t[1]["cantidad"], reverse=True)
 
     return [
         {
-            "producto_id": r.producto_id,
-            "nombre_producto": r.nombre_producto,
-            "cantidad_vendida": r.cantidad_vendida,
-            "monto_total": r.monto_total
+            "producto_id": producto_id,
+            "nombre_producto": nombre,
+            "cantidad_vendida": t["cantidad"],
+            "monto_total": t["monto"]
         }
-        for r in resultados
+        for producto_id, t, nombre in _con_nombres(db, models.Producto, ranking, limite)
     ]
 
+def _totales_por_vendedor(db: Session, archivados: dict) -> dict:
+    """
+    Totales por vendedor combinando la tabla (o la copia columnar) y el archivo
+
+    Args:
+        db: Sesión de base de datos
+        archivados: Totales archivados (archivo_ventas.totales_por_vendedor)
+
+    Returns:
+        Dict de vendedor_id a {"ventas": int, "monto": Decimal}
+    """
+    if analitica.activa():
+        totales = _snapshot(db).por_vendedor()
+    else:
+        totales = {
+            r.vendedor_id: {"ventas": r.ventas, "monto": r.monto}
+            for r in db.query(
+                models.Venta.vendedor_id,
+                func.count(models.Venta.id).label('ventas'),
+                func.sum(models.Venta.total).label('monto')
+            ).group_by(models.Venta.vendedor_id)
+        }
+    return _sumar_totales(totales, archivados)
+
 def obtener_top_vendedores(db: Session, limite: int = 10):
     """
     Obtiene el ranking de vendedores por monto vendido
@@ -350,34 +883,49 @@ def obtener_top_vendedores(db: Session, limite: int = 10):
     Returns:
         Lista de dicts con vendedor_id, nombre, total_ventas y monto_total
     """
-    # Agrupar ventas por vendedor y calcular totales
-    resultados = db.query(
-        models.Venta.vendedor_id,
-        models.Usuario.nombre.label('nombre_vendedor'),
-        func.count(models.Venta.id).label('total_ventas'),
-        func.sum(models.Venta.total).label('monto_total')
-    ).join(
-        models.Usuario, models.Venta.vendedor_id == models.Usuario.id
-    ).group_by(
-        models.Venta.vendedor_id, models.Usuario.nombre
-    ).order_by(
-        desc('monto_total')
-    ).limit(limite).all()
+    archivados = archivo_ventas.totales_por_vendedor()
+
+    if not archivados and not analitica.activa():
+        # Agrupar ventas por vendedor; los nombres salen del directorio (sin JOIN).
+        # El EXISTS deja fuera a los vendedores inexistentes antes del LIMIT,
+        # así _con_nombres no descarta filas ya recortadas
+        ranking = [
+            (r.vendedor_id, {"ventas": r.ventas, "monto": r.monto})
+            for r in db.query(
+                models.Venta.vendedor_id,
+                func.count(models.Venta.id).label('ventas'),
+                func.sum(models.Venta.total).label('monto')
+            ).filter(
+                exists().where(models.Usuario.id == models.Venta.vendedor_id)
+            ).group_by(
+                models.Venta.vendedor_id
+            ).order_by(
+                desc('monto')
+            ).limit(limite)
+        ]
+    else:
+        totales = _totales_por_vendedor(db, archivados)
+        ranking = sorted(totales.items(), key=lambda t: t[1]["monto"], reverse=True)
 
     return [
         {
-            "vendedor_id": r.vendedor_id,
-            "nombre_vendedor": r.nombre_vendedor,
-            "total_ventas": r.total_ventas,
-            "monto_total": r.monto_total
+            "vendedor_id": vendedor_id,
+            "nombre_vendedor": nombre,
+            "total_ventas": t["ventas"],
+            "monto_total": t["monto"]
         }
-        for r in resultados
+        for vendedor_id, t, nombre in _con_nombres(db, models.Usuario, ranking, limite)
     ]
 
 def calcular_comisiones(db: Session, porcentaje: float = 10.0):
     """
     Calcula las comisiones por vendedor
 
+    Los totales salen de una consulta agrupada (o de la copia columnar)
+    más el archivo, y los nombres del directorio de vendedores. La
+    comisión se redondea en Python sobre el total exacto: en SQLite la
+    suma y round() de la base operan en float y fallan en los empates
+
     Args:
         db: Sesión de base de datos
         porcentaje: Porcentaje de comisión (default 10%)
@@ -386,28 +934,18 @@ def calcular_comisiones(db: Session, porcentaje: float = 10.0):
         Lista de dicts con vendedor_id, nombre, total_ventas, monto_total_vendido,
         porcentaje_comision y monto_comision
     """
-    # Agrupar ventas por vendedor
-    resultados = db.query(
-        models.Venta.vendedor_id,
-        models.Usuario.nombre.label('nombre_vendedor'),
-        func.count(models.Venta.id).label('total_ventas'),
-        func.sum(models.Venta.total).label('monto_total_vendido')
-    ).join(
-        models.Usuario, models.Venta.vendedor_id == models.Usuario.id
-    ).group_by(
-        models.Venta.vendedor_id, models.Usuario.nombre
-    ).all()
-
+    tasa = Decimal(str(porcentaje)) / 100
+    totales = sorted(_totales_por_vendedor(db, archivo_ventas.totales_por_vendedor()).items())
     return [
         {
-            "vendedor_id": r.vendedor_id,
-            "nombre_vendedor": r.nombre_vendedor,
-            "total_ventas": r.total_ventas,
-            "monto_total_vendido": r.monto_total_vendido,
+            "vendedor_id": vendedor_id,
+            "nombre_vendedor": nombre,
+            "total_ventas": t["ventas"],
+            "monto_total_vendido": _centavos(t["monto"]),
             "porcentaje_comision": porcentaje,
-            "monto_comision": round(r.monto_total_vendido * (porcentaje / 100), 2)
+            "monto_comision": _centavos(_centavos(t["monto"]) * tasa)
         }
-        for r in resultados
+        for vendedor_id, t, nombre in _con_nombres(db, models.Usuario, totales)
     ]
 
 # ======================================
@@ -2,12 +2,15 @@
 Configuración de base de datos
 SQLAlchemy + PostgreSQL (Railway)
 """
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from dotenv import load_dotenv
 import os
 
+from app.utils.lectura import leer_de_primaria
+
 # Detección automática de entorno y carga de variables
 env = os.getenv("APP_ENV", "development")
 if env == "production":
@@ -23,10 +26,33 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# Configuración específica para SQLite
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Réplica de solo lectura opcional para reportes y listados
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", "")
+if READ_DATABASE_URL.startswith("postgres://"):
+    READ_DATABASE_URL = READ_DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+def crear_engine(url: str):
+    """Engine con la configuración de conexión y pool según el dialecto"""
+    # Configuración específica para SQLite
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+    # Pool por proceso: con N workers el total de conexiones es N * (pool_size + max_overflow)
+    pool_args = {} if url.startswith("sqlite") else {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        # Segundos esperando una conexión libre antes de fallar (503)
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": True,
+    }
+    return create_engine(url, connect_args=connect_args, **pool_args)
+
+engine = crear_engine(DATABASE_URL)
+# expire_on_commit=False: los objetos siguen cargados después de commit(),
+# así las escrituras no necesitan un SELECT extra para leer lo que insertaron
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+read_engine = crear_engine(READ_DATABASE_URL) if READ_DATABASE_URL else None
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
 
 Base = declarative_base()
 
@@ -37,3 +63,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency para lecturas que toleran réplica (reportes y listados)
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Sesión de la réplica de lectura, o la del primario si no aplica
+
+    Depende de get_db, así que los overrides de get_db (tests) también
+    aplican aquí. Usa el primario si no hay READ_DATABASE_URL o si el
+    usuario escribió hace menos de LECTURA_PRIMARIA_SEGUNDOS.
+    """
+    if ReadSessionLocal is None or leer_de_primaria(request):
+        yield db
+        return
+    lectura = ReadSessionLocal()
+    try:
+        yield lectura
+    finally:
+        lectura.close()
@@ -2,8 +2,18 @@
 Social Sellers Backend - FastAPI Application
 Entry point para la API de vendedores sociales
 """
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import TimeoutError as PoolAgotado
+from app.database import engine, read_engine, SessionLocal
+from app.utils import calentamiento, limites_consulta, particiones
+from app.utils.admision import ADMISION_HABILITADA, AdmisionMiddleware
+from app.utils.compresion import CompresionMiddleware
+from app.utils.lectura import LecturaConsistenteMiddleware
+from app.utils.seguridad import CabecerasSeguridadMiddleware
 # from app.database import engine, Base
 # from app import models
 
@@ -11,12 +21,41 @@ from fastapi.middleware.cors import CORSMiddleware
 # Usamos Alembic para migraciones de base de datos
 # Ejecutar: alembic upgrade head
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida de la aplicación
+
+    Antes de aceptar tráfico asegura las particiones de ventas de los
+    próximos meses (si están habilitadas) y calienta el pool de conexiones,
+    las consultas de crud y los caches en memoria; /salud/listo responde
+    503 hasta que termina. Al apagar cierra las conexiones del pool.
+    """
+    app.state.listo = False
+    app.state.calentamiento = {}
+    if particiones.VENTAS_PARTICIONADAS:
+        await run_in_threadpool(particiones.crear_particiones_futuras, engine)
+    if calentamiento.WARMUP_HABILITADO:
+        app.state.calentamiento = await run_in_threadpool(calentamiento.calentar, engine, SessionLocal)
+    app.state.listo = True
+    yield
+    app.state.listo = False
+    engine.dispose()
+    if read_engine is not None:
+        read_engine.dispose()
+
 app = FastAPI(
     title="Social Sellers API",
     description="API para gestión de vendedores sociales - Mesctocker v2",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Control de admisión por grupo de rutas (los rechazos pasan por CORS y seguridad)
+if ADMISION_HABILITADA:
+    app.add_middleware(AdmisionMiddleware)
+
 # Configuración CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,17 +63,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
-# Middleware de seguridad
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    """Agrega headers de seguridad a todas las respuestas"""
-    response = await call_next(request)
-    response.headers["Cache-Control"] = "no-store"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["Content-Type"] = "application/json; charset=utf-8"
-    return response
+# Compresión gzip/brotli de respuestas grandes
+app.add_middleware(CompresionMiddleware)
+
+# Middleware de seguridad (ASGI puro, no almacena respuestas en streaming)
+app.add_middleware(CabecerasSeguridadMiddleware)
+
+# Lecturas del propio usuario al primario tras escribir (solo con réplica)
+if read_engine is not None:
+    app.add_middleware(LecturaConsistenteMiddleware)
+
+@app.exception_handler(PoolAgotado)
+async def pool_agotado(request: Request, exc: PoolAgotado):
+    """Sin conexiones libres en el pool: 503 para que el cliente reintente"""
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Base de datos saturada, reintente en unos segundos"},
+        headers={"Retry-After": str(limites_consulta.REINTENTO_POOL_SEGUNDOS)}
+    )
 
 @app.get("/")
 def root():
@@ -42,7 +91,7 @@ def root():
     return {"mensaje": "API Social Sellers activa"}
 
 # Routers
-from app.routers import sellers, auth, admin, productos, ventas, reportes, notificaciones
+from app.routers import sellers, auth, admin, productos, ventas, reportes, notificaciones, inventario, salud
 app.include_router(sellers.router)
 app.include_router(auth.router)
 app.include_router(admin.router)
@@ -51,3 +100,5 @@ app.include_router(ventas.router)
 app.include_router(reportes.router)
 app.include_router(reportes.comisiones_router)
 app.include_router(notificaciones.router)
+app.include_router(inventario.router)
+app.include_router(salud.router)
@@ -2,7 +2,7 @@
 Modelos SQLAlchemy
 Definición de tablas para la base de datos
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -24,6 +24,38 @@ class Usuario(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     password = Column(String, nullable=False)  # Hashed password
     rol = Column(String, nullable=False, default="vendedor")  # vendedor o admin
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Revocación de tokens
+
+class RefreshToken(Base):
+    """Modelo de Refresh Token para renovación de sesiones"""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    token_hash = Column(String, unique=True, index=True, nullable=False)  # HMAC-SHA256 del token
+    familia = Column(String, index=True, nullable=False)  # Cadena de rotaciones de un mismo login
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), index=True, nullable=False)
+    expira = Column(DateTime, nullable=False)
+    revocado = Column(Boolean, nullable=False, default=False)
+    creado = Column(DateTime, server_default=func.now())
+
+    # Traer los server defaults en el INSERT (RETURNING) en lugar de un SELECT posterior
+    __mapper_args__ = {"eager_defaults": True}
+
+class ClaveIdempotencia(Base):
+    """Modelo de clave de idempotencia para reintentos de escrituras"""
+    __tablename__ = "claves_idempotencia"
+    __table_args__ = (
+        UniqueConstraint("usuario_id", "ruta", "clave", name="uq_claves_idempotencia"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
+    ruta = Column(String, nullable=False)
+    clave = Column(String, nullable=False)  # Header Idempotency-Key
+    huella = Column(String, nullable=False)  # SHA-256 del cuerpo del request
+    estado_http = Column(Integer)  # None mientras el request original se procesa
+    respuesta = Column(Text)  # Cuerpo JSON de la respuesta original
+    expira = Column(DateTime, nullable=False)
 
 class Producto(Base):
     """Modelo de Producto para inventario"""
@@ -32,17 +64,24 @@ class Producto(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     nombre = Column(String, nullable=False, index=True)
     descripcion = Column(String)
-    precio = Column(Float, nullable=False)
+    precio = Column(Numeric(12, 2), nullable=False)  # Monto exacto (Decimal)
     stock = Column(Integer, default=0)
     activo = Column(Boolean, default=True)
 
 class Venta(Base):
     """Modelo de Venta para registro de transacciones"""
     __tablename__ = "ventas"
+    __table_args__ = (
+        # Estadísticas por vendedor: filtra por vendedor y rango de fechas
+        Index("ix_ventas_vendedor_fecha", "vendedor_id", "fecha"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     producto_id = Column(Integer, ForeignKey("productos.id"), nullable=False)
     vendedor_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
     cantidad = Column(Integer, nullable=False, default=1)
-    total = Column(Float, nullable=False)
+    total = Column(Numeric(12, 2), nullable=False)  # Monto exacto (Decimal)
     fecha = Column(DateTime, server_default=func.now())
+
+    # Traer los server defaults en el INSERT (RETURNING) en lugar de un SELECT posterior
+    __mapper_args__ = {"eager_defaults": True}
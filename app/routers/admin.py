@@ -2,10 +2,13 @@
 Router para funciones administrativas
 Endpoints exclusivos para administradores
 """
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from app import schemas, crud, auth
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.revocacion import registro_versiones_token
+from app.utils.serializacion import respuesta_filas
 
 router = APIRouter(
     prefix="/admin",
@@ -14,20 +17,87 @@ router = APIRouter(
 
 @router.get("/usuarios", response_model=list[schemas.UsuarioResponse])
 def listar_usuarios(
+    limite: int = Query(50, ge=1, le=200, description="Usuarios por página"),
+    despues_de: Optional[int] = Query(None, ge=0, description="Último id de la página anterior"),
+    rol: Optional[str] = Query(None, pattern="^(vendedor|admin)$", description="Filtrar por rol"),
+    email_prefijo: Optional[str] = Query(None, min_length=1, max_length=100, description="Inicio del email"),
+    db: Session = Depends(get_read_db),
+    usuario_actual = Depends(auth.rol_requerido(["admin"]))
+):
+    """
+    Lista los usuarios del sistema paginados por id
+
+    Requiere autenticación con rol 'admin'
+
+    Query params:
+        - limite: Usuarios por página (default 50, max 200)
+        - despues_de: Último id recibido; se omite en la primera página
+        - rol: Solo usuarios con ese rol (vendedor o admin)
+        - email_prefijo: Solo usuarios cuyo email empieza así
+
+    Headers de respuesta:
+        - X-Total-Count: Total de usuarios que cumplen los filtros (solo en
+          la primera página: el COUNT recorre todos los que cumplen el filtro)
+        - X-Next-Cursor: Valor de despues_de para la página siguiente
+          (ausente en la última página)
+
+    Args:
+        limite: Cantidad máxima de usuarios
+        despues_de: Cursor de paginación (opcional)
+        rol: Filtro por rol (opcional)
+        email_prefijo: Filtro por prefijo de email (opcional)
+        db: Sesión de base de datos
+        usuario_actual: Usuario autenticado (debe ser admin)
+
+    Returns:
+        Página de usuarios (id, nombre, email y rol)
+    """
+    usuarios = crud.listar_usuarios_filas(
+        db, limite=limite, despues_de=despues_de, rol=rol, email_prefijo=email_prefijo
+    )
+    respuesta = respuesta_filas(usuarios, schemas.UsuarioResponse)
+    if despues_de is None:
+        # Si la primera página no se llenó, ya contiene a todos
+        total = len(usuarios) if len(usuarios) < limite else crud.contar_usuarios(
+            db, rol=rol, email_prefijo=email_prefijo
+        )
+        respuesta.headers["X-Total-Count"] = str(total)
+    if len(usuarios) == limite:
+        respuesta.headers["X-Next-Cursor"] = str(usuarios[-1].id)
+    return respuesta
+
+@router.post("/usuarios/{usuario_id}/revocar-tokens", response_model=schemas.UsuarioResponse)
+def revocar_tokens_usuario(
+    usuario_id: int,
     db: Session = Depends(get_db),
     usuario_actual = Depends(auth.rol_requerido(["admin"]))
 ):
     """
-    Lista todos los usuarios del sistema
+    Revoca todos los tokens emitidos para un usuario
 
     Requiere autenticación con rol 'admin'
 
+    Debe usarse tras cambiar el rol de un usuario o al darlo de baja:
+    los tokens existentes dejan de ser válidos de inmediato en este
+    proceso y, en los demás, tras AUTH_REVOCACION_TTL segundos
+
     Args:
+        usuario_id: ID del usuario
         db: Sesión de base de datos
         usuario_actual: Usuario autenticado (debe ser admin)
 
     Returns:
-        Lista de todos los usuarios
+        Usuario con sus tokens revocados
+
+    Raises:
+        HTTPException: Si el usuario no existe
     """
-    usuarios = crud.listar_usuarios(db)
-    return usuarios
+    usuario = crud.revocar_tokens_usuario(db, usuario_id)
+    if usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+
+    registro_versiones_token.registrar(usuario.id, usuario.token_version)
+    return usuario
@@ -3,11 +3,12 @@ Router para autenticación
 Endpoints relacionados con registro, login y gestión de usuarios
 """
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app import schemas, crud, auth
 from app.database import get_db
+from app.utils.rate_limit import limitador_login
 
 router = APIRouter(
     prefix="/auth",
@@ -50,13 +51,18 @@ def registrar_usuario(
 
 @router.post("/login", response_model=schemas.TokenWithUser)
 def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     Login de usuario y generación de token JWT
 
+    Los intentos se limitan por IP y por email antes de consultar la base
+    de datos o ejecutar bcrypt
+
     Args:
+        request: Request HTTP (para obtener la IP del cliente)
         form_data: Formulario con username (email) y password
         db: Sesión de base de datos
 
@@ -64,8 +70,19 @@ def login(
         Token JWT con datos del usuario
 
     Raises:
-        HTTPException: Si las credenciales son incorrectas
+        HTTPException: Si se superó el límite de intentos o las credenciales son incorrectas
     """
+    # Limitar intentos antes de cualquier hashing. Detrás del proxy, el
+    # worker ya tomó la IP del cliente de X-Forwarded-For (FORWARDED_ALLOW_IPS)
+    ip = request.client.host if request.client else None
+    reintentar_en = limitador_login.verificar(ip, form_data.username)
+    if reintentar_en:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos de login. Intente nuevamente más tarde",
+            headers={"Retry-After": str(reintentar_en)},
+        )
+
     # Verificar credenciales
     usuario = auth.verificar_credenciales(db, form_data.username, form_data.password)
 
@@ -79,16 +96,72 @@ def login(
     # Crear token
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth.crear_access_token(
-        data={"sub": usuario.email},
+        data=auth.claims_usuario(usuario),
         expires_delta=access_token_expires
     )
 
+    refresh_token = auth.emitir_refresh_token(db, usuario.id)
+
     return {
         "access_token": access_token,
         "token_type": "bearer",
+        "refresh_token": refresh_token,
         "usuario": usuario
     }
 
+@router.post("/refresh", response_model=schemas.TokenRefresh)
+def refrescar_token(
+    solicitud: schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Renueva el access token usando un refresh token
+
+    El refresh token se rota: el enviado queda revocado y se entrega uno nuevo.
+    Reutilizar un refresh token ya rotado revoca la sesión completa.
+
+    Args:
+        solicitud: Refresh token vigente
+        db: Sesión de base de datos
+
+    Returns:
+        Access token nuevo y refresh token rotado
+
+    Raises:
+        HTTPException: Si el refresh token es inválido, expiró o fue revocado
+    """
+    resultado = auth.renovar_sesion(db, solicitud.refresh_token)
+
+    if resultado is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido o expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token, refresh_token = resultado
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token
+    }
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def cerrar_sesion(
+    solicitud: schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Cierra la sesión revocando el refresh token y todas sus rotaciones
+
+    Args:
+        solicitud: Refresh token de la sesión
+        db: Sesión de base de datos
+    """
+    resultado = crud.obtener_refresh_token(db, auth.hashear_refresh_token(solicitud.refresh_token))
+    if resultado is not None:
+        crud.revocar_familia_refresh(db, resultado[0].familia)
+
 @router.get("/me", response_model=schemas.UsuarioResponse)
 async def obtener_usuario_actual(
     usuario_actual = Depends(auth.obtener_usuario_actual)
@@ -0,0 +1,132 @@
+"""
+Router para el canal de inventario en tiempo real
+WebSocket con deltas de stock y reanudación por número de secuencia
+"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app import auth
+from app.database import get_db
+from app.utils.inventario import canal_inventario
+
+router = APIRouter(
+    prefix="/inventario",
+    tags=["inventario"]
+)
+
+def _mensaje_deltas(deltas) -> dict:
+    """Construye el mensaje con un lote de deltas de stock"""
+    return {
+        "tipo": "deltas",
+        "instancia": canal_inventario.instancia,
+        "secuencia": deltas[-1].secuencia,
+        "deltas": [
+            {"secuencia": d.secuencia, "producto_id": d.producto_id, "stock": d.stock}
+            for d in deltas
+        ]
+    }
+
+def _mensaje_resync() -> dict:
+    """Construye el mensaje que pide al cliente recargar /productos/listar"""
+    return {
+        "tipo": "resync",
+        "instancia": canal_inventario.instancia,
+        "secuencia": canal_inventario.secuencia_actual
+    }
+
+@router.websocket("/ws")
+async def stream_inventario(
+    websocket: WebSocket,
+    token: str = Query(..., description="Token JWT de acceso"),
+    desde: Optional[int] = Query(None, description="Última secuencia recibida"),
+    instancia: Optional[str] = Query(None, description="Instancia que emitió la secuencia"),
+    db: Session = Depends(get_db)
+):
+    """
+    Envía deltas de stock (producto_id y stock nuevo) en tiempo real
+
+    Requiere autenticación (cualquier rol) mediante el query param `token`,
+    con las mismas verificaciones que los endpoints HTTP (incluida la
+    revocación por token_version)
+
+    Protocolo:
+        - Al conectar se envía {"tipo": "hola", "instancia", "secuencia"}
+        - Cada cambio de stock llega como {"tipo": "deltas", "secuencia", "deltas": [...]}
+        - Si `desde` ya no está en el historial (o la instancia cambió) se envía
+          {"tipo": "resync"}: el cliente debe recargar /productos/listar
+
+    Args:
+        websocket: Conexión WebSocket
+        token: Token JWT
+        desde: Secuencia desde la cual reanudar (opcional)
+        instancia: Instancia del servidor que emitió `desde` (opcional)
+        db: Sesión de base de datos (solo para validar el token)
+    """
+    try:
+        await run_in_threadpool(auth.usuario_de_token, token, db)
+    except auth.TokenInvalido:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        # La conexión puede durar horas: no retener la sesión
+        db.close()
+
+    await websocket.accept()
+
+    # Suscribir antes de leer la secuencia para no perder deltas intermedios
+    evento = canal_inventario.suscribir()
+    secuencia = canal_inventario.secuencia_actual
+
+    try:
+        await websocket.send_json({
+            "tipo": "hola",
+            "instancia": canal_inventario.instancia,
+            "secuencia": secuencia
+        })
+
+        if desde is not None:
+            deltas = None
+            if instancia in (None, canal_inventario.instancia):
+                deltas = canal_inventario.deltas_desde(desde)
+            if deltas is None:
+                await websocket.send_json(_mensaje_resync())
+            elif deltas:
+                await websocket.send_json(_mensaje_deltas(deltas))
+                secuencia = deltas[-1].secuencia
+            else:
+                secuencia = desde
+
+        async def emitir():
+            nonlocal secuencia
+            while True:
+                await evento.wait()
+                evento.clear()
+                deltas = canal_inventario.deltas_desde(secuencia)
+                if deltas is None:
+                    await websocket.send_json(_mensaje_resync())
+                    secuencia = canal_inventario.secuencia_actual
+                elif deltas:
+                    await websocket.send_json(_mensaje_deltas(deltas))
+                    secuencia = deltas[-1].secuencia
+
+        async def escuchar():
+            # Los mensajes del cliente se ignoran; solo interesa la desconexión
+            while True:
+                mensaje = await websocket.receive()
+                if mensaje["type"] == "websocket.disconnect":
+                    return
+
+        tareas = [asyncio.create_task(emitir()), asyncio.create_task(escuchar())]
+        terminadas, pendientes = await asyncio.wait(tareas, return_when=asyncio.FIRST_COMPLETED)
+        for tarea in pendientes:
+            tarea.cancel()
+        for tarea in terminadas:
+            excepcion = tarea.exception()
+            if excepcion is not None and not isinstance(excepcion, WebSocketDisconnect):
+                raise excepcion
+    except WebSocketDisconnect:
+        pass
+    finally:
+        canal_inventario.desuscribir(evento)
@@ -66,7 +66,7 @@ async def test_notificaciones():
     )
 
 
-@router.post("/venta", dependencies=[Depends(auth.obtener_usuario_actual)])
+@router.post("/venta", dependencies=[Depends(auth.obtener_usuario_token)])
 async def enviar_notificacion_venta(notificacion: NotificacionVenta):
     """
     Envía notificaciones de venta por Email y WhatsApp.
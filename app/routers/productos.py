@@ -5,7 +5,8 @@ Endpoints relacionados con la gestión de productos
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app import schemas, crud, auth
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.serializacion import respuesta_filas
 
 router = APIRouter(
     prefix="/productos",
@@ -36,8 +37,8 @@ def registrar_producto(
 
 @router.get("/listar", response_model=list[schemas.ProductoResponse])
 def listar_productos(
-    db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.obtener_usuario_actual)
+    db: Session = Depends(get_read_db),
+    usuario_actual = Depends(auth.obtener_usuario_token)
 ):
     """
     Lista todos los productos del inventario
@@ -51,8 +52,8 @@ def listar_productos(
     Returns:
         Lista de todos los productos
     """
-    productos = crud.listar_productos(db)
-    return productos
+    productos = crud.listar_productos_filas(db)
+    return respuesta_filas(productos, schemas.ProductoResponse)
 
 @router.patch("/{producto_id}", response_model=schemas.ProductoResponse)
 def actualizar_producto(
@@ -2,12 +2,22 @@
 Router para módulo de Reportes y Comisiones
 Endpoints para análisis de ventas, rankings y cálculo de comisiones
 """
+import csv
+import io
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional
 from app import schemas, crud, auth
-from app.database import get_db
+from app.database import get_read_db
+from app.utils.archivo_ventas import archivo_ventas, COLUMNAS as COLUMNAS_EXPORTACION
+from app.utils.limites_consulta import (
+    TIEMPO_LIMITE_COMISIONES_MS, TIEMPO_LIMITE_REPORTES_MS, consulta_limitada
+)
+
+# Bytes acumulados antes de enviar un fragmento del CSV
+TAMANO_FRAGMENTO_CSV = 64 * 1024
 
 router = APIRouter(
     prefix="/reportes",
@@ -19,12 +29,19 @@ comisiones_router = APIRouter(
     tags=["comisiones"]
 )
 
+solo_admin = auth.rol_requerido(["admin"])
+
+# Sesiones de lectura con tiempo límite por sentencia (504 al excederlo);
+# la autorización se resuelve antes de tomar una conexión
+sesion_reporte = consulta_limitada(TIEMPO_LIMITE_REPORTES_MS, autorizacion=solo_admin)
+sesion_comisiones = consulta_limitada(TIEMPO_LIMITE_COMISIONES_MS, autorizacion=solo_admin)
+
 @router.get("/resumen", response_model=schemas.ResumenPeriodo)
 def obtener_resumen_periodo(
     desde: Optional[datetime] = Query(None, description="Fecha de inicio (YYYY-MM-DDTHH:MM:SS)"),
     hasta: Optional[datetime] = Query(None, description="Fecha de fin (YYYY-MM-DDTHH:MM:SS)"),
-    db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.rol_requerido(["admin"]))
+    db: Session = Depends(sesion_reporte),
+    usuario_actual = Depends(solo_admin)
 ):
     """
     Obtiene resumen de ventas filtrado por período
@@ -50,8 +67,8 @@ def obtener_resumen_periodo(
 @router.get("/top-productos", response_model=list[schemas.TopProducto])
 def obtener_top_productos(
     limite: int = Query(5, ge=1, le=20, description="Número de productos a retornar"),
-    db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.rol_requerido(["admin"]))
+    db: Session = Depends(sesion_reporte),
+    usuario_actual = Depends(solo_admin)
 ):
     """
     Obtiene el ranking de productos más vendidos
@@ -75,8 +92,8 @@ def obtener_top_productos(
 @router.get("/top-vendedores", response_model=list[schemas.TopVendedor])
 def obtener_top_vendedores(
     limite: int = Query(10, ge=1, le=50, description="Número de vendedores a retornar"),
-    db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.rol_requerido(["admin"]))
+    db: Session = Depends(sesion_reporte),
+    usuario_actual = Depends(solo_admin)
 ):
     """
     Obtiene el ranking de vendedores por monto vendido
@@ -97,11 +114,67 @@ def obtener_top_vendedores(
     top_vendedores = crud.obtener_top_vendedores(db, limite=limite)
     return top_vendedores
 
+@router.get("/exportar/csv")
+def exportar_ventas_csv(
+    desde: Optional[datetime] = Query(None, description="Fecha de inicio (YYYY-MM-DDTHH:MM:SS)"),
+    hasta: Optional[datetime] = Query(None, description="Fecha de fin (YYYY-MM-DDTHH:MM:SS)"),
+    db: Session = Depends(get_read_db),
+    usuario_actual = Depends(solo_admin)
+):
+    """
+    Exporta las ventas del período a CSV en streaming
+
+    Requiere autenticación con rol 'admin'
+
+    Incluye las ventas archivadas (primero) y las de la tabla ventas;
+    el archivo se genera a medida que se envía
+
+    Args:
+        desde: Fecha de inicio (opcional)
+        hasta: Fecha de fin (opcional)
+        db: Sesión de base de datos
+        usuario_actual: Usuario autenticado (debe ser admin)
+
+    Returns:
+        StreamingResponse text/csv con columnas id, producto_id, vendedor_id,
+        cantidad, total y fecha
+    """
+    def generar():
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerow(COLUMNAS_EXPORTACION)
+        try:
+            for fila in archivo_ventas.leer_filas(desde, hasta):
+                escritor.writerow([fila[c] for c in COLUMNAS_EXPORTACION])
+                if buffer.tell() >= TAMANO_FRAGMENTO_CSV:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            for fila in crud.iterar_ventas(db, fecha_desde=desde, fecha_hasta=hasta):
+                escritor.writerow((
+                    fila.id, fila.producto_id, fila.vendedor_id, fila.cantidad,
+                    fila.total, fila.fecha.isoformat() if fila.fecha else ""
+                ))
+                if buffer.tell() >= TAMANO_FRAGMENTO_CSV:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        finally:
+            # La sesión se usa después de que el endpoint retorna
+            db.close()
+
+    return StreamingResponse(
+        generar(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="ventas.csv"'}
+    )
+
 @comisiones_router.get("/calcular", response_model=list[schemas.ComisionVendedor])
 def calcular_comisiones(
     porcentaje: float = Query(10.0, ge=0, le=100, description="Porcentaje de comisión"),
-    db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.rol_requerido(["admin"]))
+    db: Session = Depends(sesion_comisiones),
+    usuario_actual = Depends(solo_admin)
 ):
     """
     Calcula las comisiones por vendedor
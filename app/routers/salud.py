@@ -0,0 +1,107 @@
+"""
+Router de salud de la instancia
+Endpoints de readiness para el balanceador de carga y métricas internas
+"""
+import hmac
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from app import auth
+from app.database import engine, get_db
+from app.utils.admision import grupos_admision
+from app.utils.directorio_vendedores import directorio_vendedores
+from app.utils.jwt_cache import cache_tokens
+
+# Token del recolector de métricas (header X-Metricas-Token); vacío = solo admin
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN", "")
+
+router = APIRouter(
+    prefix="/salud",
+    tags=["salud"]
+)
+
+token_opcional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+def autorizar_metricas(
+    x_metricas_token: Optional[str] = Header(None),
+    token: Optional[str] = Depends(token_opcional),
+    db: Session = Depends(get_db)
+):
+    """
+    Permite las métricas al recolector interno o a un admin
+
+    Args:
+        x_metricas_token: Token interno del recolector (METRICAS_TOKEN)
+        token: Token JWT de un usuario (opcional)
+        db: Sesión de base de datos (solo para validar el JWT)
+
+    Raises:
+        HTTPException 401: Sin credenciales válidas
+        HTTPException 403: Si el usuario no es admin
+    """
+    if METRICAS_TOKEN and x_metricas_token and hmac.compare_digest(x_metricas_token, METRICAS_TOKEN):
+        return
+    try:
+        usuario = auth.usuario_de_token(token, db) if token else None
+    except auth.TokenInvalido:
+        usuario = None
+    if usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if usuario.rol != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acceso denegado. Roles permitidos: admin"
+        )
+
+@router.get("/listo")
+def verificar_listo(request: Request):
+    """
+    Readiness: indica si la instancia terminó el calentamiento
+
+    Responde 503 mientras la instancia arranca o se apaga, para que el
+    balanceador no le envíe tráfico en frío
+
+    Args:
+        request: Request HTTP (para leer el estado de la aplicación)
+
+    Returns:
+        Estado de readiness y duración de cada paso del calentamiento
+    """
+    listo = getattr(request.app.state, "listo", False)
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if listo else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "listo": listo,
+            "calentamiento": getattr(request.app.state, "calentamiento", {})
+        }
+    )
+
+@router.get("/metricas", dependencies=[Depends(autorizar_metricas)])
+def obtener_metricas():
+    """
+    Métricas de saturación de la instancia
+
+    Requiere rol 'admin' o el header X-Metricas-Token del recolector
+
+    Returns:
+        Ocupación y rechazos de cada grupo de admisión, uso del pool de
+        conexiones y estadísticas de los caches de tokens JWT y de vendedores
+    """
+    pool = engine.pool
+    return {
+        "admision": {nombre: grupo.estadisticas() for nombre, grupo in grupos_admision.items()},
+        "pool": {
+            "tamano": pool.size() if hasattr(pool, "size") else None,
+            "en_uso": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "desborde": pool.overflow() if hasattr(pool, "overflow") else None,
+        },
+        "jwt_cache": cache_tokens.estadisticas(),
+        "directorio_vendedores": directorio_vendedores.estadisticas(),
+    }
@@ -2,16 +2,27 @@
 Router para módulo de Vendedores
 Endpoints relacionados con la gestión de vendedores sociales
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from app import schemas, crud, auth
 from app.database import get_db
+from app.utils.cache_estadisticas import cache_estadisticas
+from app.utils.directorio_vendedores import directorio_vendedores
+from app.utils.limites_consulta import TIEMPO_LIMITE_REPORTES_MS, consulta_limitada
 
 router = APIRouter(
     prefix="/vendedores",
     tags=["vendedores"]
 )
 
+solo_admin = auth.rol_requerido(["admin"])
+vendedor_o_admin = auth.rol_requerido(["vendedor", "admin"])
+
+# Las estadísticas se calculan como los reportes: sesión de lectura con
+# tiempo límite por sentencia, autorizada antes de tomar la conexión
+sesion_mis_estadisticas = consulta_limitada(TIEMPO_LIMITE_REPORTES_MS, autorizacion=vendedor_o_admin)
+sesion_estadisticas = consulta_limitada(TIEMPO_LIMITE_REPORTES_MS, autorizacion=solo_admin)
+
 @router.post("/registrar", response_model=schemas.VendedorResponse)
 def registrar_vendedor(
     vendedor: schemas.VendedorRegistro,
@@ -26,3 +37,67 @@ def registrar_vendedor(
     """
     db_vendedor = crud.crear_vendedor(db=db, vendedor=vendedor)
     return db_vendedor
+
+def _estadisticas(db: Session, vendedor_id: int, dias: int) -> dict:
+    """Estadísticas del vendedor desde el cache (si su versión sigue vigente) o calculadas"""
+    version = crud.version_ventas_vendedor(db, vendedor_id)
+    estadisticas = cache_estadisticas.obtener(vendedor_id, dias, version)
+    if estadisticas is None:
+        estadisticas = crud.obtener_estadisticas_vendedor(db, vendedor_id, dias=dias)
+        cache_estadisticas.guardar(vendedor_id, dias, version, estadisticas)
+    return estadisticas
+
+@router.get("/me/estadisticas", response_model=schemas.EstadisticasVendedor)
+def obtener_mis_estadisticas(
+    dias: int = Query(30, ge=1, le=365, description="Días hacia atrás, incluido hoy"),
+    db: Session = Depends(sesion_mis_estadisticas),
+    usuario_actual = Depends(vendedor_o_admin)
+):
+    """
+    Obtiene el desempeño del usuario autenticado
+
+    Requiere autenticación con rol 'vendedor' o 'admin'
+
+    Query params:
+        - dias: Ventana en días (default 30, max 365)
+
+    Args:
+        dias: Días hacia atrás, incluido hoy
+        db: Sesión de base de datos
+        usuario_actual: Usuario autenticado
+
+    Returns:
+        Totales, ticket promedio, mejores productos y serie diaria
+    """
+    return _estadisticas(db, usuario_actual.id, dias)
+
+@router.get("/{vendedor_id}/estadisticas", response_model=schemas.EstadisticasVendedor)
+def obtener_estadisticas_vendedor(
+    vendedor_id: int,
+    dias: int = Query(30, ge=1, le=365, description="Días hacia atrás, incluido hoy"),
+    db: Session = Depends(sesion_estadisticas),
+    usuario_actual = Depends(solo_admin)
+):
+    """
+    Obtiene el desempeño de un vendedor (solo admin)
+
+    Requiere autenticación con rol 'admin'
+
+    Args:
+        vendedor_id: ID del usuario vendedor
+        dias: Días hacia atrás, incluido hoy
+        db: Sesión de base de datos
+        usuario_actual: Usuario autenticado (debe ser admin)
+
+    Returns:
+        Totales, ticket promedio, mejores productos y serie diaria
+
+    Raises:
+        HTTPException 404: Si el vendedor no existe
+    """
+    if directorio_vendedores.obtener(db, vendedor_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vendedor no encontrado"
+        )
+    return _estadisticas(db, vendedor_id, dias)
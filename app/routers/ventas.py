@@ -2,10 +2,13 @@
 Router para módulo de Ventas
 Endpoints relacionados con el registro y seguimiento de ventas
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from app import schemas, crud, auth
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.utils.idempotencia import ejecutar_idempotente
+from app.utils.serializacion import respuesta_filas
 
 router = APIRouter(
     prefix="/ventas",
@@ -16,7 +19,8 @@ router = APIRouter(
 def crear_venta_desde_admin(
     venta: schemas.VentaCrearAdmin,
     db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.rol_requerido(["admin"]))
+    usuario_actual = Depends(auth.rol_requerido(["admin"])),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     Crea una nueva venta especificando vendedor y precio (solo admin)
@@ -29,6 +33,7 @@ def crear_venta_desde_admin(
         venta: Datos de la venta (producto_id, vendedor_id, cantidad, precio_unitario)
         db: Sesión de base de datos
         usuario_actual: Usuario autenticado (debe ser admin)
+        idempotency_key: Clave para que los reintentos no dupliquen la venta (opcional)
 
     Returns:
         Venta creada con total calculado
@@ -36,28 +41,32 @@ def crear_venta_desde_admin(
     Raises:
         HTTPException 400: Si la cantidad es inválida
         HTTPException 404: Si el producto o vendedor no existen
+        HTTPException 409: Si la misma Idempotency-Key se está procesando
     """
-    try:
-        nueva_venta = crud.crear_venta_admin(db=db, venta=venta)
-        return nueva_venta
-    except ValueError as e:
-        error_msg = str(e)
-        if "no encontrado" in error_msg or "no existe" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=error_msg
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=error_msg
-            )
+    def crear(antes_de_confirmar):
+        try:
+            return crud.crear_venta_admin(db=db, venta=venta, antes_de_confirmar=antes_de_confirmar)
+        except ValueError as e:
+            error_msg = str(e)
+            if "no encontrado" in error_msg or "no existe" in error_msg:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=error_msg
+                )
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=error_msg
+                )
+
+    return ejecutar_idempotente(db, idempotency_key, usuario_actual.id, "/ventas", venta, crear, schemas.VentaResponse)
 
 @router.post("/registrar", response_model=schemas.VentaResponse, status_code=status.HTTP_201_CREATED)
 def registrar_venta(
     venta: schemas.VentaCrear,
     db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.rol_requerido(["vendedor", "admin"]))
+    usuario_actual = Depends(auth.rol_requerido(["vendedor", "admin"])),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     Registra una nueva venta
@@ -71,6 +80,7 @@ def registrar_venta(
         venta: Datos de la venta (producto_id, cantidad)
         db: Sesión de base de datos
         usuario_actual: Usuario autenticado (vendedor o admin)
+        idempotency_key: Clave para que los reintentos no dupliquen la venta (opcional)
 
     Returns:
         Venta creada con total calculado y fecha
@@ -78,28 +88,35 @@ def registrar_venta(
     Raises:
         HTTPException 400: Si no hay stock suficiente
         HTTPException 404: Si el producto no existe
+        HTTPException 409: Si la misma Idempotency-Key se está procesando
     """
-    try:
-        nueva_venta = crud.crear_venta(db=db, venta=venta, vendedor_id=usuario_actual.id)
-        return nueva_venta
-    except ValueError as e:
-        error_msg = str(e)
-        if "no encontrado" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=error_msg
-            )
-        else:
-            # Error de stock insuficiente
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=error_msg
+    def registrar(antes_de_confirmar):
+        try:
+            return crud.crear_venta(
+                db=db, venta=venta, vendedor_id=usuario_actual.id, antes_de_confirmar=antes_de_confirmar
             )
+        except ValueError as e:
+            error_msg = str(e)
+            if "no encontrado" in error_msg:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=error_msg
+                )
+            else:
+                # Error de stock insuficiente
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=error_msg
+                )
+
+    return ejecutar_idempotente(
+        db, idempotency_key, usuario_actual.id, "/ventas/registrar", venta, registrar, schemas.VentaResponse
+    )
 
 @router.get("/listar", response_model=list[schemas.VentaResponse])
 def listar_ventas(
-    db: Session = Depends(get_db),
-    usuario_actual = Depends(auth.obtener_usuario_actual)
+    db: Session = Depends(get_read_db),
+    usuario_actual = Depends(auth.obtener_usuario_token)
 ):
     """
     Lista las ventas
@@ -118,16 +135,16 @@ def listar_ventas(
     """
     if usuario_actual.rol == "admin":
         # Admin ve todas las ventas
-        ventas = crud.listar_ventas(db)
+        ventas = crud.listar_ventas_filas(db)
     else:
         # Vendedor ve solo sus ventas
-        ventas = crud.listar_ventas_por_vendedor(db, usuario_actual.id)
+        ventas = crud.listar_ventas_filas(db, vendedor_id=usuario_actual.id)
 
-    return ventas
+    return respuesta_filas(ventas, schemas.VentaResponse)
 
 @router.get("/resumen")
 def obtener_resumen(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     usuario_actual = Depends(auth.rol_requerido(["admin"]))
 ):
     """
@@ -2,8 +2,13 @@
 Schemas Pydantic v2
 Validación y serialización de datos
 """
-from pydantic import BaseModel, EmailStr, ConfigDict, field_validator
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, ConfigDict, PlainSerializer, field_validator
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Annotated
+
+# Montos de dinero: Decimal exacto internamente, número en el JSON
+Dinero = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
 
 class VendedorBase(BaseModel):
     """Schema base para Vendedor"""
@@ -51,18 +56,33 @@ class Token(BaseModel):
 
 class TokenWithUser(Token):
     """Schema para respuesta de token JWT con datos del usuario"""
+    refresh_token: str | None = None
     usuario: UsuarioResponse
 
+class RefreshTokenRequest(BaseModel):
+    """Schema para renovación o cierre de sesión con refresh token"""
+    refresh_token: str
+
+class TokenRefresh(Token):
+    """Schema para respuesta de renovación de sesión (refresh token rotado)"""
+    refresh_token: str
+
 class TokenData(BaseModel):
     """Schema para datos contenidos en el token"""
     email: str | None = None
 
+class UsuarioToken(BaseModel):
+    """Schema para el usuario autenticado reconstruido desde los claims del token"""
+    id: int
+    email: str
+    rol: str
+
 # Schemas de Producto (Inventario)
 class ProductoBase(BaseModel):
     """Schema base para Producto"""
     nombre: str
     descripcion: str | None = None
-    precio: float
+    precio: Dinero
     stock: int = 0
     activo: bool = True
 
@@ -74,7 +94,7 @@ class ProductoActualizar(BaseModel):
     """Schema para actualización de producto (campos opcionales)"""
     nombre: str | None = None
     descripcion: str | None = None
-    precio: float | None = None
+    precio: Dinero | None = None
     stock: int | None = None
     activo: bool | None = None
 
@@ -99,7 +119,7 @@ class VentaCrearAdmin(BaseModel):
     producto_id: int
     vendedor_id: int
     cantidad: int = 1
-    precio_unitario: float
+    precio_unitario: Dinero
 
     @field_validator('cantidad')
     @classmethod
@@ -114,7 +134,7 @@ class VentaResponse(BaseModel):
     producto_id: int
     vendedor_id: int
     cantidad: int
-    total: float
+    total: Dinero
     fecha: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -123,7 +143,7 @@ class VentaResponse(BaseModel):
 class ResumenPeriodo(BaseModel):
     """Schema para resumen de ventas por período"""
     total_ventas: int
-    monto_total: float
+    monto_total: Dinero
     fecha_desde: datetime | None = None
     fecha_hasta: datetime | None = None
 
@@ -132,20 +152,45 @@ class TopProducto(BaseModel):
     producto_id: int
     nombre_producto: str
     cantidad_vendida: int
-    monto_total: float
+    monto_total: Dinero
 
 class TopVendedor(BaseModel):
     """Schema para ranking de vendedores"""
     vendedor_id: int
     nombre_vendedor: str
     total_ventas: int
-    monto_total: float
+    monto_total: Dinero
 
 class ComisionVendedor(BaseModel):
     """Schema para comisiones por vendedor"""
     vendedor_id: int
     nombre_vendedor: str
     total_ventas: int
-    monto_total_vendido: float
+    monto_total_vendido: Dinero
     porcentaje_comision: float
-    monto_comision: float
+    monto_comision: Dinero
+
+# Schemas de estadísticas por vendedor
+class ProductoVendedor(BaseModel):
+    """Schema para un producto en las estadísticas de un vendedor"""
+    producto_id: int
+    nombre_producto: str
+    cantidad_vendida: int
+    monto_total: Dinero
+
+class VentasDia(BaseModel):
+    """Schema para un punto de la serie diaria de ventas"""
+    fecha: date
+    total_ventas: int
+    monto_total: Dinero
+
+class EstadisticasVendedor(BaseModel):
+    """Schema para el desempeño de un vendedor en los últimos días"""
+    vendedor_id: int
+    fecha_desde: date
+    total_ventas: int
+    unidades_vendidas: int
+    monto_total: Dinero
+    ticket_promedio: Dinero
+    mejores_productos: list[ProductoVendedor]
+    serie_diaria: list[VentasDia]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Archiva en frío las ventas de períodos cerrados
+Ejecutar: python -m app.scripts.archivar_ventas --directorio /data/archivo_ventas [--retener 18]
+
+Mueve las ventas de los meses anteriores a los --retener más recientes
+a segmentos CSV comprimidos (ventas_AAAA_MM.csv.gz) y registra cada
+segmento en manifest.json. Los reportes y la exportación CSV siguen
+incluyendo esas ventas. Pensado para ejecutarse una vez por mes (cron).
+
+El directorio (--directorio o ARCHIVO_VENTAS_DIR) es obligatorio y debe
+ser la ruta absoluta de un volumen persistente montado también en la
+API (en Railway, un Volume): las ventas archivadas se borran de la base
+y el filesystem del contenedor se pierde en cada redeploy. Sin él, el
+script no archiva nada.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar root al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.database import SessionLocal
+from app.utils.archivo_ventas import archivo_ventas, ARCHIVO_MESES_RETENIDOS, ARCHIVO_VENTAS_DIR
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retener", type=int, default=ARCHIVO_MESES_RETENIDOS,
+                        help="Meses (incluido el actual) que quedan en la tabla ventas")
+    parser.add_argument("--directorio", default=ARCHIVO_VENTAS_DIR,
+                        help="Ruta absoluta del volumen persistente de los segmentos")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🧊 ARCHIVO DE VENTAS")
+    print("=" * 60)
+
+    if not args.directorio or not Path(args.directorio).is_absolute():
+        print("\n❌ Se requiere --directorio o ARCHIVO_VENTAS_DIR con la ruta absoluta de un volumen persistente")
+        sys.exit(1)
+
+    archivo_ventas.configurar_directorio(args.directorio)
+    db = SessionLocal()
+    try:
+        segmentos = archivo_ventas.archivar_periodos_cerrados(db, meses_retenidos=args.retener)
+    except Exception as e:
+        print(f"\n❌ Error durante el archivo: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    for segmento in segmentos:
+        print(f"  - {segmento['mes']}: {segmento['filas']} ventas → {segmento['archivo']}")
+    print(f"\n✅ {len(segmentos)} segmentos archivados en {args.directorio}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Mantenimiento de las particiones mensuales de ventas (PostgreSQL)
+Ejecutar: python -m app.scripts.particiones_ventas [--futuras 3] [--desacoplar] [--retener 18]
+
+- Crea las particiones del mes actual y de los --futuras meses siguientes
+- Con --desacoplar archiva en frío las ventas más antiguas que --retener
+  meses (igual que archivar_ventas) y luego desacopla y elimina esas
+  particiones, ya vacías
+
+Pensado para ejecutarse a diario (cron). Requiere que la migración de
+particionamiento se haya aplicado con VENTAS_PARTICIONADAS=true.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar root al path
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.database import engine, SessionLocal
+from app.utils import particiones
+from app.utils.archivo_ventas import archivo_ventas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--futuras", type=int, default=particiones.PARTICIONES_MESES_FUTUROS,
+                        help="Meses futuros con partición")
+    parser.add_argument("--desacoplar", action="store_true", help="Desacoplar particiones antiguas")
+    parser.add_argument("--retener", type=int, default=particiones.PARTICIONES_MESES_RETENIDOS,
+                        help="Meses (incluido el actual) que permanecen adjuntos")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🗂️  PARTICIONES DE VENTAS")
+    print("=" * 60)
+
+    with engine.connect() as conexion:
+        if not particiones.esta_particionada(conexion):
+            print("\n⚠️  La tabla ventas no está particionada (solo PostgreSQL con VENTAS_PARTICIONADAS=true)")
+            return
+
+    creadas = particiones.crear_particiones_futuras(engine, meses=args.futuras)
+    print(f"\n✅ Particiones aseguradas: {', '.join(creadas)}")
+
+    if args.desacoplar:
+        # Archivar antes de desacoplar: lo desacoplado no lo leen los reportes
+        db = SessionLocal()
+        try:
+            segmentos = archivo_ventas.archivar_periodos_cerrados(db, meses_retenidos=args.retener)
+        finally:
+            db.close()
+        print(f"🧊 Meses archivados: {', '.join(s['mes'] for s in segmentos) or 'ninguno'}")
+        desacopladas = particiones.desacoplar_particiones_antiguas(engine, retener=args.retener)
+        print(f"📦 Particiones desacopladas y eliminadas: {', '.join(desacopladas) or 'ninguna'}")
+
+    with engine.connect() as conexion:
+        print(f"\n📋 Particiones adjuntas: {', '.join(particiones.listar_particiones(conexion))}")
+
+if __name__ == "__main__":
+    main()
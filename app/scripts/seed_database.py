@@ -2,8 +2,22 @@
 """
 Script para poblar base de datos de producción con datos iniciales
 Ejecutar: python -m app.scripts.seed_database
+
+Modo volumen (entornos de performance):
+    python -m app.scripts.seed_database --vendedores 10000 --productos 50000 --ventas 50000000
+
+Genera vendedores, productos y ventas con popularidad Pareto y fechas
+realistas (crecimiento, estacionalidad semanal y horaria). Usa COPY en
+PostgreSQL y executemany por lotes en SQLite. Con la misma --semilla y
+--hasta los datos generados son idénticos.
 """
+import argparse
+import csv
+import io
+import random
 import sys
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Agregar root al path
@@ -14,44 +28,269 @@ from app.database import SessionLocal, engine
 from app.models import Base
 from app.crud import seed_database
 
-def main():
+# Distribución horaria de ventas (pico al mediodía y en la noche)
+PESOS_HORA = [1, 1, 1, 1, 1, 2, 3, 5, 7, 8, 9, 11, 12, 10, 9, 9, 10, 12, 14, 15, 14, 10, 6, 3]
+# Lunes a domingo
+PESOS_DIA_SEMANA = [0.9, 0.9, 0.95, 1.0, 1.15, 1.35, 1.1]
+# Cantidad de unidades por venta
+CANTIDADES = [1, 2, 3, 4, 5]
+PESOS_CANTIDAD = [60, 22, 10, 5, 3]
+# alpha ≈ 1.16 produce la regla 80/20
+ALPHA_PARETO = 1.16
+
+COLUMNAS_USUARIOS = ("nombre", "email", "password", "rol", "token_version")
+COLUMNAS_PRODUCTOS = ("nombre", "descripcion", "precio", "stock", "activo")
+COLUMNAS_VENTAS = ("producto_id", "vendedor_id", "cantidad", "total", "fecha")
+
+def insertar_lote(conexion, dialecto: str, tabla: str, columnas: tuple, filas: list):
+    """
+    Inserta un lote de filas con el método masivo del dialecto
+
+    Args:
+        conexion: Conexión DBAPI cruda (engine.raw_connection())
+        dialecto: Nombre del dialecto SQLAlchemy (postgresql, sqlite, ...)
+        tabla: Nombre de la tabla
+        columnas: Columnas en el orden de cada fila
+        filas: Lista de tuplas a insertar
+    """
+    cursor = conexion.cursor()
+    try:
+        if dialecto == "postgresql":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(filas)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        else:
+            marcador = "?" if dialecto == "sqlite" else "%s"
+            cursor.executemany(
+                f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join([marcador] * len(columnas))})",
+                filas
+            )
+        conexion.commit()
+    finally:
+        cursor.close()
+
+def pesos_pareto(rng: random.Random, n: int) -> list[float]:
+    """Pesos acumulados con distribución de Pareto para n elementos"""
+    acumulado = 0.0
+    pesos = []
+    for _ in range(n):
+        acumulado += rng.paretovariate(ALPHA_PARETO)
+        pesos.append(acumulado)
+    return pesos
+
+def pesos_dias(inicio: datetime, dias: int) -> list[float]:
+    """Pesos acumulados por día: crecimiento lineal del negocio y estacionalidad semanal"""
+    acumulado = 0.0
+    pesos = []
+    for d in range(dias):
+        fecha = inicio + timedelta(days=d)
+        crecimiento = 0.5 + d / max(dias - 1, 1)
+        acumulado += crecimiento * PESOS_DIA_SEMANA[fecha.weekday()]
+        pesos.append(acumulado)
+    return pesos
+
+def sembrar_volumen(
+    engine,
+    vendedores: int,
+    productos: int,
+    ventas: int,
+    dias: int = 365,
+    semilla: int = 42,
+    lote: int = 50_000,
+    hasta: datetime | None = None,
+    password: str = "vendedor123",
+    progreso=print
+) -> dict:
+    """
+    Genera datos sintéticos de volumen productivo
+
+    Las tablas deben existir y no contener datos de una corrida previa
+    con la misma semilla (los emails de vendedores son únicos).
+
+    Args:
+        engine: Engine SQLAlchemy destino
+        vendedores: Cantidad de usuarios con rol vendedor
+        productos: Cantidad de productos
+        ventas: Cantidad de ventas
+        dias: Días de historia hacia atrás desde `hasta`
+        semilla: Semilla del generador aleatorio
+        lote: Filas por lote de inserción
+        hasta: Fecha final de la historia (default: hoy a medianoche)
+        password: Password de todos los usuarios generados (se hashea una sola vez)
+        progreso: Función que recibe mensajes de avance
+
+    Returns:
+        Dict con cantidades insertadas por tabla y segundos empleados
+    """
+    from app.auth import hashear_password
+
+    rng = random.Random(semilla)
+    dialecto = engine.dialect.name
+    hasta = hasta or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    inicio = hasta - timedelta(days=dias)
+    t0 = time.perf_counter()
+
+    conexion = engine.raw_connection()
+    try:
+        if dialecto == "sqlite":
+            cursor = conexion.cursor()
+            cursor.execute("PRAGMA synchronous = OFF")
+            cursor.close()
+
+        # 1. USUARIOS (bcrypt una sola vez para todos)
+        password_hash = hashear_password(password)
+        usuarios = [("Admin Perf", f"admin.s{semilla}@perf.socialsellers.com", password_hash, "admin", 0)]
+        usuarios += [
+            (f"Vendedor {i}", f"vendedor{i}.s{semilla}@perf.socialsellers.com", password_hash, "vendedor", 0)
+            for i in range(1, vendedores + 1)
+        ]
+        for i in range(0, len(usuarios), lote):
+            insertar_lote(conexion, dialecto, "usuarios", COLUMNAS_USUARIOS, usuarios[i:i + lote])
+        progreso(f"  - Usuarios: {len(usuarios)}")
+
+        # 2. PRODUCTOS (precios log-normales)
+        filas = []
+        for i in range(1, productos + 1):
+            precio = round(max(1.0, rng.lognormvariate(3.0, 0.8)), 2)
+            filas.append((f"Producto {i}", f"Producto sintético {i}", precio, rng.randint(0, 500), True))
+            if len(filas) >= lote:
+                insertar_lote(conexion, dialecto, "productos", COLUMNAS_PRODUCTOS, filas)
+                filas = []
+        if filas:
+            insertar_lote(conexion, dialecto, "productos", COLUMNAS_PRODUCTOS, filas)
+        progreso(f"  - Productos: {productos}")
+
+        # IDs asignados por la base de datos
+        cursor = conexion.cursor()
+        cursor.execute(
+            "SELECT id FROM usuarios WHERE rol = 'vendedor' AND email LIKE "
+            + ("?" if dialecto == "sqlite" else "%s") + " ORDER BY id",
+            (f"vendedor%.s{semilla}@perf.socialsellers.com",)
+        )
+        vendedor_ids = [r[0] for r in cursor.fetchall()]
+        cursor.execute("SELECT id, precio FROM productos ORDER BY id DESC LIMIT " + str(int(productos)))
+        precios = sorted((r[0], float(r[1])) for r in cursor.fetchall())
+        cursor.close()
+        producto_ids = [p[0] for p in precios]
+        precio_por_id = dict(precios)
+
+        # 3. VENTAS (popularidad Pareto de vendedores y productos)
+        pesos_vendedores = pesos_pareto(rng, len(vendedor_ids))
+        pesos_productos = pesos_pareto(rng, len(producto_ids))
+        pesos_dia = pesos_dias(inicio, dias)
+        horas = list(range(24))
+        offsets_dia = list(range(dias))
+
+        insertadas = 0
+        while insertadas < ventas:
+            n = min(lote, ventas - insertadas)
+            v_ids = rng.choices(vendedor_ids, cum_weights=pesos_vendedores, k=n)
+            p_ids = rng.choices(producto_ids, cum_weights=pesos_productos, k=n)
+            cantidades = rng.choices(CANTIDADES, weights=PESOS_CANTIDAD, k=n)
+            dias_venta = rng.choices(offsets_dia, cum_weights=pesos_dia, k=n)
+            horas_venta = rng.choices(horas, weights=PESOS_HORA, k=n)
+
+            filas = [
+                (
+                    p_ids[j],
+                    v_ids[j],
+                    cantidades[j],
+                    round(precio_por_id[p_ids[j]] * cantidades[j], 2),
+                    (inicio + timedelta(
+                        days=dias_venta[j], hours=horas_venta[j], seconds=rng.randrange(3600)
+                    )).strftime("%Y-%m-%d %H:%M:%S")
+                )
+                for j in range(n)
+            ]
+            insertar_lote(conexion, dialecto, "ventas", COLUMNAS_VENTAS, filas)
+            insertadas += n
+            progreso(f"  - Ventas: {insertadas}/{ventas}")
+    finally:
+        conexion.close()
+
+    return {
+        "usuarios": vendedores + 1,
+        "productos": productos,
+        "ventas": ventas,
+        "segundos": round(time.perf_counter() - t0, 2)
+    }
+
+def parsear_argumentos(argv=None):
+    """Argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Seed de base de datos Social Sellers")
+    parser.add_argument("--vendedores", type=int, default=0, help="Vendedores a generar (activa modo volumen)")
+    parser.add_argument("--productos", type=int, default=0, help="Productos a generar (activa modo volumen)")
+    parser.add_argument("--ventas", type=int, default=0, help="Ventas a generar (activa modo volumen)")
+    parser.add_argument("--dias", type=int, default=365, help="Días de historia de ventas")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla para datos reproducibles")
+    parser.add_argument("--lote", type=int, default=50_000, help="Filas por lote de inserción")
+    parser.add_argument("--hasta", type=datetime.fromisoformat, default=None, help="Fecha final (YYYY-MM-DD)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Ejecutar seed de base de datos"""
+    args = parsear_argumentos(argv)
+    modo_volumen = args.vendedores or args.productos or args.ventas
+
     print("=" * 60)
-    print("📊 SEED DATABASE - Social Sellers MVP")
+    print("📊 SEED DATABASE - Social Sellers " + ("(volumen)" if modo_volumen else "MVP"))
     print("=" * 60)
-    
+
     # Crear tablas si no existen
     print("\n🔧 Creando tablas...")
     Base.metadata.create_all(bind=engine)
     print("✅ Tablas creadas/verificadas")
-    
+
+    if modo_volumen:
+        if not args.vendedores or not args.productos:
+            print("\n❌ El modo volumen requiere --vendedores y --productos mayores a 0")
+            sys.exit(1)
+
+        print(f"\n🌱 Generando datos sintéticos (semilla {args.semilla}, dialecto {engine.dialect.name})...")
+        resultado = sembrar_volumen(
+            engine,
+            vendedores=args.vendedores,
+            productos=args.productos,
+            ventas=args.ventas,
+            dias=args.dias,
+            semilla=args.semilla,
+            lote=args.lote,
+            hasta=args.hasta
+        )
+        print(f"\n✅ Seed de volumen completado en {resultado['segundos']}s")
+        return
+
     # Poblar datos
     print("\n🌱 Poblando datos iniciales...")
     db = SessionLocal()
     try:
         seed_database(db)
         print("✅ Seed completado exitosamente")
-        
+
         # Verificar
         from app.models import Usuario, Producto, Venta
         usuarios_count = db.query(Usuario).count()
         productos_count = db.query(Producto).count()
         ventas_count = db.query(Venta).count()
-        
+
         print("\n📈 Datos en base de datos:")
         print(f"  - Usuarios: {usuarios_count}")
         print(f"  - Productos: {productos_count}")
         print(f"  - Ventas: {ventas_count}")
-        
+
         if usuarios_count >= 2:
             print("\n👤 Usuarios creados:")
             for u in db.query(Usuario).all():
                 print(f"  - {u.email} ({u.rol})")
-        
+
         print("\n" + "=" * 60)
         print("✅ SEED COMPLETADO")
         print("=" * 60)
-        
+
     except Exception as e:
         print(f"\n❌ Error durante seed: {e}")
         db.rollback()
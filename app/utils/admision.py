@@ -0,0 +1,228 @@
+"""
+Control de admisión por grupo de rutas
+
+Cada grupo (auth, escrituras, lecturas, reportes, exportaciones) tiene un máximo de
+requests en curso y una cola acotada. Un request que encuentra el grupo
+lleno espera en la cola hasta ADMISION_<GRUPO>_ESPERA segundos; si la cola
+también está llena se rechaza al instante con 429, y si la espera vence
+con 503. Ambos llevan Retry-After.
+
+Así una ráfaga de reportes, exportaciones o listados no ocupa todo el
+threadpool ni el pool de conexiones y las ventas siguen entrando: por
+defecto los grupos que no escriben suman 24 cupos de los 40 hilos del
+threadpool. Solo /salud/ (readiness del balanceador) no se limita.
+"""
+
+import asyncio
+import os
+from collections import deque
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+
+# Control de admisión habilitado
+ADMISION_HABILITADA = os.getenv("ADMISION_HABILITADA", "true").lower() == "true"
+# Segundos sugeridos en Retry-After al rechazar
+ADMISION_REINTENTO_SEGUNDOS = int(os.getenv("ADMISION_REINTENTO_SEGUNDOS", "1"))
+
+METODOS_ESCRITURA = ("POST", "PUT", "PATCH", "DELETE")
+
+# Límites por defecto: (en curso, cola, segundos de espera)
+LIMITES_DEFECTO = {
+    "auth": (8, 32, 5.0),
+    "escrituras": (16, 64, 10.0),
+    "lecturas": (10, 40, 5.0),
+    "reportes": (4, 8, 5.0),
+    "exportaciones": (2, 2, 1.0),
+}
+
+
+def _limites(grupo: str) -> tuple[int, int, float]:
+    """Límites del grupo desde ADMISION_<GRUPO>_MAX/_COLA/_ESPERA"""
+    maximo, cola, espera = LIMITES_DEFECTO[grupo]
+    prefijo = f"ADMISION_{grupo.upper()}"
+    return (
+        int(os.getenv(f"{prefijo}_MAX", str(maximo))),
+        int(os.getenv(f"{prefijo}_COLA", str(cola))),
+        float(os.getenv(f"{prefijo}_ESPERA", str(espera))),
+    )
+
+
+def clasificar(metodo: str, ruta: str) -> str | None:
+    """
+    Grupo de admisión de un request
+
+    Args:
+        metodo: Método HTTP
+        ruta: Path del request
+
+    Returns:
+        Nombre del grupo, o None si no se limita
+    """
+    if ruta.startswith("/salud/"):
+        return None
+    if ruta.startswith("/auth/"):
+        return "auth"
+    if ruta.startswith("/reportes/exportar"):
+        return "exportaciones"
+    if ruta.startswith(("/reportes/", "/comisiones/")):
+        return "reportes"
+    if ruta.startswith("/vendedores/") and ruta.endswith("/estadisticas"):
+        return "reportes"
+    if metodo in METODOS_ESCRITURA:
+        return "escrituras"
+    return "lecturas"
+
+
+class AdmisionRechazada(Exception):
+    """El grupo está lleno: el request no se atiende"""
+
+    def __init__(self, status_code: int, detalle: str):
+        super().__init__(detalle)
+        self.status_code = status_code
+        self.detalle = detalle
+
+
+class GrupoAdmision:
+    """
+    Cupos en curso y cola de espera de un grupo
+
+    Se usa desde el event loop (sin hilos): al liberar un cupo se entrega
+    directamente al primero de la cola.
+    """
+
+    def __init__(self, nombre: str, maximo: int, cola: int, espera: float):
+        self.nombre = nombre
+        self.maximo = maximo
+        self.cola = cola
+        self.espera = espera
+        self.en_curso = 0
+        self._esperando: deque[asyncio.Future] = deque()
+        self.admitidos = 0
+        self.encolados = 0
+        self.rechazados_cola = 0
+        self.rechazados_espera = 0
+
+    @property
+    def en_cola(self) -> int:
+        return sum(1 for f in self._esperando if not f.done())
+
+    async def adquirir(self) -> None:
+        """
+        Toma un cupo, esperando en la cola si hace falta
+
+        Raises:
+            AdmisionRechazada: 429 si la cola está llena, 503 si venció la espera
+        """
+        if self.en_curso < self.maximo:
+            self.en_curso += 1
+            self.admitidos += 1
+            return
+        if self.en_cola >= self.cola:
+            self.rechazados_cola += 1
+            raise AdmisionRechazada(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                f"Demasiados requests de {self.nombre} en curso"
+            )
+
+        turno = asyncio.get_running_loop().create_future()
+        self._esperando.append(turno)
+        self.encolados += 1
+        try:
+            await asyncio.wait_for(turno, self.espera)
+        except asyncio.CancelledError:
+            # Cliente desconectado: si ya tenía cupo asignado, se devuelve
+            if turno.done() and not turno.cancelled():
+                self.liberar()
+            raise
+        except asyncio.TimeoutError:
+            # El cupo pudo llegar justo al vencer la espera
+            if not (turno.done() and not turno.cancelled()):
+                self.rechazados_espera += 1
+                raise AdmisionRechazada(
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                    f"Servicio saturado: {self.nombre} no tuvo cupo a tiempo"
+                )
+        finally:
+            try:
+                self._esperando.remove(turno)
+            except ValueError:
+                pass
+        self.admitidos += 1
+
+    def liberar(self) -> None:
+        """Devuelve un cupo o lo cede al primero de la cola"""
+        while self._esperando:
+            turno = self._esperando.popleft()
+            if not turno.done():
+                turno.set_result(None)
+                return
+        self.en_curso -= 1
+
+    def estadisticas(self) -> dict:
+        """
+        Métricas del grupo
+
+        Returns:
+            Dict con límites, ocupación y contadores de admisión y rechazo
+        """
+        return {
+            "maximo": self.maximo,
+            "cola_maxima": self.cola,
+            "en_curso": self.en_curso,
+            "en_cola": self.en_cola,
+            "admitidos": self.admitidos,
+            "encolados": self.encolados,
+            "rechazados_cola": self.rechazados_cola,
+            "rechazados_espera": self.rechazados_espera,
+        }
+
+
+def crear_grupos() -> dict[str, GrupoAdmision]:
+    """Grupos con los límites configurados por entorno"""
+    return {nombre: GrupoAdmision(nombre, *_limites(nombre)) for nombre in LIMITES_DEFECTO}
+
+
+class AdmisionMiddleware:
+    """
+    Middleware ASGI de control de admisión
+
+    El cupo se retiene hasta enviar el último fragmento de la respuesta,
+    así las exportaciones en streaming cuentan mientras transmiten.
+    """
+
+    def __init__(self, app, grupos: dict[str, GrupoAdmision] = None, reintento: int = ADMISION_REINTENTO_SEGUNDOS):
+        self.app = app
+        self.grupos = grupos if grupos is not None else grupos_admision
+        self.reintento = reintento
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        nombre = clasificar(scope["method"], scope["path"])
+        grupo = self.grupos.get(nombre) if nombre else None
+        if grupo is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await grupo.adquirir()
+        except AdmisionRechazada as e:
+            respuesta = ORJSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detalle},
+                headers={"Retry-After": str(self.reintento)}
+            )
+            await respuesta(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            grupo.liberar()
+
+
+# Grupos compartidos por el proceso
+grupos_admision = crear_grupos()
@@ -0,0 +1,345 @@
+"""
+Motor analítico columnar en memoria para reportes.
+
+Con ANALITICA_COLUMNAR=true (y NumPy instalado) cada proceso mantiene
+una copia columnar de la tabla ventas (id, fecha, vendedor_id,
+producto_id, cantidad y total en centavos) y los reportes de rankings,
+comisiones y resumen por período se resuelven con group-by vectorizados
+(np.bincount) en lugar de consultas agregadas.
+
+La copia se actualiza de forma incremental antes de cada reporte leyendo
+las ventas con id mayor al último cargado menos ANALITICA_VENTANA_IDS
+(las ventas no se modifican ni se borran salvo por el archivo en frío).
+Esa ventana recupera las ventas que confirman tarde con un id menor al
+último ya visto (transacciones concurrentes que toman su id de la
+secuencia antes y hacen commit después); solo se relee mientras la
+ventana tenga huecos. Si el id máximo de la tabla retrocede o cambia el
+manifest del archivo, se recarga completa. Los montos se guardan como
+enteros en centavos para que las sumas sean exactas.
+
+Cada proceso tiene su propia copia. Para que un worker reciclado no la
+recargue entera desde la base, se guarda en disco (ANALITICA_COPIA) cada
+ANALITICA_GUARDAR_SEGUNDOS y se retoma desde ahí al arrancar.
+
+NumPy se importa y la copia se crea recién en el primer reporte con el
+modo activo (obtener_snapshot): con ANALITICA_COLUMNAR=false el arranque
+no paga la importación.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import BigInteger, cast, func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils.archivo_ventas import archivo_ventas
+
+# numpy, importado en el primer uso (ver _numpy)
+np = None
+_numpy_faltante = False
+
+logger = logging.getLogger(__name__)
+
+# Modo analítico (requiere numpy)
+ANALITICA_COLUMNAR = os.getenv("ANALITICA_COLUMNAR", "false").lower() == "true"
+# Filas leídas por consulta al cargar la copia
+ANALITICA_LOTE = int(os.getenv("ANALITICA_LOTE", "200000"))
+# Ids por debajo del último cargado que se vuelven a leer (commits tardíos)
+ANALITICA_VENTANA_IDS = int(os.getenv("ANALITICA_VENTANA_IDS", "1000"))
+# Copia en disco compartida por los workers (vacío = sin copia en disco)
+ANALITICA_COPIA = os.getenv("ANALITICA_COPIA", "analitica/ventas.npz")
+# Segundos mínimos entre escrituras de la copia en disco
+ANALITICA_GUARDAR_SEGUNDOS = float(os.getenv("ANALITICA_GUARDAR_SEGUNDOS", "300"))
+
+COLUMNAS = ("id", "fecha", "vendedor_id", "producto_id", "cantidad", "centavos")
+TIPOS = {
+    "id": "int64",
+    "fecha": "datetime64[us]",
+    "vendedor_id": "int64",
+    "producto_id": "int64",
+    "cantidad": "int64",
+    "centavos": "int64",
+}
+
+
+def _numpy():
+    """
+    Importa numpy en el primer uso.
+
+    Returns:
+        Módulo numpy, o None si no está instalado
+    """
+    global np, _numpy_faltante
+    if np is None and not _numpy_faltante:
+        try:
+            import numpy
+        except ImportError:  # Dependencia opcional
+            _numpy_faltante = True
+            logger.warning("ANALITICA_COLUMNAR=true pero numpy no está instalado: se usan consultas SQL")
+            return None
+        np = numpy
+    return np
+
+
+def activa() -> bool:
+    """Indica si los reportes deben usar la copia columnar."""
+    return ANALITICA_COLUMNAR and _numpy() is not None
+
+
+def _a_decimal(centavos) -> Decimal:
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+class SnapshotVentas:
+    """
+    Copia columnar de la tabla ventas.
+
+    Las columnas viven en buffers que duplican su capacidad al crecer,
+    por lo que agregar las ventas nuevas no copia toda la historia.
+
+    Args:
+        ruta: Archivo .npz de la copia en disco (None para no usarla)
+        ventana: Ids bajo el último cargado que se releen en cada actualización
+    """
+
+    def __init__(self, ruta: str | None = ANALITICA_COPIA or None, ventana: int = ANALITICA_VENTANA_IDS):
+        if _numpy() is None:
+            raise RuntimeError("El modo analítico requiere numpy")
+        self.ruta = ruta
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._guardado = 0.0
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Descarta la copia (la próxima actualización la recarga completa)."""
+        self._buffers = {c: np.empty(0, dtype=TIPOS[c]) for c in COLUMNAS}
+        self.filas = 0
+        self.ultimo_id = 0
+        self._version_archivo = None
+        # Ids cargados dentro de la ventana (para no duplicarlos al releerla)
+        self._recientes: set[int] = set()
+        self._desde_disco = False
+
+    def columna(self, nombre: str):
+        """Vista de una columna con las filas cargadas."""
+        return self._buffers[nombre][:self.filas]
+
+    def agregar(self, columnas: dict) -> None:
+        """
+        Agrega filas a la copia.
+
+        Args:
+            columnas: Dict de nombre de columna a array (mismo largo)
+        """
+        nuevas = len(columnas["id"])
+        if nuevas == 0:
+            return
+        requerido = self.filas + nuevas
+        capacidad = len(self._buffers["id"])
+        if requerido > capacidad:
+            capacidad = max(requerido, capacidad * 2, 1024)
+            for nombre in COLUMNAS:
+                buffer = np.empty(capacidad, dtype=TIPOS[nombre])
+                buffer[:self.filas] = self._buffers[nombre][:self.filas]
+                self._buffers[nombre] = buffer
+        for nombre in COLUMNAS:
+            self._buffers[nombre][self.filas:requerido] = columnas[nombre]
+        self.filas = requerido
+        ids = np.asarray(columnas["id"])
+        self.ultimo_id = max(self.ultimo_id, int(ids.max()))
+        piso = self.ultimo_id - self.ventana
+        self._recientes.update(ids[ids > piso].tolist())
+        self._recientes = {i for i in self._recientes if i > piso}
+
+    def _version_archivo_actual(self):
+        return tuple(s["archivo"] for s in archivo_ventas.segmentos())
+
+    def guardar(self) -> None:
+        """Escribe la copia en disco (atómico: archivo temporal y rename)."""
+        if not self.ruta or self.filas == 0:
+            return
+        destino = Path(self.ruta)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        temporal = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+        with open(temporal, "wb") as archivo:
+            np.savez(
+                archivo,
+                version_archivo=np.array(self._version_archivo or (), dtype=str),
+                **{nombre: self.columna(nombre) for nombre in COLUMNAS}
+            )
+        os.replace(temporal, destino)
+        self._guardado = time.monotonic()
+
+    def cargar(self) -> bool:
+        """
+        Retoma la copia desde disco.
+
+        Returns:
+            True si se cargó una copia
+        """
+        if not self.ruta or not os.path.exists(self.ruta):
+            return False
+        try:
+            with np.load(self.ruta) as datos:
+                columnas = {nombre: datos[nombre] for nombre in COLUMNAS}
+                version = tuple(datos["version_archivo"].tolist())
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Copia analítica en disco inválida (%s): se recarga desde la base", e)
+            return False
+        self.reiniciar()
+        self.agregar(columnas)
+        self._version_archivo = version
+        self._guardado = time.monotonic()
+        return True
+
+    def actualizar(self, db: Session) -> int:
+        """
+        Carga las ventas nuevas desde la base de datos.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Cantidad de filas nuevas cargadas
+        """
+        with self._lock:
+            if self.filas == 0 and not self._desde_disco:
+                self.cargar()
+                self._desde_disco = True
+
+            maximo = db.query(func.max(models.Venta.id)).scalar() or 0
+            version = self._version_archivo_actual()
+            if maximo < self.ultimo_id or version != self._version_archivo:
+                self.reiniciar()
+                self._desde_disco = True
+                self._version_archivo = version
+
+            cargadas = 0
+            cursor = max(self.ultimo_id - self.ventana, 0)
+            if len(self._recientes) == self.ultimo_id - cursor:
+                # La ventana no tiene huecos: no hay commits tardíos posibles
+                cursor = self.ultimo_id
+            while cursor < maximo:
+                filas = db.query(
+                    models.Venta.id,
+                    models.Venta.fecha,
+                    models.Venta.vendedor_id,
+                    models.Venta.producto_id,
+                    models.Venta.cantidad,
+                    cast(func.round(models.Venta.total * 100), BigInteger)
+                ).filter(
+                    models.Venta.id > cursor
+                ).order_by(models.Venta.id).limit(ANALITICA_LOTE).all()
+                if not filas:
+                    break
+                cursor = filas[-1][0]
+                # Las filas de la ventana ya cargadas se descartan
+                nuevas = [f for f in filas if f[0] not in self._recientes]
+                if nuevas:
+                    valores = list(zip(*nuevas))
+                    self.agregar({
+                        nombre: np.array(valores[i], dtype=TIPOS[nombre])
+                        for i, nombre in enumerate(COLUMNAS)
+                    })
+                    cargadas += len(nuevas)
+
+            if cargadas and time.monotonic() - self._guardado >= ANALITICA_GUARDAR_SEGUNDOS:
+                try:
+                    self.guardar()
+                except OSError as e:
+                    logger.warning("No se pudo guardar la copia analítica: %s", e)
+            return cargadas
+
+    def _mascara(self, desde: datetime | None, hasta: datetime | None):
+        fechas = self.columna("fecha")
+        mascara = np.ones(self.filas, dtype=bool)
+        if desde is not None:
+            mascara &= fechas >= np.datetime64(desde, "us")
+        if hasta is not None:
+            mascara &= fechas <= np.datetime64(hasta, "us")
+        return mascara
+
+    def resumen(self, desde: datetime | None = None, hasta: datetime | None = None) -> tuple[int, Decimal]:
+        """
+        Cantidad y monto de las ventas dentro de [desde, hasta].
+
+        Returns:
+            Tupla (total_ventas, monto_total)
+        """
+        if desde is None and hasta is None:
+            return self.filas, _a_decimal(self.columna("centavos").sum())
+        mascara = self._mascara(desde, hasta)
+        return int(mascara.sum()), _a_decimal(self.columna("centavos")[mascara].sum())
+
+    def _agrupar(self, clave: str, *valores: str):
+        """
+        Cuenta filas y suma columnas por `clave` con np.bincount.
+
+        Returns:
+            Tupla (ids con filas, conteo por id, lista de sumas por id)
+        """
+        if self.filas == 0:
+            vacio = np.empty(0, dtype="int64")
+            return vacio, vacio, [vacio for _ in valores]
+        claves = self.columna(clave)
+        conteo = np.bincount(claves)
+        ids = np.flatnonzero(conteo)
+        # Las sumas en float64 son exactas mientras no superen 2**53 centavos
+        sumas = [np.bincount(claves, weights=self.columna(v))[ids].astype("int64") for v in valores]
+        return ids, conteo[ids], sumas
+
+    def por_producto(self) -> dict[int, dict]:
+        """
+        Totales por producto.
+
+        Returns:
+            Dict de producto_id a {"cantidad": int, "monto": Decimal}
+        """
+        ids, _, (cantidades, centavos) = self._agrupar("producto_id", "cantidad", "centavos")
+        return {
+            int(i): {"cantidad": int(c), "monto": _a_decimal(m)}
+            for i, c, m in zip(ids, cantidades, centavos)
+        }
+
+    def por_vendedor(self) -> dict[int, dict]:
+        """
+        Totales por vendedor.
+
+        Returns:
+            Dict de vendedor_id a {"ventas": int, "monto": Decimal}
+        """
+        ids, conteo, (centavos,) = self._agrupar("vendedor_id", "centavos")
+        return {
+            int(i): {"ventas": int(n), "monto": _a_decimal(m)}
+            for i, n, m in zip(ids, conteo, centavos)
+        }
+
+
+# Instancia del proceso, creada en el primer uso (ver obtener_snapshot)
+snapshot_ventas = None
+_lock_instancia = threading.Lock()
+
+
+def obtener_snapshot() -> SnapshotVentas:
+    """
+    Copia columnar compartida por el proceso, creada en el primer uso.
+
+    Returns:
+        SnapshotVentas del proceso
+
+    Raises:
+        RuntimeError: Si numpy no está instalado
+    """
+    global snapshot_ventas
+    if snapshot_ventas is None:
+        with _lock_instancia:
+            if snapshot_ventas is None:
+                snapshot_ventas = SnapshotVentas()
+    return snapshot_ventas
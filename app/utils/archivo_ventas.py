@@ -0,0 +1,385 @@
+"""
+Archivo en frío de ventas de períodos cerrados.
+
+Las ventas de meses anteriores al período retenido se mueven de la
+tabla `ventas` a segmentos CSV comprimidos con gzip (una fila por venta,
+columnas fijas) en ARCHIVO_VENTAS_DIR. Un manifest.json lista cada
+segmento con su rango de fechas, su hash y agregados por producto y
+por vendedor, de modo que los reportes sumen lo archivado sin leer los
+archivos. Solo los rangos que cortan un mes a la mitad o la exportación
+CSV leen el contenido de los segmentos.
+
+Las ventas archivadas ya no están en la base, así que el directorio
+debe ser un volumen persistente: el filesystem del contenedor se pierde
+en cada redeploy. Archivar exige una ruta absoluta configurada; sin
+ella los reportes solo leen la tabla.
+
+Orden de escritura de cada mes: el segmento y una marca
+`<segmento>.pendiente.json` se escriben primero, luego el commit borra
+las filas y recién después se publica el segmento en el manifest (con
+rename atómico). Si el proceso muere entre el commit y el manifest, las
+ventas no se cuentan dos veces: el segmento queda pendiente y
+recuperar_pendientes lo publica (o lo descarta si el commit no llegó a
+hacerse) al comienzo del siguiente archivo.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Ruta absoluta del volumen persistente de los segmentos (vacío = sin archivo)
+ARCHIVO_VENTAS_DIR = os.getenv("ARCHIVO_VENTAS_DIR", "")
+# Meses (incluido el actual) que permanecen en la tabla ventas
+ARCHIVO_MESES_RETENIDOS = int(os.getenv("ARCHIVO_MESES_RETENIDOS", "18"))
+
+COLUMNAS = ("id", "producto_id", "vendedor_id", "cantidad", "total", "fecha")
+MANIFIESTO = "manifest.json"
+PENDIENTE = ".pendiente.json"
+
+
+def _mes_siguiente(mes: date) -> date:
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def _a_fecha(valor: date) -> datetime:
+    return datetime(valor.year, valor.month, valor.day)
+
+
+class ArchivoVentas:
+    """
+    Segmentos de ventas archivadas y su manifest.
+
+    El manifest se cachea en memoria y se recarga cuando cambia su
+    fecha de modificación (por ejemplo, tras correr el job de archivo
+    desde otro proceso).
+    """
+
+    def __init__(self, directorio: str = ARCHIVO_VENTAS_DIR):
+        self._lock = threading.Lock()
+        self.configurar_directorio(directorio)
+
+    def configurar_directorio(self, directorio) -> None:
+        """Cambia el directorio de archivo (vacío = sin archivo) y descarta el manifest cacheado."""
+        self.directorio = Path(directorio) if directorio else None
+        self._cache = ([], None)
+
+    def _exigir_volumen(self) -> None:
+        """
+        Verifica que el archivo escriba en una ruta absoluta configurada.
+
+        Raises:
+            RuntimeError: Si no hay directorio o es relativo (dentro del contenedor)
+        """
+        if self.directorio is None or not self.directorio.is_absolute():
+            raise RuntimeError(
+                "ARCHIVO_VENTAS_DIR debe ser la ruta absoluta de un volumen persistente: "
+                "las ventas archivadas se borran de la base"
+            )
+
+    @property
+    def _ruta_manifiesto(self) -> Path:
+        return self.directorio / MANIFIESTO
+
+    def segmentos(self) -> list[dict]:
+        """
+        Segmentos registrados en el manifest.
+
+        Returns:
+            Lista de segmentos (vacía si no hay archivo)
+        """
+        if self.directorio is None:
+            return []
+        try:
+            mtime = self._ruta_manifiesto.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        segmentos, cacheado = self._cache
+        if cacheado != mtime:
+            with self._lock:
+                datos = json.loads(self._ruta_manifiesto.read_text())
+                segmentos = datos["segmentos"]
+                self._cache = (segmentos, mtime)
+        return segmentos
+
+    def _escribir_manifiesto(self, segmentos: list[dict]) -> None:
+        """Reemplaza el manifest de forma atómica."""
+        temporal = self._ruta_manifiesto.with_suffix(".tmp")
+        temporal.write_text(json.dumps({"version": 1, "segmentos": segmentos}, indent=2))
+        os.replace(temporal, self._ruta_manifiesto)
+
+    def segmentos_en_rango(self, desde: datetime | None = None, hasta: datetime | None = None) -> list[dict]:
+        """
+        Segmentos cuyo rango de fechas intersecta [desde, hasta].
+
+        Args:
+            desde: Fecha inicial inclusiva (None = sin límite)
+            hasta: Fecha final inclusiva (None = sin límite)
+
+        Returns:
+            Segmentos ordenados por fecha
+        """
+        resultado = []
+        for segmento in self.segmentos():
+            inicio = datetime.fromisoformat(segmento["desde"])
+            fin = datetime.fromisoformat(segmento["hasta"])
+            if (desde is None or fin > desde) and (hasta is None or inicio <= hasta):
+                resultado.append(segmento)
+        return sorted(resultado, key=lambda s: (s["desde"], s["archivo"]))
+
+    def leer_filas(self, desde: datetime | None = None, hasta: datetime | None = None):
+        """
+        Itera las ventas archivadas dentro de [desde, hasta].
+
+        Args:
+            desde: Fecha inicial inclusiva (None = sin límite)
+            hasta: Fecha final inclusiva (None = sin límite)
+
+        Yields:
+            Dicts con las columnas de COLUMNAS como texto
+        """
+        for segmento in self.segmentos_en_rango(desde, hasta):
+            yield from self._leer_segmento(segmento, desde, hasta)
+
+    def resumen(self, desde: datetime | None = None, hasta: datetime | None = None) -> tuple[int, Decimal]:
+        """
+        Cantidad y monto de las ventas archivadas dentro de [desde, hasta].
+
+        Los segmentos completamente incluidos usan los totales del
+        manifest; solo los que el rango corta se leen del disco.
+
+        Returns:
+            Tupla (total_ventas, monto_total)
+        """
+        total_ventas = 0
+        monto_total = Decimal("0")
+        for segmento in self.segmentos_en_rango(desde, hasta):
+            inicio = datetime.fromisoformat(segmento["desde"])
+            fin = datetime.fromisoformat(segmento["hasta"])
+            if (desde is None or desde <= inicio) and (hasta is None or hasta >= fin):
+                total_ventas += segmento["filas"]
+                monto_total += Decimal(segmento["monto_total"])
+                continue
+            for fila in self._leer_segmento(segmento, desde, hasta):
+                total_ventas += 1
+                monto_total += Decimal(fila["total"])
+        return total_ventas, monto_total
+
+    def _leer_segmento(self, segmento: dict, desde, hasta):
+        """Filas de un segmento dentro de [desde, hasta]."""
+        with gzip.open(self.directorio / segmento["archivo"], "rt", newline="") as archivo:
+            for fila in csv.DictReader(archivo):
+                fecha = datetime.fromisoformat(fila["fecha"])
+                if (desde is None or fecha >= desde) and (hasta is None or fecha <= hasta):
+                    yield fila
+
+    def totales_por_producto(self) -> dict[int, dict]:
+        """
+        Totales archivados por producto.
+
+        Returns:
+            Dict de producto_id a {"cantidad": int, "monto": Decimal}
+        """
+        totales = {}
+        for segmento in self.segmentos():
+            for producto_id, valores in segmento["por_producto"].items():
+                actual = totales.setdefault(int(producto_id), {"cantidad": 0, "monto": Decimal("0")})
+                actual["cantidad"] += valores["cantidad"]
+                actual["monto"] += Decimal(valores["monto"])
+        return totales
+
+    def totales_por_vendedor(self) -> dict[int, dict]:
+        """
+        Totales archivados por vendedor.
+
+        Returns:
+            Dict de vendedor_id a {"ventas": int, "monto": Decimal}
+        """
+        totales = {}
+        for segmento in self.segmentos():
+            for vendedor_id, valores in segmento["por_vendedor"].items():
+                actual = totales.setdefault(int(vendedor_id), {"ventas": 0, "monto": Decimal("0")})
+                actual["ventas"] += valores["ventas"]
+                actual["monto"] += Decimal(valores["monto"])
+        return totales
+
+    def archivar_mes(self, db: Session, mes: date) -> dict | None:
+        """
+        Mueve las ventas de un mes de la tabla al archivo.
+
+        Args:
+            db: Sesión de base de datos
+            mes: Cualquier fecha del mes a archivar
+
+        Returns:
+            Segmento registrado en el manifest, o None si el mes no tenía ventas
+
+        Raises:
+            RuntimeError: Si el directorio no es un volumen configurado
+        """
+        self._exigir_volumen()
+        inicio = date(mes.year, mes.month, 1)
+        desde, hasta = _a_fecha(inicio), _a_fecha(_mes_siguiente(inicio))
+        filtro = (models.Venta.fecha >= desde, models.Venta.fecha < hasta)
+
+        filas = db.query(*[getattr(models.Venta, c) for c in COLUMNAS]).filter(*filtro).order_by(
+            models.Venta.id
+        ).yield_per(10_000)
+
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        existentes = {s["archivo"] for s in self.segmentos()}
+        nombre = f"ventas_{inicio.year:04d}_{inicio.month:02d}.csv.gz"
+        sufijo = 1
+        while nombre in existentes or (self.directorio / nombre).exists():
+            sufijo += 1
+            nombre = f"ventas_{inicio.year:04d}_{inicio.month:02d}_{sufijo}.csv.gz"
+        ruta = self.directorio / nombre
+        temporal = ruta.with_suffix(".tmp")
+
+        cantidad = 0
+        id_maximo = 0
+        monto_total = Decimal("0")
+        por_producto: dict[int, dict] = {}
+        por_vendedor: dict[int, dict] = {}
+        with gzip.open(temporal, "wt", newline="") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(COLUMNAS)
+            for fila in filas:
+                total = Decimal(fila.total)
+                escritor.writerow((fila.id, fila.producto_id, fila.vendedor_id, fila.cantidad,
+                                   str(total), fila.fecha.isoformat()))
+                cantidad += 1
+                id_maximo = fila.id
+                monto_total += total
+                producto = por_producto.setdefault(fila.producto_id, {"cantidad": 0, "monto": Decimal("0")})
+                producto["cantidad"] += fila.cantidad
+                producto["monto"] += total
+                vendedor = por_vendedor.setdefault(fila.vendedor_id, {"ventas": 0, "monto": Decimal("0")})
+                vendedor["ventas"] += 1
+                vendedor["monto"] += total
+
+        if cantidad == 0:
+            temporal.unlink()
+            return None
+
+        os.replace(temporal, ruta)
+        segmento = {
+            "archivo": nombre,
+            "mes": f"{inicio.year:04d}-{inicio.month:02d}",
+            "desde": desde.isoformat(),
+            "hasta": hasta.isoformat(),
+            "filas": cantidad,
+            "monto_total": str(monto_total),
+            "sha256": hashlib.sha256(ruta.read_bytes()).hexdigest(),
+            "por_producto": {
+                str(k): {"cantidad": v["cantidad"], "monto": str(v["monto"])} for k, v in por_producto.items()
+            },
+            "por_vendedor": {
+                str(k): {"ventas": v["ventas"], "monto": str(v["monto"])} for k, v in por_vendedor.items()
+            },
+            "archivado": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+
+        # Marca de pendiente: si el proceso muere antes de publicar, se recupera
+        pendiente = self.directorio / f"{nombre}{PENDIENTE}"
+        pendiente.write_text(json.dumps({"segmento": segmento, "id_maximo": id_maximo}))
+        try:
+            db.query(models.Venta).filter(*filtro).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            ruta.unlink()
+            pendiente.unlink()
+            raise
+        self._publicar(segmento, pendiente)
+        return segmento
+
+    def _publicar(self, segmento: dict, pendiente: Path) -> None:
+        """Agrega el segmento al manifest y quita su marca de pendiente."""
+        segmentos = [s for s in self.segmentos() if s["archivo"] != segmento["archivo"]]
+        self._escribir_manifiesto(segmentos + [segmento])
+        pendiente.unlink()
+
+    def recuperar_pendientes(self, db: Session) -> list[dict]:
+        """
+        Resuelve los segmentos que quedaron sin publicar por una interrupción.
+
+        Si las filas del segmento ya no están en la tabla (el commit se
+        hizo), se publica en el manifest; si siguen ahí, se descarta.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Segmentos publicados
+        """
+        publicados = []
+        for pendiente in sorted(self.directorio.glob(f"*{PENDIENTE}")):
+            datos = json.loads(pendiente.read_text())
+            segmento = datos["segmento"]
+            en_tabla = db.query(models.Venta.id).filter(
+                models.Venta.fecha >= datetime.fromisoformat(segmento["desde"]),
+                models.Venta.fecha < datetime.fromisoformat(segmento["hasta"]),
+                models.Venta.id <= datos["id_maximo"]
+            ).first()
+            if en_tabla is None:
+                self._publicar(segmento, pendiente)
+                publicados.append(segmento)
+            else:
+                (self.directorio / segmento["archivo"]).unlink(missing_ok=True)
+                pendiente.unlink()
+        return publicados
+
+    def archivar_periodos_cerrados(
+        self,
+        db: Session,
+        meses_retenidos: int = ARCHIVO_MESES_RETENIDOS,
+        hoy: date | None = None
+    ) -> list[dict]:
+        """
+        Archiva todos los meses anteriores al período retenido.
+
+        Args:
+            db: Sesión de base de datos
+            meses_retenidos: Meses (incluido el actual) que quedan en la tabla
+            hoy: Fecha de referencia (default: hoy)
+
+        Returns:
+            Segmentos creados (incluidos los pendientes recuperados)
+
+        Raises:
+            RuntimeError: Si el directorio no es un volumen configurado
+        """
+        self._exigir_volumen()
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        creados = self.recuperar_pendientes(db)
+        hoy = hoy or datetime.utcnow().date()
+        indice = hoy.year * 12 + hoy.month - 1 - (meses_retenidos - 1)
+        limite = date(indice // 12, indice % 12 + 1, 1)
+
+        primera = db.query(models.Venta.fecha).filter(
+            models.Venta.fecha < _a_fecha(limite)
+        ).order_by(models.Venta.fecha).first()
+        if primera is None:
+            return creados
+
+        mes = date(primera.fecha.year, primera.fecha.month, 1)
+        while mes < limite:
+            segmento = self.archivar_mes(db, mes)
+            if segmento is not None:
+                creados.append(segmento)
+            mes = _mes_siguiente(mes)
+        return creados
+
+
+# Instancia global del archivo
+archivo_ventas = ArchivoVentas()
@@ -0,0 +1,80 @@
+"""
+Cache en memoria de estadísticas por vendedor.
+
+Las estadísticas de /vendedores/me/estadisticas se guardan por vendedor
+y ventana de días junto con la versión de las ventas del vendedor con
+que se calcularon (crud.version_ventas_vendedor, su última venta). Cada
+request lee la versión actual con una búsqueda indexada en la misma
+sesión que usaría el cálculo: una venta registrada en cualquier worker
+cambia la versión y la entrada deja de servirse, y un cálculo hecho
+sobre una réplica atrasada queda guardado con la versión vieja, que las
+lecturas al día ya no piden. ESTADISTICAS_CACHE_TTL acota lo que la
+versión no detecta (cambio de día, ventas confirmadas fuera de orden).
+
+Las entradas viven en un LRU de ESTADISTICAS_CACHE_TAMANO claves
+(vendedor, días): como `dias` va de 1 a 365, sin tope el cache podría
+crecer hasta vendedores × 365 entradas por worker.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Segundos de vigencia de cada entrada (0 deshabilita el cache)
+ESTADISTICAS_CACHE_TTL = float(os.getenv("ESTADISTICAS_CACHE_TTL", "60"))
+# Cantidad máxima de entradas (vendedor, días) en memoria
+ESTADISTICAS_CACHE_TAMANO = int(os.getenv("ESTADISTICAS_CACHE_TAMANO", "5000"))
+
+
+class CacheEstadisticas:
+    """LRU de estadísticas por (vendedor_id, dias) y versión, con expiración."""
+
+    def __init__(self, ttl: float = ESTADISTICAS_CACHE_TTL, capacidad: int = ESTADISTICAS_CACHE_TAMANO):
+        self.ttl = ttl
+        self.capacidad = capacidad
+        self._lock = threading.Lock()
+        self._entradas: OrderedDict[tuple[int, int], tuple[object, float, object]] = OrderedDict()
+
+    def obtener(self, vendedor_id: int, dias: int, version):
+        """
+        Estadísticas vigentes de un vendedor.
+
+        Args:
+            vendedor_id: ID del vendedor
+            dias: Ventana en días
+            version: Versión actual de las ventas del vendedor
+
+        Returns:
+            Valor guardado, o None si no hay entrada, expiró o es de otra versión
+        """
+        clave = (vendedor_id, dias)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] != version or entrada[1] <= time.monotonic():
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada[2]
+
+    def guardar(self, vendedor_id: int, dias: int, version, valor) -> None:
+        """Guarda las estadísticas de un vendedor calculadas con `version` (desaloja las menos usadas)."""
+        if self.ttl <= 0 or self.capacidad <= 0:
+            return
+        clave = (vendedor_id, dias)
+        with self._lock:
+            self._entradas[clave] = (version, time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def limpiar(self) -> None:
+        """Elimina todas las entradas."""
+        with self._lock:
+            self._entradas.clear()
+
+
+# Cache compartido por el proceso
+cache_estadisticas = CacheEstadisticas()
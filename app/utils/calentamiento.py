@@ -0,0 +1,201 @@
+"""
+Calentamiento de la aplicación al arrancar.
+
+Se ejecuta desde el lifespan de FastAPI antes de aceptar tráfico:
+abre conexiones del pool, ejecuta una vez las mismas funciones de crud
+que usan las rutas para que SQLAlchemy guarde cada sentencia compilada
+en el cache del engine, y llena los caches en memoria e importaciones
+diferidas. Así el primer request después de un deploy no paga esos
+costos.
+
+- Login, sesiones, ventas del vendedor, estadísticas y usuarios: con
+  parámetros que no retornan filas (búsquedas por índice).
+- Catálogo: el listado de /productos/listar y su serializador.
+- Reportes: cada agregado con sus parámetros por defecto, con un tiempo
+  límite de WARMUP_REPORTES_MS por sentencia. La sentencia se compila
+  antes de ejecutarse, así que queda en el cache aunque el límite la
+  corte; si termina, también quedan cargados los nombres del directorio
+  de vendedores, el manifest del archivo y la copia columnar (si está
+  activa). Así el costo del arranque no crece sin cota con los datos.
+
+Los tests lo deshabilitan con WARMUP_HABILITADO.
+
+Cada paso se mide y sus errores se registran sin impedir el arranque.
+"""
+
+import logging
+import os
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app import auth, crud, schemas
+from app.utils.limites_consulta import LimiteConsulta
+from app.utils.revocacion import registro_versiones_token
+from app.utils.serializacion import serializar_filas
+
+logger = logging.getLogger(__name__)
+
+# Calentamiento al arrancar (deshabilitar con WARMUP_HABILITADO=false)
+WARMUP_HABILITADO = os.getenv("WARMUP_HABILITADO", "true").lower() == "true"
+# Conexiones a abrir por adelantado (por defecto, el tamaño del pool)
+WARMUP_CONEXIONES = os.getenv("WARMUP_CONEXIONES")
+# Tiempo límite (ms) de cada sentencia de reportes durante el calentamiento
+WARMUP_REPORTES_MS = int(os.getenv("WARMUP_REPORTES_MS", "2000"))
+
+
+def abrir_conexiones(engine, cantidad: int | None = None) -> int:
+    """
+    Abre conexiones simultáneas y las devuelve al pool.
+
+    Args:
+        engine: Engine SQLAlchemy
+        cantidad: Conexiones a abrir (default: tamaño del pool)
+
+    Returns:
+        Cantidad de conexiones abiertas
+    """
+    if cantidad is None:
+        tamano = getattr(engine.pool, "size", None)
+        cantidad = tamano() if callable(tamano) else 1
+
+    conexiones = []
+    try:
+        for _ in range(cantidad):
+            conexiones.append(engine.connect())
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+    return len(conexiones)
+
+
+def precompilar_consultas(db) -> int:
+    """
+    Ejecuta las consultas de las rutas con parámetros que no retornan filas.
+
+    SQLAlchemy compila cada sentencia la primera vez que se ejecuta y la
+    guarda en el cache de compilación del engine.
+
+    Args:
+        db: Sesión de base de datos
+
+    Returns:
+        Cantidad de consultas ejecutadas
+    """
+    consultas = [
+        # /auth/login, /auth/refresh y la autenticación por token
+        lambda: crud.obtener_usuario_por_email(db, ""),
+        lambda: crud.obtener_refresh_token(db, ""),
+        # /productos/{id} y /ventas/registrar
+        lambda: crud.obtener_producto_por_id(db, 0),
+        # /ventas/listar de un vendedor
+        lambda: crud.listar_ventas_filas(db, vendedor_id=0),
+        # /vendedores/me/estadisticas
+        lambda: crud.version_ventas_vendedor(db, 0),
+        lambda: crud.obtener_estadisticas_vendedor(db, 0),
+        # /admin/usuarios (primera página, un solo id)
+        lambda: crud.listar_usuarios_filas(db, limite=1),
+    ]
+    for consulta in consultas:
+        consulta()
+    return len(consultas)
+
+
+def cebar_caches(db) -> dict:
+    """
+    Llena los caches en memoria, lee el catálogo y resuelve las importaciones diferidas.
+
+    Args:
+        db: Sesión de base de datos
+
+    Returns:
+        Dict con los usuarios con tokens revocados y los productos del catálogo
+    """
+    versiones = crud.listar_versiones_token(db)
+    registro_versiones_token.refrescar(versiones)
+    # /productos/listar: sentencia, páginas del catálogo y lector del serializador
+    productos = crud.listar_productos_filas(db)
+    serializar_filas(productos, schemas.ProductoResponse)
+    auth._jose()
+    import bcrypt  # noqa: F401 - importación diferida en auth
+    return {"versiones_token": len(versiones), "productos": len(productos)}
+
+
+def calentar_reportes(db, milisegundos: int = WARMUP_REPORTES_MS) -> dict:
+    """
+    Ejecuta los reportes con sus parámetros por defecto y un tiempo límite.
+
+    Cada sentencia se corta al superar `milisegundos`; ya quedó compilada
+    en el cache del engine, así que el corte solo se registra.
+
+    Args:
+        db: Sesión de base de datos
+        milisegundos: Tiempo máximo por sentencia
+
+    Returns:
+        Dict con la cantidad de reportes completados y cortados
+    """
+    reportes = [
+        lambda: crud.obtener_resumen_ventas(db),
+        lambda: crud.obtener_resumen_por_periodo(db),
+        lambda: crud.obtener_top_productos(db),
+        lambda: crud.obtener_top_vendedores(db),
+        lambda: crud.calcular_comisiones(db),
+    ]
+    resultado = {"completados": 0, "cortados": 0}
+    for reporte in reportes:
+        limite = LimiteConsulta(db, milisegundos)
+        limite.aplicar()
+        try:
+            reporte()
+            resultado["completados"] += 1
+        except OperationalError as e:
+            if not limite.interrumpio(e):
+                raise
+            resultado["cortados"] += 1
+        finally:
+            limite.liberar()
+            db.rollback()
+    if resultado["cortados"]:
+        logger.warning("Calentamiento: %s reportes superaron %s ms", resultado["cortados"], milisegundos)
+    return resultado
+
+
+def _medir(funcion, *args) -> dict:
+    """Ejecuta un paso del calentamiento y retorna su duración o error."""
+    inicio = time.perf_counter()
+    try:
+        resultado = funcion(*args)
+    except Exception as e:
+        logger.warning("Calentamiento: %s falló: %s", funcion.__name__, e)
+        return {"error": str(e)}
+    return {"ms": round((time.perf_counter() - inicio) * 1000, 2), "resultado": resultado}
+
+
+def calentar(engine, session_factory) -> dict:
+    """
+    Ejecuta todos los pasos de calentamiento.
+
+    Args:
+        engine: Engine SQLAlchemy
+        session_factory: Fábrica de sesiones ligada al engine
+
+    Returns:
+        Dict con la duración (o error) de cada paso
+    """
+    cantidad = int(WARMUP_CONEXIONES) if WARMUP_CONEXIONES else None
+    resultado = {"conexiones": _medir(abrir_conexiones, engine, cantidad)}
+
+    db = session_factory()
+    try:
+        resultado["consultas"] = _medir(precompilar_consultas, db)
+        db.rollback()
+        resultado["caches"] = _medir(cebar_caches, db)
+        db.rollback()
+        resultado["reportes"] = _medir(calentar_reportes, db)
+        db.rollback()
+    finally:
+        db.close()
+
+    logger.info("Calentamiento completado: %s", resultado)
+    return resultado
@@ -0,0 +1,146 @@
+"""
+Compresión negociada de respuestas (brotli o gzip)
+
+Middleware ASGI que comprime las respuestas de un solo mensaje cuyo
+cuerpo supera un tamaño mínimo. Las respuestas en streaming (exportaciones,
+Server-Sent Events) pasan sin tocar: se envían a medida que se generan.
+Brotli se usa solo si el paquete `brotli` está instalado.
+"""
+
+import gzip
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Dependencia opcional
+    brotli = None
+
+# Tamaño mínimo del cuerpo (bytes) para comprimir
+COMPRESION_MINIMO = int(os.getenv("COMPRESION_MINIMO", "1024"))
+# Niveles de compresión (compromiso entre CPU y tamaño)
+COMPRESION_NIVEL_GZIP = int(os.getenv("COMPRESION_NIVEL_GZIP", "6"))
+COMPRESION_NIVEL_BROTLI = int(os.getenv("COMPRESION_NIVEL_BROTLI", "4"))
+
+# Tipos de contenido que vale la pena comprimir
+TIPOS_COMPRIMIBLES = ("application/json", "text/", "application/javascript", "application/xml")
+# Tipos que nunca se comprimen aunque lleguen en un solo mensaje
+TIPOS_EXCLUIDOS = ("text/event-stream",)
+
+
+def elegir_codificacion(accept_encoding: str, brotli_disponible: bool = brotli is not None) -> str | None:
+    """
+    Elige la codificación a partir del header Accept-Encoding
+
+    Args:
+        accept_encoding: Valor del header Accept-Encoding
+        brotli_disponible: Si el paquete brotli está instalado
+
+    Returns:
+        "br", "gzip" o None si el cliente no acepta ninguna
+    """
+    aceptadas = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        calidad = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                calidad = float(parametros[2:])
+            except ValueError:
+                calidad = 0.0
+        if nombre:
+            aceptadas[nombre] = calidad
+
+    comodin = aceptadas.get("*", 0.0)
+    if brotli_disponible and aceptadas.get("br", comodin) > 0:
+        return "br"
+    if aceptadas.get("gzip", comodin) > 0:
+        return "gzip"
+    return None
+
+
+def comprimir(cuerpo: bytes, codificacion: str) -> bytes:
+    """
+    Comprime un cuerpo con la codificación indicada
+
+    Args:
+        cuerpo: Bytes a comprimir
+        codificacion: "br" o "gzip"
+
+    Returns:
+        Bytes comprimidos
+    """
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=COMPRESION_NIVEL_BROTLI)
+    return gzip.compress(cuerpo, compresslevel=COMPRESION_NIVEL_GZIP, mtime=0)
+
+
+def _es_comprimible(headers: Headers) -> bool:
+    """Indica si el tipo de contenido admite compresión"""
+    if "content-encoding" in headers:
+        return False
+    tipo = headers.get("content-type", "")
+    if tipo.startswith(TIPOS_EXCLUIDOS):
+        return False
+    return tipo.startswith(TIPOS_COMPRIMIBLES)
+
+
+class CompresionMiddleware:
+    """
+    Middleware ASGI de compresión de respuestas
+
+    Retiene el mensaje http.response.start hasta ver el primer fragmento
+    del cuerpo: si es el único (more_body=False) y supera el mínimo, lo
+    comprime y ajusta Content-Encoding, Content-Length y Vary. En otro
+    caso reenvía los mensajes tal cual.
+    """
+
+    def __init__(self, app, minimo: int = COMPRESION_MINIMO):
+        self.app = app
+        self.minimo = minimo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+
+        async def enviar(message):
+            nonlocal inicio
+            if message["type"] == "http.response.start":
+                inicio = message
+                return
+            if inicio is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            mensaje_inicio, inicio = inicio, None
+            headers = MutableHeaders(scope=mensaje_inicio)
+            cuerpo = message.get("body", b"")
+
+            if not _es_comprimible(headers):
+                await send(mensaje_inicio)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if message.get("more_body", False) or len(cuerpo) < self.minimo:
+                await send(mensaje_inicio)
+                await send(message)
+                return
+
+            comprimido = comprimir(cuerpo, codificacion)
+            headers["Content-Encoding"] = codificacion
+            headers["Content-Length"] = str(len(comprimido))
+            await send(mensaje_inicio)
+            await send({"type": "http.response.body", "body": comprimido})
+
+        await self.app(scope, receive, enviar)
@@ -0,0 +1,140 @@
+"""
+Directorio de vendedores con cache de lectura en memoria.
+
+Las ventas referencian al vendedor por `usuarios.id`, así que ese es el
+identificador único del directorio. Cada perfil (id, nombre, email, rol)
+se lee de la base la primera vez que se pide y queda en un LRU durante
+DIRECTORIO_VENDEDORES_TTL segundos; la validación de ventas admin y los
+nombres de los reportes se resuelven desde aquí sin JOIN ni consulta
+por venta. Los ids inexistentes no se cachean.
+
+La API no modifica perfiles existentes (revocar sesiones solo cambia
+token_version, que no está en el directorio), así que no hay
+invalidación: un cambio hecho por fuera de la API se ve al vencer el TTL
+en cada worker.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Segundos de vigencia de cada perfil
+DIRECTORIO_VENDEDORES_TTL = float(os.getenv("DIRECTORIO_VENDEDORES_TTL", "300"))
+# Cantidad máxima de perfiles en memoria
+DIRECTORIO_VENDEDORES_TAMANO = int(os.getenv("DIRECTORIO_VENDEDORES_TAMANO", "10000"))
+# Ids por consulta al resolver varios perfiles
+LOTE_CONSULTA = 500
+
+COLUMNAS = (models.Usuario.id, models.Usuario.nombre, models.Usuario.email, models.Usuario.rol)
+
+
+class DirectorioVendedores:
+    """LRU de perfiles de usuario indexado por id, con expiración."""
+
+    def __init__(self, capacidad: int = DIRECTORIO_VENDEDORES_TAMANO, ttl: float = DIRECTORIO_VENDEDORES_TTL):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._perfiles: OrderedDict[int, tuple] = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _leer(self, usuario_id: int):
+        """Perfil vigente desde memoria (None si falta o expiró)."""
+        entrada = self._perfiles.get(usuario_id)
+        if entrada is None:
+            return None
+        expira, perfil = entrada
+        if expira <= time.monotonic():
+            self._perfiles.pop(usuario_id, None)
+            return None
+        self._perfiles.move_to_end(usuario_id)
+        return perfil
+
+    def _guardar(self, perfiles) -> None:
+        """Agrega perfiles al LRU respetando la capacidad."""
+        if self.capacidad <= 0:
+            return
+        expira = time.monotonic() + self.ttl
+        for perfil in perfiles:
+            self._perfiles[perfil.id] = (expira, perfil)
+            self._perfiles.move_to_end(perfil.id)
+        while len(self._perfiles) > self.capacidad:
+            self._perfiles.popitem(last=False)
+
+    def obtener(self, db: Session, usuario_id: int):
+        """
+        Perfil de un usuario.
+
+        Args:
+            db: Sesión de base de datos (solo se usa si no está en cache)
+            usuario_id: ID del usuario
+
+        Returns:
+            Fila con id, nombre, email y rol, o None si no existe
+        """
+        return self.obtener_varios(db, [usuario_id]).get(usuario_id)
+
+    def obtener_varios(self, db: Session, ids) -> dict:
+        """
+        Perfiles de varios usuarios con una consulta por lote de faltantes.
+
+        Args:
+            db: Sesión de base de datos
+            ids: Iterable de IDs de usuario
+
+        Returns:
+            Dict de id a perfil (los ids inexistentes se omiten)
+        """
+        encontrados = {}
+        faltantes = []
+        with self._lock:
+            for usuario_id in dict.fromkeys(ids):
+                perfil = self._leer(usuario_id)
+                if perfil is None:
+                    faltantes.append(usuario_id)
+                else:
+                    encontrados[usuario_id] = perfil
+            self.aciertos += len(encontrados)
+            self.fallos += len(faltantes)
+
+        for inicio in range(0, len(faltantes), LOTE_CONSULTA):
+            leidos = db.query(*COLUMNAS).filter(
+                models.Usuario.id.in_(faltantes[inicio:inicio + LOTE_CONSULTA])
+            ).all()
+            with self._lock:
+                self._guardar(leidos)
+            encontrados.update((perfil.id, perfil) for perfil in leidos)
+        return encontrados
+
+    def limpiar(self) -> None:
+        """Elimina todos los perfiles y reinicia las métricas."""
+        with self._lock:
+            self._perfiles.clear()
+            self.aciertos = self.fallos = 0
+
+    def estadisticas(self) -> dict:
+        """
+        Métricas del directorio.
+
+        Returns:
+            Dict con tamano, capacidad, aciertos, fallos y tasa_aciertos
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "tamano": len(self._perfiles),
+                "capacidad": self.capacidad,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0
+            }
+
+
+# Directorio compartido por el proceso
+directorio_vendedores = DirectorioVendedores()
@@ -0,0 +1,130 @@
+"""
+Idempotencia de escrituras mediante el header Idempotency-Key
+
+Los clientes móviles reintentan las ventas ante timeouts. Con el header
+Idempotency-Key, el primer request reclama la clave (un único ganador
+entre duplicados concurrentes), ejecuta la escritura y guarda su
+respuesta; los reintentos con la misma clave reciben esa respuesta sin
+escribir de nuevo.
+
+La clave, la escritura y la respuesta se confirman en una sola
+transacción: si el proceso cae a mitad de camino no queda una clave
+reclamada sin respuesta, y el reintento ejecuta la escritura.
+
+- Duplicado concurrente: espera al original y recibe su respuesta
+  (409 con Retry-After si el original se descartó entre medio)
+- Misma clave con otro cuerpo: 422
+- Si la escritura falla la clave se descarta y puede reintentarse
+"""
+
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Callable
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import crud
+
+# Tiempo que se conserva la respuesta de una clave
+IDEMPOTENCIA_TTL_HORAS = int(os.getenv("IDEMPOTENCIA_TTL_HORAS", "24"))
+# Largo máximo aceptado para el header
+IDEMPOTENCIA_CLAVE_MAX = 255
+
+
+def huella_request(datos: BaseModel) -> str:
+    """
+    Calcula el hash SHA-256 del cuerpo validado de un request
+
+    Args:
+        datos: Schema Pydantic con el cuerpo del request
+
+    Returns:
+        Hash hexadecimal
+    """
+    return hashlib.sha256(datos.model_dump_json().encode()).hexdigest()
+
+
+def _respuesta(estado_http: int, cuerpo: str, repetida: bool = False) -> Response:
+    """Construye la respuesta JSON (marcada si es una repetición)"""
+    headers = {"Idempotent-Replayed": "true"} if repetida else None
+    return Response(content=cuerpo, status_code=estado_http, media_type="application/json", headers=headers)
+
+
+def ejecutar_idempotente(
+    db: Session,
+    clave: str | None,
+    usuario_id: int,
+    ruta: str,
+    datos: BaseModel,
+    operacion: Callable,
+    schema: type[BaseModel],
+    status_code: int = status.HTTP_201_CREATED
+) -> Response:
+    """
+    Ejecuta una escritura una sola vez por Idempotency-Key
+
+    Args:
+        db: Sesión de base de datos
+        clave: Valor del header Idempotency-Key (None ejecuta sin idempotencia)
+        usuario_id: ID del usuario autenticado
+        ruta: Ruta del endpoint (las claves son por usuario y ruta)
+        datos: Cuerpo validado del request
+        operacion: Función que realiza la escritura; recibe un callback que
+            debe invocar con el objeto creado antes de su commit (o None
+            sin idempotencia)
+        schema: Schema de respuesta del objeto retornado por `operacion`
+        status_code: Código HTTP de la respuesta exitosa
+
+    Returns:
+        Respuesta JSON original o repetida
+
+    Raises:
+        HTTPException 400: Si la clave está vacía o es demasiado larga
+        HTTPException 409: Si la clave se está procesando en otro request
+        HTTPException 422: Si la clave se usó con otro cuerpo
+    """
+    if clave is None:
+        return _respuesta(status_code, schema.model_validate(operacion(None)).model_dump_json())
+
+    if not clave or len(clave) > IDEMPOTENCIA_CLAVE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key debe tener entre 1 y {IDEMPOTENCIA_CLAVE_MAX} caracteres"
+        )
+
+    huella = huella_request(datos)
+    expira = datetime.utcnow() + timedelta(hours=IDEMPOTENCIA_TTL_HORAS)
+    db_clave, ganador = crud.reclamar_clave_idempotencia(db, usuario_id, ruta, clave, huella, expira)
+
+    if not ganador:
+        if db_clave is not None and db_clave.huella != huella:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key ya fue usada con otro contenido"
+            )
+        if db_clave is None or db_clave.estado_http is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Request con la misma Idempotency-Key en proceso",
+                headers={"Retry-After": "1"}
+            )
+        return _respuesta(db_clave.estado_http, db_clave.respuesta, repetida=True)
+
+    respuesta = {}
+
+    def guardar_respuesta(objeto) -> None:
+        # Dentro de la transacción de la escritura, antes de su commit
+        respuesta["cuerpo"] = schema.model_validate(objeto).model_dump_json()
+        crud.guardar_respuesta_idempotencia(db, db_clave, status_code, respuesta["cuerpo"])
+
+    try:
+        operacion(guardar_respuesta)
+    except Exception:
+        # Descarta la clave pendiente junto con la escritura
+        db.rollback()
+        raise
+
+    return _respuesta(status_code, respuesta["cuerpo"])
@@ -0,0 +1,126 @@
+"""
+Canal de inventario en tiempo real para Social Sellers.
+
+Mantiene en memoria un historial acotado de deltas de stock
+(producto_id y stock nuevo) con número de secuencia, y despierta a
+los clientes WebSocket suscritos cuando se publica un cambio.
+
+Los deltas se publican desde crud (hilos del threadpool) y se
+consumen desde el event loop, por eso el estado se protege con un
+lock y la notificación usa loop.call_soon_threadsafe. Ningún cliente
+consulta la base de datos: todos leen del mismo historial.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import deque
+from itertools import islice
+from typing import NamedTuple
+
+# Cantidad de deltas que se conservan para reanudar conexiones
+INVENTARIO_HISTORIAL = int(os.getenv("INVENTARIO_HISTORIAL", "1000"))
+
+
+class DeltaStock(NamedTuple):
+    """Cambio de stock de un producto."""
+    secuencia: int
+    producto_id: int
+    stock: int
+
+
+class CanalInventario:
+    """
+    Difusor de deltas de stock con historial para reanudación.
+
+    Cada instancia tiene un identificador propio: un cliente que
+    reanuda con una secuencia de otra instancia (por ejemplo, tras un
+    reinicio del proceso) recibe una orden de resincronización.
+    """
+
+    def __init__(self, capacidad: int = INVENTARIO_HISTORIAL):
+        self.instancia = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._secuencia = 0
+        self._historial: deque[DeltaStock] = deque(maxlen=capacidad)
+        self._suscriptores: dict[asyncio.Event, asyncio.AbstractEventLoop] = {}
+
+    @property
+    def secuencia_actual(self) -> int:
+        """Última secuencia publicada."""
+        return self._secuencia
+
+    @property
+    def total_suscriptores(self) -> int:
+        """Cantidad de clientes suscritos."""
+        return len(self._suscriptores)
+
+    def publicar(self, producto_id: int, stock: int) -> int:
+        """
+        Publica el stock nuevo de un producto y notifica a los suscriptores.
+
+        Args:
+            producto_id: ID del producto modificado
+            stock: Stock resultante
+
+        Returns:
+            Número de secuencia asignado al delta
+        """
+        with self._lock:
+            self._secuencia += 1
+            secuencia = self._secuencia
+            self._historial.append(DeltaStock(secuencia, producto_id, stock))
+            suscriptores = list(self._suscriptores.items())
+
+        for evento, loop in suscriptores:
+            try:
+                loop.call_soon_threadsafe(evento.set)
+            except RuntimeError:
+                # Loop cerrado: el suscriptor se limpia al desconectarse
+                pass
+
+        return secuencia
+
+    def deltas_desde(self, secuencia: int) -> list[DeltaStock] | None:
+        """
+        Obtiene los deltas posteriores a una secuencia.
+
+        Args:
+            secuencia: Última secuencia conocida por el cliente
+
+        Returns:
+            Lista de deltas (posiblemente vacía), o None si la secuencia
+            ya salió del historial y el cliente debe resincronizar
+        """
+        with self._lock:
+            if secuencia > self._secuencia:
+                return None
+            if not self._historial:
+                return []
+            primera = self._historial[0].secuencia
+            if secuencia < primera - 1:
+                return None
+            inicio = max(secuencia - primera + 1, 0)
+            return list(islice(self._historial, inicio, None))
+
+    def suscribir(self) -> asyncio.Event:
+        """
+        Registra un suscriptor en el event loop actual.
+
+        Returns:
+            Evento que se activa cuando hay deltas nuevos
+        """
+        evento = asyncio.Event()
+        with self._lock:
+            self._suscriptores[evento] = asyncio.get_running_loop()
+        return evento
+
+    def desuscribir(self, evento: asyncio.Event) -> None:
+        """Elimina un suscriptor registrado con suscribir()."""
+        with self._lock:
+            self._suscriptores.pop(evento, None)
+
+
+# Canal compartido por el proceso
+canal_inventario = CanalInventario()
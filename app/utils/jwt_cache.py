@@ -0,0 +1,114 @@
+"""
+Cache LRU de tokens JWT decodificados para Social Sellers.
+
+Evita repetir la verificación HMAC y el parseo JSON de jwt.decode en
+cada request: los claims de un token ya verificado se guardan bajo el
+digest SHA-256 del token hasta su `exp`. Solo se guardan tokens que
+pasaron la verificación, así que un acierto equivale a decodificar.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Cantidad máxima de tokens en cache (0 deshabilita el cache)
+JWT_CACHE_TAMANO = int(os.getenv("JWT_CACHE_TAMANO", "4096"))
+
+
+class CacheTokens:
+    """Cache LRU de claims indexado por digest de token."""
+
+    def __init__(self, capacidad: int = JWT_CACHE_TAMANO):
+        self.capacidad = capacidad
+        self._lock = threading.Lock()
+        self._entradas: OrderedDict[bytes, dict] = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.expirados = 0
+
+    @property
+    def habilitado(self) -> bool:
+        """Indica si el cache guarda entradas."""
+        return self.capacidad > 0
+
+    @staticmethod
+    def _clave(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def obtener(self, token: str) -> dict | None:
+        """
+        Obtiene los claims de un token verificado previamente.
+
+        Args:
+            token: Token JWT
+
+        Returns:
+            Claims del token, o None si no está en cache o ya expiró
+        """
+        clave = self._clave(token)
+        with self._lock:
+            claims = self._entradas.get(clave)
+            if claims is None:
+                self.fallos += 1
+                return None
+            if claims.get("exp", 0) <= time.time():
+                del self._entradas[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return claims
+
+    def guardar(self, token: str, claims: dict) -> None:
+        """
+        Guarda los claims de un token ya verificado.
+
+        Tokens sin claim `exp` no se guardan.
+
+        Args:
+            token: Token JWT
+            claims: Claims retornados por jwt.decode
+        """
+        if not self.habilitado or "exp" not in claims:
+            return
+        clave = self._clave(token)
+        with self._lock:
+            self._entradas[clave] = claims
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+
+    def limpiar(self) -> None:
+        """Elimina todas las entradas y reinicia las métricas."""
+        with self._lock:
+            self._entradas.clear()
+            self.aciertos = self.fallos = self.expulsiones = self.expirados = 0
+
+    def estadisticas(self) -> dict:
+        """
+        Métricas del cache.
+
+        Returns:
+            Dict con tamano, capacidad, aciertos, fallos, expulsiones,
+            expirados y tasa_aciertos
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "tamano": len(self._entradas),
+                "capacidad": self.capacidad,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expulsiones": self.expulsiones,
+                "expirados": self.expirados,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0
+            }
+
+
+# Cache compartido por el proceso
+cache_tokens = CacheTokens()
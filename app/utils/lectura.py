@@ -0,0 +1,129 @@
+"""
+Consistencia de lecturas con réplica (read-your-writes)
+
+Con READ_DATABASE_URL configurada, los reportes y listados leen de la
+réplica, que puede ir unos segundos atrás del primario. Para que un
+usuario vea de inmediato lo que acaba de escribir, cada escritura
+exitosa abre una ventana de LECTURA_PRIMARIA_SEGUNDOS durante la cual
+sus lecturas van al primario:
+
+- en este proceso, por el uid del token (registro en memoria)
+- en los demás workers, por la cookie `leer_primaria` con el mismo Max-Age
+"""
+
+import math
+import os
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+# Segundos que las lecturas de un usuario van al primario tras escribir
+LECTURA_PRIMARIA_SEGUNDOS = float(os.getenv("LECTURA_PRIMARIA_SEGUNDOS", "5"))
+
+COOKIE_PRIMARIA = "leer_primaria"
+METODOS_LECTURA = ("GET", "HEAD", "OPTIONS")
+
+
+def identidad_token(conexion: HTTPConnection):
+    """
+    Identidad del usuario a partir del header Authorization
+
+    Args:
+        conexion: Request o scope HTTP
+
+    Returns:
+        uid del token (o su email si no tiene uid), None si no hay token válido
+    """
+    esquema, _, token = conexion.headers.get("authorization", "").partition(" ")
+    if esquema.lower() != "bearer" or not token:
+        return None
+    from app.auth import TokenInvalido, decodificar_token
+    try:
+        claims = decodificar_token(token)
+    except TokenInvalido:
+        return None
+    return claims.get("uid") or claims.get("sub")
+
+
+class RegistroEscrituras:
+    """Último instante de escritura por usuario, con expiración"""
+
+    def __init__(self, ventana: float = LECTURA_PRIMARIA_SEGUNDOS):
+        self.ventana = ventana
+        self._lock = threading.Lock()
+        self._hasta: dict = {}
+
+    def registrar(self, identidad) -> None:
+        """Abre la ventana de lectura en primario para un usuario"""
+        ahora = time.monotonic()
+        with self._lock:
+            self._hasta[identidad] = ahora + self.ventana
+            # Poda ocasional de ventanas vencidas
+            if len(self._hasta) > 1024:
+                self._hasta = {k: v for k, v in self._hasta.items() if v > ahora}
+
+    def reciente(self, identidad) -> bool:
+        """Indica si el usuario escribió dentro de la ventana"""
+        hasta = self._hasta.get(identidad)
+        return hasta is not None and hasta > time.monotonic()
+
+    def reiniciar(self) -> None:
+        """Olvida todas las escrituras registradas"""
+        with self._lock:
+            self._hasta.clear()
+
+
+def leer_de_primaria(conexion: HTTPConnection) -> bool:
+    """
+    Indica si una lectura debe ir al primario
+
+    Args:
+        conexion: Request HTTP
+
+    Returns:
+        True si el cliente trae la cookie de escritura reciente o su
+        usuario escribió en este proceso dentro de la ventana
+    """
+    if COOKIE_PRIMARIA in conexion.cookies:
+        return True
+    identidad = identidad_token(conexion)
+    return identidad is not None and registro_escrituras.reciente(identidad)
+
+
+class LecturaConsistenteMiddleware:
+    """
+    Middleware ASGI que marca las escrituras exitosas
+
+    En requests autenticados que no son de lectura con status < 400
+    registra al usuario en registro_escrituras y agrega la cookie
+    COOKIE_PRIMARIA. Las lecturas y los requests anónimos (login,
+    registro) pasan sin tocar.
+    """
+
+    def __init__(self, app, ventana: float = LECTURA_PRIMARIA_SEGUNDOS):
+        self.app = app
+        self.ventana = ventana
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in METODOS_LECTURA:
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                identidad = identidad_token(HTTPConnection(scope))
+                if identidad is not None:
+                    registro_escrituras.registrar(identidad)
+                    MutableHeaders(scope=message).append(
+                        "Set-Cookie",
+                        f"{COOKIE_PRIMARIA}=1; Max-Age={math.ceil(self.ventana)}; Path=/; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, enviar)
+
+
+# Registro compartido por el proceso
+registro_escrituras = RegistroEscrituras()
@@ -0,0 +1,160 @@
+"""
+Tiempo límite y cancelación de consultas costosas
+
+Los reportes piden su sesión con `consulta_limitada(ms, autorizacion)`,
+que primero resuelve la autenticación (un request anónimo no llega a
+tomar una conexión del pool) y luego acota cada sentencia de la
+transacción:
+
+- PostgreSQL: SET LOCAL statement_timeout (se descarta al terminar la
+  transacción, así que no se filtra a otros usos de la conexión del pool)
+- SQLite: progress handler que aborta la sentencia en curso cuando
+  vence su plazo, contado desde el inicio de cada sentencia
+
+Mientras el endpoint corre, una tarea vigila si el cliente se desconectó
+y cancela la consulta en curso (pg_cancel vía psycopg2 o el mismo
+progress handler en SQLite). Una consulta cortada responde 504; una
+cancelada por desconexión, 503 (el cliente ya no la recibe).
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+
+# Límites por defecto (milisegundos) de los endpoints de reportes
+TIEMPO_LIMITE_REPORTES_MS = int(os.getenv("TIEMPO_LIMITE_REPORTES_MS", "10000"))
+TIEMPO_LIMITE_COMISIONES_MS = int(os.getenv("TIEMPO_LIMITE_COMISIONES_MS", "20000"))
+# Segundos entre chequeos de desconexión del cliente
+INTERVALO_DESCONEXION = float(os.getenv("INTERVALO_DESCONEXION", "0.5"))
+# Segundos sugeridos en Retry-After cuando no hay conexiones disponibles
+REINTENTO_POOL_SEGUNDOS = int(os.getenv("REINTENTO_POOL_SEGUNDOS", "2"))
+
+# SQLSTATE query_canceled de PostgreSQL (statement_timeout o pg_cancel)
+PG_CONSULTA_CANCELADA = "57014"
+
+
+class LimiteConsulta:
+    """
+    Plazo y cancelación de las consultas de una sesión
+
+    Args:
+        db: Sesión de base de datos
+        milisegundos: Tiempo máximo por sentencia
+    """
+
+    def __init__(self, db: Session, milisegundos: int):
+        self.db = db
+        self.milisegundos = milisegundos
+        self.cancelado = False
+        self._vence = None
+        self._conexion = None
+        self._dbapi = None
+        self._dialecto = None
+
+    def aplicar(self) -> None:
+        """Fija el límite en la conexión de la sesión"""
+        conexion = self.db.connection()
+        self._conexion = conexion
+        self._dialecto = conexion.dialect.name
+        self._dbapi = conexion.connection.dbapi_connection
+        if self._dialecto == "postgresql":
+            conexion.execute(text(f"SET LOCAL statement_timeout = {int(self.milisegundos)}"))
+        elif self._dialecto == "sqlite":
+            event.listen(conexion, "before_cursor_execute", self._iniciar_plazo)
+            self._dbapi.set_progress_handler(self._abortar_sqlite, 1000)
+
+    def _iniciar_plazo(self, *args) -> None:
+        """Reinicia el plazo al comenzar cada sentencia (SQLite)"""
+        self._vence = time.monotonic() + self.milisegundos / 1000
+
+    def _abortar_sqlite(self) -> int:
+        return int(self.cancelado or self.vencido())
+
+    def vencido(self) -> bool:
+        """Indica si la última sentencia iniciada superó el tiempo límite"""
+        return self._vence is not None and time.monotonic() >= self._vence
+
+    def cancelar(self) -> None:
+        """Cancela la sentencia en curso (seguro desde otro hilo)"""
+        self.cancelado = True
+        if self._dialecto == "postgresql" and self._dbapi is not None:
+            self._dbapi.cancel()
+
+    def liberar(self) -> None:
+        """Quita el progress handler de SQLite (en PostgreSQL no hace falta)"""
+        if self._dialecto == "sqlite" and self._dbapi is not None:
+            self._dbapi.set_progress_handler(None, 0)
+            event.remove(self._conexion, "before_cursor_execute", self._iniciar_plazo)
+
+    def interrumpio(self, error: OperationalError) -> bool:
+        """Indica si el error proviene del límite o de una cancelación"""
+        codigo = getattr(error.orig, "pgcode", None)
+        return self.cancelado or self.vencido() or codigo == PG_CONSULTA_CANCELADA
+
+
+async def _vigilar_desconexion(request: Request, limite: LimiteConsulta) -> None:
+    """Cancela la consulta si el cliente cierra la conexión"""
+    while True:
+        await asyncio.sleep(INTERVALO_DESCONEXION)
+        if await request.is_disconnected():
+            limite.cancelar()
+            return
+
+
+async def _sin_autorizacion():
+    return None
+
+
+def consulta_limitada(milisegundos: int = TIEMPO_LIMITE_REPORTES_MS, autorizacion: Callable = None):
+    """
+    Dependency factory de sesión de lectura con tiempo límite
+
+    Args:
+        milisegundos: Tiempo máximo por sentencia SQL
+        autorizacion: Dependency de autenticación (p. ej. auth.rol_requerido)
+            que se resuelve antes de tomar la conexión; el endpoint puede
+            declarar la misma para recibir el usuario sin repetirla
+
+    Returns:
+        Dependency que entrega la sesión de get_read_db acotada
+
+    Raises:
+        HTTPException 504: Si una consulta excede el tiempo límite
+        HTTPException 503: Si la consulta se canceló porque el cliente se desconectó
+    """
+    async def dependencia(
+        request: Request,
+        _usuario=Depends(autorizacion or _sin_autorizacion),
+        db: Session = Depends(get_read_db)
+    ):
+        limite = LimiteConsulta(db, milisegundos)
+        await run_in_threadpool(limite.aplicar)
+        vigilancia = asyncio.create_task(_vigilar_desconexion(request, limite))
+        try:
+            yield db
+        except OperationalError as e:
+            if not limite.interrumpio(e):
+                raise
+            if limite.cancelado:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Consulta cancelada: el cliente cerró la conexión"
+                ) from e
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"La consulta excedió el tiempo límite de {milisegundos} ms; acote el rango de fechas"
+            ) from e
+        finally:
+            vigilancia.cancel()
+            limite.liberar()
+
+    return dependencia
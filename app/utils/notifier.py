@@ -12,7 +12,18 @@ from typing import Optional
 
 # Configurar logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+
+def _configurar_logging() -> None:
+    """
+    Configura el logging de consola en el primer envío.
+
+    Se difiere para no configurar el root logger al importar el módulo
+    durante el arranque de la aplicación.
+    """
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO)
+    logger.setLevel(logging.INFO)
 
 
 def enviar_email_simulado(
@@ -31,6 +42,7 @@ def enviar_email_simulado(
     Returns:
         True si el envío fue exitoso (siempre en modo simulado)
     """
+    _configurar_logging()
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     logger.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -59,6 +71,7 @@ def enviar_whatsapp_simulado(
     Returns:
         True si el envío fue exitoso (siempre en modo simulado)
     """
+    _configurar_logging()
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     logger.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
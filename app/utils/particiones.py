@@ -0,0 +1,238 @@
+"""
+Particionamiento mensual de la tabla ventas (PostgreSQL)
+
+Con VENTAS_PARTICIONADAS=true la migración convierte `ventas` en una
+tabla particionada por rango sobre `fecha`, con una partición por mes
+(ventas_AAAA_MM) y una partición por defecto para fechas fuera de rango.
+Los reportes por período filtran directamente sobre `fecha`, por lo que
+PostgreSQL descarta las particiones que no intersectan el rango.
+
+Este módulo genera el DDL de cada partición, crea las de los próximos
+meses (al arrancar y desde el script de mantenimiento) y retira las
+antiguas. Una partición solo se desacopla cuando ya está vacía, es
+decir, cuando archivo_ventas movió sus ventas al archivo en frío (que
+los reportes y la exportación sí leen); luego se elimina. Así ninguna
+venta queda en una tabla desacoplada que nadie consulta.
+En otros dialectos todas las operaciones son no-op.
+"""
+
+import logging
+import os
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Particionamiento habilitado (solo PostgreSQL)
+VENTAS_PARTICIONADAS = os.getenv("VENTAS_PARTICIONADAS", "false").lower() == "true"
+# Meses futuros con partición creada por adelantado
+PARTICIONES_MESES_FUTUROS = int(os.getenv("PARTICIONES_MESES_FUTUROS", "3"))
+# Meses (incluido el actual) que permanecen adjuntos a ventas
+PARTICIONES_MESES_RETENIDOS = int(os.getenv("PARTICIONES_MESES_RETENIDOS", "18"))
+
+TABLA = "ventas"
+PARTICION_DEFECTO = "ventas_default"
+# Clave del advisory lock que serializa el mantenimiento entre workers
+CLAVE_BLOQUEO = 74_201_042
+
+
+def inicio_mes(fecha: date) -> date:
+    """Primer día del mes de `fecha`"""
+    return date(fecha.year, fecha.month, 1)
+
+
+def sumar_meses(fecha: date, meses: int) -> date:
+    """Primer día del mes que está `meses` después (o antes) del de `fecha`"""
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nombre_particion(fecha: date) -> str:
+    """Nombre de la partición mensual que contiene `fecha` (ventas_AAAA_MM)"""
+    return f"{TABLA}_{fecha.year:04d}_{fecha.month:02d}"
+
+
+def ddl_crear_particion(fecha: date) -> str:
+    """
+    DDL de la partición mensual que contiene `fecha`
+
+    Args:
+        fecha: Cualquier fecha del mes
+
+    Returns:
+        Sentencia CREATE TABLE ... PARTITION OF idempotente
+    """
+    desde = inicio_mes(fecha)
+    hasta = sumar_meses(desde, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {nombre_particion(desde)} PARTITION OF {TABLA} "
+        f"FOR VALUES FROM ('{desde.isoformat()}') TO ('{hasta.isoformat()}')"
+    )
+
+
+def ddl_crear_particion_defecto() -> str:
+    """DDL de la partición que recibe las fechas sin partición mensual"""
+    return f"CREATE TABLE IF NOT EXISTS {PARTICION_DEFECTO} PARTITION OF {TABLA} DEFAULT"
+
+
+def ddl_desacoplar_particion(nombre: str) -> str:
+    """DDL que separa una partición de ventas sin borrar sus datos"""
+    return f"ALTER TABLE {TABLA} DETACH PARTITION {nombre}"
+
+
+def ddl_eliminar_particion(nombre: str) -> str:
+    """DDL que elimina una partición ya desacoplada y vacía"""
+    return f"DROP TABLE {nombre}"
+
+
+def meses_entre(desde: date, hasta: date) -> list[date]:
+    """
+    Primer día de cada mes entre dos fechas (ambos meses incluidos)
+
+    Args:
+        desde: Fecha inicial
+        hasta: Fecha final
+
+    Returns:
+        Lista ordenada de fechas
+    """
+    meses = []
+    actual = inicio_mes(desde)
+    while actual <= hasta:
+        meses.append(actual)
+        actual = sumar_meses(actual, 1)
+    return meses
+
+
+def _es_postgres(conexion) -> bool:
+    return conexion.dialect.name == "postgresql"
+
+
+def esta_particionada(conexion) -> bool:
+    """Indica si `ventas` es una tabla particionada"""
+    if not _es_postgres(conexion):
+        return False
+    return conexion.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :tabla)"
+    ), {"tabla": TABLA}).scalar()
+
+
+def listar_particiones(conexion) -> list[str]:
+    """
+    Particiones adjuntas a ventas, ordenadas por nombre
+
+    Args:
+        conexion: Conexión SQLAlchemy
+
+    Returns:
+        Lista de nombres de partición (vacía si no está particionada)
+    """
+    if not esta_particionada(conexion):
+        return []
+    filas = conexion.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :tabla ORDER BY c.relname"
+    ), {"tabla": TABLA})
+    return [fila[0] for fila in filas]
+
+
+def crear_particiones(conexion, desde: date, hasta: date) -> list[str]:
+    """
+    Crea las particiones mensuales entre dos fechas y la partición por defecto
+
+    Args:
+        conexion: Conexión SQLAlchemy (dentro de una transacción)
+        desde: Primer mes a cubrir
+        hasta: Último mes a cubrir
+
+    Returns:
+        Nombres de las particiones aseguradas
+    """
+    conexion.execute(text(ddl_crear_particion_defecto()))
+    nombres = []
+    for mes in meses_entre(desde, hasta):
+        conexion.execute(text(ddl_crear_particion(mes)))
+        nombres.append(nombre_particion(mes))
+    return nombres
+
+
+def crear_particiones_futuras(engine, meses: int = PARTICIONES_MESES_FUTUROS, hoy: date | None = None) -> list[str]:
+    """
+    Asegura las particiones del mes actual y de los `meses` siguientes
+
+    Usa un advisory lock para que varios workers arrancando a la vez no
+    compitan por el mismo DDL.
+
+    Args:
+        engine: Engine SQLAlchemy
+        meses: Meses futuros a crear
+        hoy: Fecha de referencia (default: hoy)
+
+    Returns:
+        Nombres de las particiones aseguradas (vacía si no aplica)
+    """
+    hoy = hoy or datetime.utcnow().date()
+    with engine.begin() as conexion:
+        if not esta_particionada(conexion):
+            return []
+        conexion.execute(text("SELECT pg_advisory_xact_lock(:clave)"), {"clave": CLAVE_BLOQUEO})
+        return crear_particiones(conexion, hoy, sumar_meses(hoy, meses))
+
+
+def particiones_a_desacoplar(particiones: list[str], retener: int, hoy: date) -> list[str]:
+    """
+    Particiones mensuales más antiguas que los `retener` meses más recientes
+
+    Args:
+        particiones: Nombres de partición adjuntos
+        retener: Meses (incluido el actual) que se conservan
+        hoy: Fecha de referencia
+
+    Returns:
+        Nombres a desacoplar, del más antiguo al más reciente
+    """
+    limite = nombre_particion(sumar_meses(hoy, -(retener - 1)))
+    mensuales = [p for p in particiones if p != PARTICION_DEFECTO]
+    return sorted(p for p in mensuales if p < limite)
+
+
+def desacoplar_particiones_antiguas(
+    engine,
+    retener: int = PARTICIONES_MESES_RETENIDOS,
+    hoy: date | None = None
+) -> list[str]:
+    """
+    Desacopla y elimina las particiones ya archivadas fuera del período retenido
+
+    Archivar primero (archivo_ventas.archivar_periodos_cerrados con la
+    misma retención) vacía esas particiones. Una partición que todavía
+    tiene ventas se deja adjunta: desacoplarla las quitaría de reportes
+    y exportaciones.
+
+    Args:
+        engine: Engine SQLAlchemy
+        retener: Meses (incluido el actual) que permanecen adjuntos
+        hoy: Fecha de referencia (default: hoy)
+
+    Returns:
+        Nombres de las particiones desacopladas y eliminadas
+    """
+    hoy = hoy or datetime.utcnow().date()
+    with engine.begin() as conexion:
+        if not esta_particionada(conexion):
+            return []
+        conexion.execute(text("SELECT pg_advisory_xact_lock(:clave)"), {"clave": CLAVE_BLOQUEO})
+        retiradas = []
+        for nombre in particiones_a_desacoplar(listar_particiones(conexion), retener, hoy):
+            if conexion.execute(text(f"SELECT EXISTS (SELECT 1 FROM {nombre})")).scalar():
+                logger.warning("Partición %s con ventas sin archivar: se mantiene adjunta", nombre)
+                continue
+            conexion.execute(text(ddl_desacoplar_particion(nombre)))
+            conexion.execute(text(ddl_eliminar_particion(nombre)))
+            logger.info("Partición %s desacoplada de %s y eliminada", nombre, TABLA)
+            retiradas.append(nombre)
+        return retiradas
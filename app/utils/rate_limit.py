@@ -0,0 +1,203 @@
+"""
+Limitador de intentos de login con token bucket para Social Sellers.
+
+Rechaza los intentos de login por IP y por email antes de consultar la
+base de datos o ejecutar bcrypt, de modo que el tráfico de credential
+stuffing cuesta microsegundos de CPU por request.
+
+El estado de los buckets vive en un almacén intercambiable:
+AlmacenMemoria (por proceso, por defecto) o AlmacenRedis para compartir
+los límites entre workers e instancias, seleccionado con
+LOGIN_LIMITE_REDIS_URL.
+"""
+
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+# Configuración de los buckets: capacidad (ráfaga) y recarga por minuto
+LOGIN_LIMITE_IP = int(os.getenv("LOGIN_LIMITE_IP", "20"))
+LOGIN_RECARGA_IP_MINUTO = float(os.getenv("LOGIN_RECARGA_IP_MINUTO", "20"))
+LOGIN_LIMITE_EMAIL = int(os.getenv("LOGIN_LIMITE_EMAIL", "5"))
+LOGIN_RECARGA_EMAIL_MINUTO = float(os.getenv("LOGIN_RECARGA_EMAIL_MINUTO", "5"))
+# Redis compartido por workers e instancias (vacío: buckets en memoria del proceso)
+LOGIN_LIMITE_REDIS_URL = os.getenv("LOGIN_LIMITE_REDIS_URL", "")
+
+
+class AlmacenLimites(ABC):
+    """
+    Interfaz de almacén de token buckets.
+
+    Las implementaciones deben consumir tokens de forma atómica.
+    """
+
+    @abstractmethod
+    def consumir(self, clave: str, capacidad: int, recarga_por_segundo: float) -> float:
+        """
+        Consume un token del bucket indicado.
+
+        Args:
+            clave: Identificador del bucket
+            capacidad: Tokens máximos (tamaño de ráfaga)
+            recarga_por_segundo: Tokens que se recuperan por segundo
+
+        Returns:
+            0 si se permitió el intento, o segundos a esperar para reintentar
+        """
+
+    @abstractmethod
+    def limpiar(self) -> None:
+        """Elimina todos los buckets."""
+
+
+class AlmacenMemoria(AlmacenLimites):
+    """Buckets en memoria del proceso, acotados a max_claves."""
+
+    def __init__(self, max_claves: int = 100_000):
+        self.max_claves = max_claves
+        self._lock = threading.Lock()
+        # clave -> [tokens, último acceso, instante en que el bucket estará lleno]
+        self._buckets: dict[str, list[float]] = {}
+
+    def consumir(self, clave: str, capacidad: int, recarga_por_segundo: float) -> float:
+        ahora = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(clave)
+            if bucket is None:
+                if len(self._buckets) >= self.max_claves:
+                    self._purgar(ahora)
+                tokens = float(capacidad)
+            else:
+                tokens = min(capacidad, bucket[0] + (ahora - bucket[1]) * recarga_por_segundo)
+
+            if tokens >= 1:
+                tokens -= 1
+                espera = 0.0
+            else:
+                espera = (1 - tokens) / recarga_por_segundo
+
+            lleno_en = ahora + (capacidad - tokens) / recarga_por_segundo
+            self._buckets[clave] = [tokens, ahora, lleno_en]
+            return espera
+
+    def _purgar(self, ahora: float) -> None:
+        """Descarta buckets ya recargados (equivalen a uno nuevo)."""
+        self._buckets = {c: b for c, b in self._buckets.items() if b[2] > ahora}
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class AlmacenRedis(AlmacenLimites):
+    """
+    Buckets compartidos en Redis, consumidos atómicamente con un script Lua.
+
+    Recibe un cliente compatible con redis-py (redis.Redis), de modo que
+    la dependencia solo se requiere al usar este almacén.
+    """
+
+    SCRIPT = """
+    local capacidad = tonumber(ARGV[1])
+    local recarga = tonumber(ARGV[2])
+    local ahora = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacidad
+    local ts = tonumber(bucket[2]) or ahora
+    tokens = math.min(capacidad, tokens + (ahora - ts) * recarga)
+    local espera = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        espera = (1 - tokens) / recarga
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', ahora)
+    redis.call('EXPIRE', KEYS[1], math.ceil((capacidad - tokens) / recarga) + 1)
+    return tostring(espera)
+    """
+
+    def __init__(self, cliente, prefijo: str = "ss:login:"):
+        self.cliente = cliente
+        self.prefijo = prefijo
+        self._script = cliente.register_script(self.SCRIPT)
+
+    def consumir(self, clave: str, capacidad: int, recarga_por_segundo: float) -> float:
+        espera = self._script(
+            keys=[self.prefijo + clave],
+            args=[capacidad, recarga_por_segundo, time.time()]
+        )
+        return float(espera)
+
+    def limpiar(self) -> None:
+        for clave in self.cliente.scan_iter(self.prefijo + "*"):
+            self.cliente.delete(clave)
+
+
+def crear_almacen(redis_url: str = LOGIN_LIMITE_REDIS_URL) -> AlmacenLimites:
+    """
+    Almacén de buckets según la configuración
+
+    Args:
+        redis_url: URL de Redis; vacía para usar la memoria del proceso
+
+    Returns:
+        AlmacenRedis si hay URL, AlmacenMemoria en otro caso
+
+    Raises:
+        RuntimeError: Si se configuró Redis y el paquete redis no está instalado
+    """
+    if not redis_url:
+        return AlmacenMemoria()
+    try:
+        import redis
+    except ImportError as e:
+        raise RuntimeError("LOGIN_LIMITE_REDIS_URL requiere el paquete redis (pip install redis)") from e
+    return AlmacenRedis(redis.Redis.from_url(redis_url))
+
+
+class LimitadorLogin:
+    """Limitador de intentos de login por IP y por email."""
+
+    def __init__(self, almacen: AlmacenLimites | None = None):
+        self.almacen = almacen or crear_almacen()
+        self.rechazados = 0
+
+    def configurar_almacen(self, almacen: AlmacenLimites) -> None:
+        """Reemplaza el almacén (por ejemplo, por AlmacenRedis en producción)."""
+        self.almacen = almacen
+
+    def verificar(self, ip: str | None, email: str) -> int:
+        """
+        Registra un intento de login y decide si se permite.
+
+        Args:
+            ip: IP del cliente (None si no se conoce)
+            email: Email enviado en el formulario
+
+        Returns:
+            0 si se permite, o segundos de Retry-After si se rechaza
+        """
+        espera = 0.0
+        if ip:
+            espera = self.almacen.consumir(
+                f"ip:{ip}", LOGIN_LIMITE_IP, LOGIN_RECARGA_IP_MINUTO / 60
+            )
+        if not espera:
+            espera = self.almacen.consumir(
+                f"email:{email.strip().lower()}", LOGIN_LIMITE_EMAIL, LOGIN_RECARGA_EMAIL_MINUTO / 60
+            )
+        if espera:
+            self.rechazados += 1
+            return max(1, math.ceil(espera))
+        return 0
+
+    def reiniciar(self) -> None:
+        """Vacía los buckets y el contador de rechazos."""
+        self.almacen.limpiar()
+        self.rechazados = 0
+
+
+# Limitador compartido por el proceso
+limitador_login = LimitadorLogin()
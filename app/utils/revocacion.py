@@ -0,0 +1,60 @@
+"""
+Registro en memoria de versiones de token para Social Sellers.
+
+Los tokens de acceso llevan el claim `ver` con el token_version del
+usuario al momento del login. Revocar los tokens de un usuario
+incrementa su token_version; este registro mantiene en memoria solo
+los usuarios con versión > 0 y se refresca periódicamente desde la base
+de datos, de modo que validar un token no requiere consultas salvo
+una vez por intervalo.
+"""
+
+import os
+import threading
+import time
+
+# Segundos entre refrescos del registro desde la base de datos
+AUTH_REVOCACION_TTL = float(os.getenv("AUTH_REVOCACION_TTL", "30"))
+
+
+class RegistroVersionesToken:
+    """Versiones de token vigentes para usuarios con revocaciones."""
+
+    def __init__(self, ttl: float = AUTH_REVOCACION_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versiones: dict[int, int] = {}
+        self._actualizado = 0.0
+
+    def expirado(self) -> bool:
+        """Indica si el registro debe refrescarse desde la base de datos."""
+        return time.monotonic() - self._actualizado >= self.ttl
+
+    def refrescar(self, versiones: dict[int, int]) -> None:
+        """
+        Reemplaza el registro con las versiones leídas de la base de datos.
+
+        Args:
+            versiones: Dict de usuario_id a token_version (solo versiones > 0)
+        """
+        with self._lock:
+            self._versiones = dict(versiones)
+            self._actualizado = time.monotonic()
+
+    def registrar(self, usuario_id: int, version: int) -> None:
+        """Aplica de inmediato una revocación hecha en este proceso."""
+        with self._lock:
+            self._versiones[usuario_id] = version
+
+    def version(self, usuario_id: int) -> int:
+        """Versión de token vigente para un usuario (0 si nunca fue revocado)."""
+        return self._versiones.get(usuario_id, 0)
+
+    def invalidar(self) -> None:
+        """Fuerza un refresco en la próxima validación."""
+        with self._lock:
+            self._actualizado = 0.0
+
+
+# Registro compartido por el proceso
+registro_versiones_token = RegistroVersionesToken()
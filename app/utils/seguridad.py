@@ -0,0 +1,38 @@
+"""
+Headers de seguridad para todas las respuestas HTTP
+
+Middleware ASGI puro: agrega los headers en el mensaje
+http.response.start y reenvía el cuerpo sin almacenarlo, por lo que
+las respuestas en streaming siguen fluyendo. No modifica el Content-Type
+que definió cada respuesta.
+"""
+
+from starlette.datastructures import MutableHeaders
+
+# Headers agregados a cada respuesta
+HEADERS_SEGURIDAD = {
+    "Cache-Control": "no-store",
+    "X-Content-Type-Options": "nosniff",
+}
+
+
+class CabecerasSeguridadMiddleware:
+    """Middleware ASGI que agrega HEADERS_SEGURIDAD a las respuestas HTTP"""
+
+    def __init__(self, app, headers: dict = None):
+        self.app = app
+        self.headers = headers if headers is not None else HEADERS_SEGURIDAD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for nombre, valor in self.headers.items():
+                    headers[nombre] = valor
+            await send(message)
+
+        await self.app(scope, receive, enviar)
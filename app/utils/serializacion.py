@@ -0,0 +1,71 @@
+"""
+Serialización rápida de respuestas para Social Sellers.
+
+Los endpoints de listado retornan filas ORM confiables: en lugar de
+validarlas con el response_model de FastAPI, convertirlas a objetos
+Python y luego a JSON, se leen directamente los atributos que declara
+el schema y se serializan con orjson en una sola pasada. El
+response_model del endpoint se mantiene para la documentación OpenAPI.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+
+import orjson
+from fastapi.responses import Response
+
+
+def _default(valor):
+    """Tipos que orjson no serializa de forma nativa."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError
+
+
+@lru_cache(maxsize=None)
+def _lector(schema) -> tuple[tuple[str, ...], attrgetter]:
+    """Campos del schema y un attrgetter que los lee en una llamada."""
+    campos = tuple(schema.model_fields)
+    return campos, attrgetter(*campos)
+
+
+def serializar_filas(filas, schema) -> bytes:
+    """
+    Serializa filas ORM (o filas de consulta) a un array JSON.
+
+    Solo debe usarse con datos de la base de datos, que ya cumplen los
+    tipos del schema: no se ejecuta validación.
+
+    Args:
+        filas: Iterable de objetos con los atributos del schema
+        schema: Schema Pydantic cuyos campos definen la salida
+
+    Returns:
+        JSON codificado en UTF-8
+    """
+    campos, leer = _lector(schema)
+    if len(campos) == 1:
+        datos = [{campos[0]: leer(fila)} for fila in filas]
+    else:
+        datos = [dict(zip(campos, leer(fila))) for fila in filas]
+    return orjson.dumps(datos, default=_default)
+
+
+def respuesta_filas(filas, schema, status_code: int = 200) -> Response:
+    """
+    Construye una respuesta JSON a partir de filas ORM sin revalidarlas.
+
+    Args:
+        filas: Iterable de objetos con los atributos del schema
+        schema: Schema Pydantic cuyos campos definen la salida
+        status_code: Código HTTP de la respuesta
+
+    Returns:
+        Response con media type application/json
+    """
+    return Response(
+        content=serializar_filas(filas, schema),
+        status_code=status_code,
+        media_type="application/json"
+    )
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark del motor analítico columnar de reportes
+Group-by vectorizados sobre la copia en memoria de ventas
+
+Ejecutar: python -m benchmarks.bench_analitica [--filas 10000000] [--comparar-sql 200000]
+
+- Columnar: genera --filas ventas sintéticas (popularidad Pareto) directamente
+  en la copia columnar y mide resumen por período, ranking de productos y
+  totales por vendedor (base de comisiones), además de la carga incremental
+- --comparar-sql N: siembra N ventas en un SQLite temporal con el seed de
+  volumen y compara los reportes de crud por SQL contra el modo columnar
+
+Requiere numpy.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Agregar root al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import crud
+from app.models import Base
+from app.utils import analitica
+from app.utils.analitica import SnapshotVentas
+
+def medir(funcion, repeticiones: int) -> float:
+    """Mediana en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def generar_columnas(filas: int, vendedores: int, productos: int, desde_id: int = 1) -> dict:
+    """Columnas sintéticas con vendedores y productos de popularidad Pareto"""
+    rng = np.random.default_rng(42 + desde_id)
+    inicio = np.datetime64("2025-01-01T00:00:00", "us")
+    segundos = np.sort(rng.integers(0, 365 * 86_400, filas))
+    return {
+        "id": np.arange(desde_id, desde_id + filas, dtype="int64"),
+        "fecha": inicio + segundos.astype("timedelta64[s]"),
+        "vendedor_id": np.minimum(rng.pareto(1.16, filas).astype("int64"), vendedores - 1) + 1,
+        "producto_id": np.minimum(rng.pareto(1.16, filas).astype("int64"), productos - 1) + 1,
+        "cantidad": rng.integers(1, 6, filas),
+        "centavos": rng.integers(100, 50_000, filas),
+    }
+
+def benchmark_columnar(filas: int, vendedores: int, productos: int, repeticiones: int):
+    snapshot = SnapshotVentas(ruta=None)
+    inicio = time.perf_counter()
+    snapshot.agregar(generar_columnas(filas, vendedores, productos))
+    print(f"\n📦 Copia de {filas:,} ventas construida en {(time.perf_counter() - inicio):.1f}s "
+          f"({sum(snapshot.columna(c).nbytes for c in analitica.COLUMNAS) / 2**20:.0f} MiB)")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        snapshot.ruta = f"{directorio}/ventas.npz"
+        inicio = time.perf_counter()
+        snapshot.guardar()
+        guardado = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        SnapshotVentas(ruta=snapshot.ruta).cargar()
+        print(f"💾 Copia en disco: guardada en {guardado:.1f}s, retomada en {(time.perf_counter() - inicio):.1f}s")
+    snapshot.ruta = None
+
+    desde, hasta = datetime(2025, 3, 1), datetime(2025, 6, 30, 23, 59, 59)
+    escenarios = {
+        "resumen total": lambda: snapshot.resumen(),
+        "resumen por período (4 meses)": lambda: snapshot.resumen(desde, hasta),
+        "totales por producto": snapshot.por_producto,
+        "totales por vendedor": snapshot.por_vendedor,
+        "agregar 10.000 ventas nuevas": lambda: snapshot.agregar(
+            generar_columnas(10_000, vendedores, productos, desde_id=snapshot.ultimo_id + 1)
+        ),
+    }
+    for nombre, funcion in escenarios.items():
+        print(f"  {nombre:<32} {medir(funcion, repeticiones):10.1f} ms")
+
+def benchmark_sql(ventas: int, repeticiones: int):
+    from app.scripts.seed_database import sembrar_volumen
+
+    with tempfile.TemporaryDirectory() as directorio:
+        engine = create_engine(f"sqlite:///{directorio}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        sembrar_volumen(engine, vendedores=1000, productos=5000, ventas=ventas, progreso=lambda _: None)
+        db = sessionmaker(bind=engine)()
+
+        desde, hasta = datetime.now().replace(month=1, day=1), datetime.now()
+        reportes = {
+            "resumen por período": lambda: crud.obtener_resumen_por_periodo(db, desde, hasta),
+            "top productos": lambda: crud.obtener_top_productos(db, limite=10),
+            "top vendedores": lambda: crud.obtener_top_vendedores(db, limite=10),
+            "comisiones": lambda: crud.calcular_comisiones(db),
+        }
+
+        print(f"\n🔁 SQL vs columnar ({ventas:,} ventas en SQLite)")
+        sql = {nombre: medir(funcion, repeticiones) for nombre, funcion in reportes.items()}
+        analitica.ANALITICA_COLUMNAR = True
+        snapshot = analitica.obtener_snapshot()
+        snapshot.ruta = None
+        snapshot.reiniciar()
+        inicio = time.perf_counter()
+        snapshot.actualizar(db)
+        print(f"  Carga inicial de la copia: {(time.perf_counter() - inicio):.1f}s")
+        for nombre, funcion in reportes.items():
+            columnar = medir(funcion, repeticiones)
+            print(f"  {nombre:<22} SQL {sql[nombre]:9.1f} ms   columnar {columnar:9.1f} ms   "
+                  f"(x{sql[nombre] / columnar:.1f})")
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10_000_000, help="Ventas en la copia columnar")
+    parser.add_argument("--vendedores", type=int, default=10_000, help="Vendedores distintos")
+    parser.add_argument("--productos", type=int, default=50_000, help="Productos distintos")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por escenario")
+    parser.add_argument("--comparar-sql", type=int, default=0, help="Ventas para comparar contra SQL (0 = no)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 BENCHMARK ANALÍTICA COLUMNAR")
+    print("=" * 60)
+
+    benchmark_columnar(args.filas, args.vendedores, args.productos, args.repeticiones)
+    if args.comparar_sql:
+        benchmark_sql(args.comparar_sql, args.repeticiones)
+
+if __name__ == "__main__":
+    main()
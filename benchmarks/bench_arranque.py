@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque en frío
+Perfil de importación (-X importtime) de app.main y tiempo hasta el primer byte
+
+Ejecutar: python -m benchmarks.bench_arranque [--repeticiones 5] [--objetivo-ms 1500]
+
+- Importación: ejecuta `python -X importtime -c "import app.main"` en procesos
+  nuevos y muestra los módulos con mayor tiempo acumulado
+- TTFB: lanza uvicorn y mide desde el inicio del proceso hasta la primera
+  respuesta 200 en "/". Termina con código 1 si supera --objetivo-ms
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+
+LINEA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def perfil_importacion() -> dict[str, tuple[int, int]]:
+    """
+    Importa app.main en un proceso nuevo con -X importtime
+
+    Returns:
+        Dict de módulo a (µs propios, µs acumulados)
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=root_dir, capture_output=True, text=True, check=True
+    )
+    perfil = {}
+    for linea in resultado.stderr.splitlines():
+        coincidencia = LINEA_IMPORTTIME.match(linea)
+        if coincidencia:
+            propio, acumulado, _, modulo = coincidencia.groups()
+            perfil[modulo] = (int(propio), int(acumulado))
+    return perfil
+
+def puerto_libre() -> int:
+    """Obtiene un puerto TCP libre en localhost"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def medir_ttfb(timeout: float = 30.0) -> float:
+    """
+    Lanza uvicorn y mide los milisegundos hasta la primera respuesta de "/"
+
+    Returns:
+        Milisegundos desde el inicio del proceso hasta el primer 200
+    """
+    puerto = puerto_libre()
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(puerto), "--log-level", "warning"],
+        cwd=root_dir, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - inicio < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/", timeout=1) as respuesta:
+                    if respuesta.status == 200:
+                        return (time.perf_counter() - inicio) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("uvicorn no respondió a tiempo")
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5, help="Mediciones por métrica")
+    parser.add_argument("--top", type=int, default=20, help="Módulos a listar en el perfil")
+    parser.add_argument("--objetivo-ms", type=float, default=1500.0, help="TTFB máximo aceptado")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🚀 BENCHMARK ARRANQUE EN FRÍO")
+    print("=" * 60)
+
+    perfil_importacion()  # Compila bytecode
+    perfiles = [perfil_importacion() for _ in range(args.repeticiones)]
+    totales = [p["app.main"][1] / 1000 for p in perfiles]
+    ultimo = perfiles[-1]
+
+    print(f"\n📦 import app.main: mediana {statistics.median(totales):.1f} ms")
+    print(f"\nTop {args.top} módulos por tiempo acumulado (µs):")
+    for modulo, (propio, acumulado) in sorted(ultimo.items(), key=lambda m: -m[1][1])[:args.top]:
+        print(f"  {acumulado:>9} {propio:>9}  {modulo}")
+
+    pesados = ("jose", "cryptography", "bcrypt", "email_validator", "psycopg2")
+    cargados = sorted({m.split(".")[0] for m in ultimo if m.split(".")[0] in pesados})
+    print(f"\nDependencias pesadas cargadas al importar: {', '.join(cargados) or 'ninguna'}")
+
+    ttfb = [medir_ttfb() for _ in range(args.repeticiones)]
+    mediana = statistics.median(ttfb)
+    print(f"\n⏱️  TTFB (proceso → primer 200 en /): mediana {mediana:.0f} ms, "
+          f"min {min(ttfb):.0f} ms, max {max(ttfb):.0f} ms")
+    print(f"🎯 Objetivo: {args.objetivo_ms:.0f} ms")
+
+    if mediana > args.objetivo_ms:
+        print("❌ TTFB por encima del objetivo")
+        sys.exit(1)
+    print("✅ TTFB dentro del objetivo")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark del cache de tokens JWT decodificados
+Compara el costo de autenticación por request en /auth/me con y sin cache
+
+Ejecutar: python -m benchmarks.bench_auth_cache [--requests 2000]
+"""
+import argparse
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+# Agregar root al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import auth, crud, schemas
+from app.database import Base, get_db
+from app.main import app
+from app.utils.jwt_cache import cache_tokens
+
+def preparar_cliente():
+    """Crea BD en memoria con un usuario y retorna (cliente, token)"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    db = SessionLocal()
+    usuario = crud.crear_usuario(
+        db,
+        schemas.UsuarioRegistro(nombre="Bench", email="bench@test.com", password="x", rol="vendedor"),
+        auth.hashear_password("bench123"),
+    )
+    token = auth.crear_access_token(auth.claims_usuario(usuario), expires_delta=timedelta(minutes=30))
+    db.close()
+
+    return TestClient(app), token
+
+def medir(funcion, repeticiones: int) -> float:
+    """Retorna microsegundos promedio por llamada"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests por escenario")
+    args = parser.parse_args()
+
+    client, token = preparar_cliente()
+    headers = {"Authorization": f"Bearer {token}"}
+    capacidad = cache_tokens.capacidad or 4096
+
+    resultados = {}
+    for nombre, tamano in (("sin cache", 0), ("con cache", capacidad)):
+        cache_tokens.capacidad = tamano
+        cache_tokens.limpiar()
+
+        # Calentamiento
+        for _ in range(50):
+            client.get("/auth/me", headers=headers)
+
+        decode_us = medir(lambda: auth.decodificar_token(token), args.requests * 5)
+        request_us = medir(lambda: client.get("/auth/me", headers=headers), args.requests)
+        resultados[nombre] = (decode_us, request_us, cache_tokens.estadisticas())
+
+    print("=" * 60)
+    print("🔐 BENCHMARK CACHE JWT - /auth/me")
+    print("=" * 60)
+    for nombre, (decode_us, request_us, stats) in resultados.items():
+        print(f"\n{nombre}:")
+        print(f"  - decodificar_token: {decode_us:8.2f} µs/llamada")
+        print(f"  - GET /auth/me:      {request_us:8.2f} µs/request")
+        print(f"  - métricas cache:    {stats}")
+
+    ahorro = resultados["sin cache"][0] - resultados["con cache"][0]
+    print(f"\n✅ Ahorro por request en verificación JWT: {ahorro:.2f} µs")
+
+if __name__ == "__main__":
+    main()
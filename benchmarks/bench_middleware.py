@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark del middleware de headers de seguridad
+Compara @app.middleware("http") (BaseHTTPMiddleware) con el middleware ASGI puro
+
+Ejecutar: python -m benchmarks.bench_middleware [--requests 20000] [--repeticiones 3]
+
+Ambas variantes exponen el mismo GET / que app.main y se invocan
+directamente por ASGI (sin red) para aislar el costo del middleware.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from app.utils.seguridad import CabecerasSeguridadMiddleware, HEADERS_SEGURIDAD
+
+def crear_app() -> FastAPI:
+    """App mínima con el endpoint raíz de app.main"""
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/")
+    def root():
+        return {"mensaje": "API Social Sellers activa"}
+
+    return app
+
+def app_base_http() -> FastAPI:
+    """Variante anterior: BaseHTTPMiddleware vía @app.middleware("http")"""
+    app = crear_app()
+
+    @app.middleware("http")
+    async def add_security_headers(request: Request, call_next):
+        response = await call_next(request)
+        for nombre, valor in HEADERS_SEGURIDAD.items():
+            response.headers[nombre] = valor
+        return response
+
+    return app
+
+def app_asgi() -> FastAPI:
+    """Variante actual: CabecerasSeguridadMiddleware"""
+    app = crear_app()
+    app.add_middleware(CabecerasSeguridadMiddleware)
+    return app
+
+async def medir(app, requests: int) -> float:
+    """
+    Ejecuta `requests` llamadas ASGI a GET / y retorna requests por segundo
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # Calentamiento
+        await app(dict(scope), receive, send)
+
+    inicio = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - inicio)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000, help="Requests por medición")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Mediciones por variante")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🛡️  BENCHMARK MIDDLEWARE DE SEGURIDAD - GET /")
+    print("=" * 60)
+
+    resultados = {}
+    for nombre, fabrica in (("BaseHTTPMiddleware", app_base_http), ("ASGI puro", app_asgi)):
+        app = fabrica()
+        rps = [asyncio.run(medir(app, args.requests)) for _ in range(args.repeticiones)]
+        resultados[nombre] = statistics.median(rps)
+        print(f"  {nombre:<20} {resultados[nombre]:10.0f} req/s")
+
+    ganancia = resultados["ASGI puro"] / resultados["BaseHTTPMiddleware"]
+    print(f"\n⚡ Ganancia: x{ganancia:.2f}")
+
+if __name__ == "__main__":
+    main()
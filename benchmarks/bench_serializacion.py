@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de respuestas de listado
+Compara el camino de FastAPI (response_model) con la serialización directa con orjson
+
+Ejecutar: python -m benchmarks.bench_serializacion [--filas 10000]
+
+Escenarios sobre N ventas ORM:
+- response_model + json: validación from_attributes, dump a objetos Python y json.dumps
+  (camino por defecto de FastAPI con JSONResponse)
+- response_model + orjson: igual, pero renderizado con orjson (ORJSONResponse)
+- respuesta_filas: lectura directa de atributos y orjson, sin validación
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar root al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+import orjson
+from pydantic import TypeAdapter
+from app import models, schemas
+from app.utils.serializacion import serializar_filas
+
+def generar_ventas(n: int) -> list:
+    """Genera n ventas ORM en memoria (sin base de datos)"""
+    base = datetime(2025, 1, 1)
+    return [
+        models.Venta(
+            id=i, producto_id=i % 500 + 1, vendedor_id=i % 50 + 1,
+            cantidad=i % 5 + 1, total=round((i % 5 + 1) * 19.99, 2),
+            fecha=base + timedelta(minutes=i)
+        )
+        for i in range(1, n + 1)
+    ]
+
+def medir(funcion, repeticiones: int) -> float:
+    """Mediana en milisegundos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10_000, help="Filas por respuesta")
+    parser.add_argument("--repeticiones", type=int, default=20, help="Repeticiones por escenario")
+    args = parser.parse_args()
+
+    ventas = generar_ventas(args.filas)
+    adaptador = TypeAdapter(list[schemas.VentaResponse])
+
+    def response_model_json():
+        validado = adaptador.validate_python(ventas, from_attributes=True)
+        return json.dumps(adaptador.dump_python(validado, mode="json")).encode("utf-8")
+
+    def response_model_orjson():
+        validado = adaptador.validate_python(ventas, from_attributes=True)
+        return orjson.dumps(adaptador.dump_python(validado, mode="json"))
+
+    def directo():
+        return serializar_filas(ventas, schemas.VentaResponse)
+
+    assert json.loads(response_model_json()) == json.loads(directo())
+
+    print("=" * 60)
+    print(f"📦 BENCHMARK SERIALIZACIÓN - {args.filas} ventas")
+    print("=" * 60)
+    base = None
+    for nombre, funcion in (
+        ("response_model + json", response_model_json),
+        ("response_model + orjson", response_model_orjson),
+        ("respuesta_filas (orjson)", directo),
+    ):
+        ms = medir(funcion, args.repeticiones)
+        base = base or ms
+        print(f"  {nombre:<26} {ms:8.2f} ms  (x{base / ms:.2f})")
+
+if __name__ == "__main__":
+    main()
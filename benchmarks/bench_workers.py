@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalado por cantidad de workers
+Mide el throughput de Gunicorn + Uvicorn con 1..N workers
+
+Ejecutar: python -m benchmarks.bench_workers [--workers 1 2 4] [--segundos 10] [--clientes 8]
+
+Para cada cantidad de workers lanza gunicorn con gunicorn.conf.py
+(WEB_CONCURRENCY fija los workers), espera /salud/listo y genera carga
+desde procesos cliente con conexiones keep-alive sobre --ruta.
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+
+def puerto_libre() -> int:
+    """Obtiene un puerto TCP libre en localhost"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def esperar_listo(puerto: int, timeout: float = 60.0):
+    """Espera a que /salud/listo responda 200"""
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < timeout:
+        try:
+            conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=1)
+            conexion.request("GET", "/salud/listo")
+            if conexion.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError("gunicorn no quedó listo a tiempo")
+
+def cliente(puerto: int, ruta: str, segundos: float, cola):
+    """Proceso cliente: envía requests secuenciales durante `segundos`"""
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=10)
+    completados = 0
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        conexion.request("GET", ruta)
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        completados += 1
+    conexion.close()
+    cola.put(completados)
+
+def medir(workers: int, ruta: str, segundos: float, clientes: int) -> float:
+    """Lanza gunicorn con `workers` y retorna requests por segundo"""
+    puerto = puerto_libre()
+    entorno = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(puerto), "GUNICORN_LOG_LEVEL": "warning"}
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+        cwd=root_dir, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        esperar_listo(puerto)
+        cola = multiprocessing.Queue()
+        procesos = [
+            multiprocessing.Process(target=cliente, args=(puerto, ruta, segundos, cola))
+            for _ in range(clientes)
+        ]
+        for p in procesos:
+            p.start()
+        total = sum(cola.get() for _ in procesos)
+        for p in procesos:
+            p.join()
+        return total / segundos
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Cantidades de workers a medir")
+    parser.add_argument("--segundos", type=float, default=10.0, help="Duración de cada medición")
+    parser.add_argument("--clientes", type=int, default=8, help="Procesos cliente concurrentes")
+    parser.add_argument("--ruta", default="/", help="Ruta a solicitar")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"⚙️  BENCHMARK WORKERS - GET {args.ruta} ({os.cpu_count()} CPUs)")
+    print("=" * 60)
+
+    base = None
+    for workers in args.workers:
+        rps = medir(workers, args.ruta, args.segundos, args.clientes)
+        base = base or rps
+        print(f"  {workers:>3} workers: {rps:10.1f} req/s  (x{rps / base:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Configuración de Gunicorn para producción
+Workers Uvicorn dimensionados por CPU y por presupuesto de conexiones a BD
+
+Ejecutar: gunicorn app.main:app -c gunicorn.conf.py
+
+Variables de entorno:
+    WEB_CONCURRENCY: Cantidad de workers (default "auto" = uno por CPU)
+    DB_MAX_CONEXIONES: Conexiones a BD disponibles para esta instancia (acota "auto")
+    DB_POOL_SIZE / DB_MAX_OVERFLOW: Pool por worker (ver app/database.py)
+    GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: Reciclado de workers
+    GUNICORN_GRACEFUL_TIMEOUT: Segundos para terminar requests en curso al reiniciar
+    FORWARDED_ALLOW_IPS: IPs del proxy de la plataforma cuyos X-Forwarded-*
+        se aceptan (obligatoria; separadas por coma, gunicorn no acepta rangos)
+
+Con más de un worker, el estado en memoria es por proceso: el canal
+de inventario (WebSocket), los buckets de login (salvo
+LOGIN_LIMITE_REDIS_URL), el registro de versiones de token, el cache
+de estadísticas y el directorio de vendedores. Ninguno afecta la
+corrección: la difusión de stock llega solo a los clientes del mismo
+worker, los límites de login son por worker (configurar
+LOGIN_LIMITE_REDIS_URL para compartirlos), una revocación tarda hasta
+AUTH_REVOCACION_TTL segundos en verse y los caches validan por versión
+o expiran. WEB_CONCURRENCY=1 deja un solo proceso si se prefiere.
+"""
+import os
+
+def calcular_workers() -> int:
+    """
+    Workers configurados: núcleos de CPU por defecto (WEB_CONCURRENCY=auto) o un número fijo
+
+    En modo auto, cada worker Uvicorn es asíncrono, así que uno por núcleo
+    satura la CPU; cada uno mantiene su propio pool de DB_POOL_SIZE +
+    DB_MAX_OVERFLOW conexiones, que no debe exceder DB_MAX_CONEXIONES en total.
+    """
+    concurrencia = os.getenv("WEB_CONCURRENCY", "auto")
+    if concurrencia != "auto":
+        return max(1, int(concurrencia))
+
+    workers = os.cpu_count() or 1
+    presupuesto = os.getenv("DB_MAX_CONEXIONES")
+    if presupuesto:
+        por_worker = int(os.getenv("DB_POOL_SIZE", "5")) + int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        workers = min(workers, int(presupuesto) // por_worker)
+    return max(1, workers)
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = calcular_workers()
+
+# Reciclar workers periódicamente; el jitter evita que reinicien todos a la vez
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+# Reinicios graceful (SIGHUP / deploys): tiempo para terminar requests en curso
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+# Cada worker crea su engine y ejecuta el lifespan (calentamiento) tras el fork:
+# precargar la app compartiría conexiones del pool entre procesos
+preload_app = False
+
+def proxy_confiable() -> str:
+    """
+    IPs del proxy cuyos X-Forwarded-For se aceptan
+
+    Railway termina TLS en su proxy: sin confiar en sus IPs todos los
+    clientes llegan con la IP del proxy y comparten un único bucket de
+    login. Con ellas, el worker reemplaza request.client por la primera
+    IP no confiable de X-Forwarded-For (de derecha a izquierda), que es
+    la que limita el login. "*" confía en cualquiera y toma la IP que
+    envíe el cliente: solo sirve si la instancia no es alcanzable sin
+    pasar por el proxy.
+
+    Raises:
+        RuntimeError: Si FORWARDED_ALLOW_IPS no está configurada
+    """
+    ips = os.getenv("FORWARDED_ALLOW_IPS", "").strip()
+    if not ips:
+        raise RuntimeError(
+            "FORWARDED_ALLOW_IPS es obligatoria: configurar las IPs del proxy de la "
+            "plataforma para que el límite de login use la IP de cada cliente"
+        )
+    return ips
+
+forwarded_allow_ips = proxy_confiable()
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
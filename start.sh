@@ -1,6 +1,6 @@
 #!/bin/bash
 # Script de inicio para Railway
-# Expande correctamente la variable PORT
+# Gunicorn con workers Uvicorn (ver gunicorn.conf.py para el dimensionamiento)
+# PORT se lee en gunicorn.conf.py
 
-PORT=${PORT:-8080}
-exec uvicorn app.main:app --host 0.0.0.0 --port $PORT
+exec gunicorn app.main:app -c gunicorn.conf.py
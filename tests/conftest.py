@@ -2,13 +2,23 @@
 Configuración centralizada de tests para Social Sellers Backend
 Fixtures compartidos para todos los módulos de testing
 """
+import os
+
+# Sin calentamiento: el lifespan no debe tocar la BD configurada (./test.db)
+os.environ.setdefault("WARMUP_HABILITADO", "false")
+# Sin copia analítica en disco: cada test parte de su propia BD en memoria
+os.environ.setdefault("ANALITICA_COPIA", "")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.main import app
 from app.database import Base, get_db
+from app.utils.directorio_vendedores import directorio_vendedores
+from app.utils.rate_limit import limitador_login
+from app.utils.revocacion import registro_versiones_token
 
 # Base de datos en memoria para testing (no usa archivo físico)
 # El uso de StaticPool y check_same_thread=False es necesario para SQLite en memoria con FastAPI
@@ -20,7 +30,21 @@ engine = create_engine(
     poolclass=StaticPool,  # Mantiene una sola conexión para toda la sesión de tests
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def reiniciar_estado_auth():
+    """
+    Reinicia el estado de autenticación en memoria en cada test.
+    Los IDs de usuario se reutilizan entre tests al recrear las tablas
+    (por eso también se vacía el directorio de vendedores), y todos los
+    tests hacen login desde la misma IP del TestClient.
+    """
+    registro_versiones_token.invalidar()
+    limitador_login.reiniciar()
+    directorio_vendedores.limpiar()
+    yield
 
 
 @pytest.fixture(scope="function")
@@ -43,6 +67,19 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def contador_consultas():
+    """Cuenta las sentencias SQL ejecutadas sobre el engine de test"""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    yield consultas
+    event.remove(engine, "before_cursor_execute", registrar)
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """
@@ -0,0 +1,125 @@
+"""
+Tests para el control de admisión por grupo de rutas
+"""
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.routers import salud
+from app.utils.admision import AdmisionMiddleware, AdmisionRechazada, GrupoAdmision, clasificar
+from tests.conftest import crear_usuario_y_login
+
+
+@pytest.mark.parametrize("metodo,ruta,grupo", [
+    ("POST", "/auth/login", "auth"),
+    ("GET", "/reportes/exportar/csv", "exportaciones"),
+    ("GET", "/reportes/top-productos", "reportes"),
+    ("GET", "/comisiones/calcular", "reportes"),
+    ("GET", "/vendedores/me/estadisticas", "reportes"),
+    ("GET", "/vendedores/7/estadisticas", "reportes"),
+    ("POST", "/ventas/registrar", "escrituras"),
+    ("GET", "/ventas/listar", "lecturas"),
+    ("GET", "/admin/usuarios", "lecturas"),
+    ("GET", "/salud/listo", None),
+])
+def test_clasificar_rutas(metodo, ruta, grupo):
+    """Test: Cada ruta cae en su grupo y solo la readiness queda sin límite"""
+    assert clasificar(metodo, ruta) == grupo
+
+
+def test_grupo_encola_rechaza_y_cede_cupos():
+    """Test: Con el grupo lleno se encola, con la cola llena 429 y al vencer la espera 503"""
+    async def escenario():
+        grupo = GrupoAdmision("reportes", maximo=1, cola=1, espera=0.2)
+        await grupo.adquirir()
+
+        encolado = asyncio.create_task(grupo.adquirir())
+        await asyncio.sleep(0)
+        assert grupo.en_cola == 1
+
+        with pytest.raises(AdmisionRechazada) as lleno:
+            await grupo.adquirir()
+        assert lleno.value.status_code == 429
+
+        grupo.liberar()  # el cupo pasa directo al encolado
+        await encolado
+        assert grupo.en_curso == 1 and grupo.en_cola == 0
+
+        with pytest.raises(AdmisionRechazada) as vencido:
+            await grupo.adquirir()
+        assert vencido.value.status_code == 503
+
+        grupo.liberar()
+        return grupo.estadisticas()
+
+    estadisticas = asyncio.run(escenario())
+
+    assert estadisticas["en_curso"] == 0
+    assert estadisticas["admitidos"] == 2
+    assert estadisticas["rechazados_cola"] == 1
+    assert estadisticas["rechazados_espera"] == 1
+
+
+def test_middleware_protege_escrituras_de_una_rafaga_de_reportes():
+    """Test: Con reportes saturados, las ventas siguen entrando y el exceso recibe Retry-After"""
+    grupos = {
+        "reportes": GrupoAdmision("reportes", maximo=1, cola=0, espera=1.0),
+        "escrituras": GrupoAdmision("escrituras", maximo=4, cola=4, espera=1.0),
+    }
+    app = FastAPI()
+    app.add_middleware(AdmisionMiddleware, grupos=grupos, reintento=3)
+
+    async def escenario():
+        liberar_reporte = asyncio.Event()
+
+        @app.get("/reportes/lento")
+        async def reporte_lento():
+            await liberar_reporte.wait()
+            return {"ok": True}
+
+        @app.post("/ventas/registrar")
+        async def registrar_venta():
+            return {"ok": True}
+
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://test") as cliente:
+            lento = asyncio.create_task(cliente.get("/reportes/lento"))
+            await asyncio.sleep(0.05)
+
+            rechazado = await cliente.get("/reportes/lento")
+            venta = await cliente.post("/ventas/registrar")
+
+            liberar_reporte.set()
+            return await lento, rechazado, venta
+
+    lento, rechazado, venta = asyncio.run(escenario())
+
+    assert lento.status_code == 200
+    assert rechazado.status_code == 429
+    assert rechazado.headers["Retry-After"] == "3"
+    assert venta.status_code == 200
+    assert grupos["reportes"].en_curso == 0
+
+
+def test_metricas_expone_admision_pool_y_cache_jwt(client):
+    """Test: /salud/metricas reporta cada grupo, el pool y el cache de tokens"""
+    token = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+    response = client.get("/salud/metricas", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["admision"]) == {"auth", "escrituras", "lecturas", "reportes", "exportaciones"}
+    assert {"en_curso", "en_cola", "rechazados_cola"} <= set(data["admision"]["reportes"])
+    assert "en_uso" in data["pool"]
+    assert "tasa_aciertos" in data["jwt_cache"]
+
+
+def test_metricas_requieren_admin_o_token_interno(client, monkeypatch):
+    """Test: Sin credenciales 401, un vendedor 403 y el recolector entra con X-Metricas-Token"""
+    monkeypatch.setattr(salud, "METRICAS_TOKEN", "secreto-interno")
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+
+    assert client.get("/salud/metricas").status_code == 401
+    assert client.get("/salud/metricas", headers={"X-Metricas-Token": "otro"}).status_code == 401
+    assert client.get("/salud/metricas", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    assert client.get("/salud/metricas", headers={"X-Metricas-Token": "secreto-interno"}).status_code == 200
@@ -0,0 +1,146 @@
+"""
+Tests para el motor analítico columnar de reportes
+Los resultados deben coincidir con los de las consultas SQL
+"""
+import os
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+
+pytest.importorskip("numpy")
+
+from app.utils import analitica  # noqa: E402
+
+
+@pytest.fixture
+def modo_analitico(monkeypatch):
+    """Activa el modo columnar con una copia vacía"""
+    analitica.obtener_snapshot().reiniciar()
+    monkeypatch.setattr(analitica, "ANALITICA_COLUMNAR", True)
+    yield analitica.obtener_snapshot()
+    analitica.obtener_snapshot().reiniciar()
+
+
+def _poblar(db: Session, ventas: int = 300):
+    """Vendedores, productos y ventas aleatorias reproducibles"""
+    rng = random.Random(7)
+    for i in range(1, 6):
+        db.add(models.Usuario(nombre=f"Vendedor {i}", email=f"v{i}@test.com", password="x", rol="vendedor"))
+    for i in range(1, 9):
+        db.add(models.Producto(nombre=f"Producto {i}", precio=Decimal("1.00") * i, stock=1000, activo=True))
+    db.commit()
+    inicio = datetime(2026, 1, 1)
+    for _ in range(ventas):
+        cantidad = rng.randint(1, 4)
+        db.add(models.Venta(
+            producto_id=rng.randint(1, 8),
+            vendedor_id=rng.randint(1, 5),
+            cantidad=cantidad,
+            total=Decimal(rng.randint(100, 99_999)).scaleb(-2),
+            fecha=inicio + timedelta(minutes=rng.randint(0, 60 * 24 * 200))
+        ))
+    db.commit()
+
+
+def _reportes(db: Session) -> dict:
+    desde, hasta = datetime(2026, 2, 15), datetime(2026, 5, 1, 12)
+    return {
+        "resumen": crud.obtener_resumen_por_periodo(db, desde, hasta),
+        "resumen_total": crud.obtener_resumen_ventas(db),
+        "top_productos": {p["producto_id"]: p for p in crud.obtener_top_productos(db, limite=8)},
+        "top_vendedores": {v["vendedor_id"]: v for v in crud.obtener_top_vendedores(db, limite=5)},
+        "comisiones": sorted(crud.calcular_comisiones(db, porcentaje=12.5), key=lambda c: c["vendedor_id"]),
+    }
+
+
+def test_resultados_coinciden_con_sql(db_session: Session, monkeypatch):
+    """Test: Rankings, comisiones y resúmenes son idénticos a los de SQL"""
+    _poblar(db_session)
+    esperado = _reportes(db_session)
+
+    analitica.obtener_snapshot().reiniciar()
+    monkeypatch.setattr(analitica, "ANALITICA_COLUMNAR", True)
+    try:
+        obtenido = _reportes(db_session)
+    finally:
+        analitica.obtener_snapshot().reiniciar()
+
+    assert obtenido == esperado
+
+
+def test_actualizacion_incremental(db_session: Session, modo_analitico):
+    """Test: Solo se cargan las ventas con id mayor al último cargado"""
+    _poblar(db_session, ventas=50)
+
+    assert modo_analitico.actualizar(db_session) == 50
+    assert modo_analitico.actualizar(db_session) == 0
+
+    crud.crear_venta(db_session, schemas.VentaCrear(producto_id=1, cantidad=2), vendedor_id=1)
+    assert modo_analitico.actualizar(db_session) == 1
+    assert modo_analitico.filas == 51
+    assert crud.obtener_resumen_ventas(db_session)["total_ventas"] == 51
+
+
+def test_recarga_si_la_tabla_retrocede(db_session: Session, modo_analitico):
+    """Test: Si el id máximo baja (tabla recreada o filas borradas) se recarga completa"""
+    _poblar(db_session, ventas=20)
+    modo_analitico.actualizar(db_session)
+
+    db_session.query(models.Venta).filter(models.Venta.id > 10).delete()
+    db_session.commit()
+
+    assert modo_analitico.actualizar(db_session) == 10
+    assert modo_analitico.filas == 10
+
+
+def test_ventana_recupera_commits_tardios(db_session: Session, modo_analitico):
+    """Test: Una venta con id menor al último cargado que confirma después se incorpora"""
+    _poblar(db_session, ventas=20)
+    tardia = db_session.get(models.Venta, 15)
+    datos = {c: getattr(tardia, c) for c in ("id", "producto_id", "vendedor_id", "cantidad", "total", "fecha")}
+    db_session.delete(tardia)
+    db_session.commit()
+
+    assert modo_analitico.actualizar(db_session) == 19
+    assert modo_analitico.ultimo_id == 20
+
+    db_session.add(models.Venta(**datos))
+    db_session.commit()
+
+    assert modo_analitico.actualizar(db_session) == 1
+    assert modo_analitico.actualizar(db_session) == 0
+    assert modo_analitico.filas == 20
+    assert sorted(modo_analitico.columna("id").tolist()) == list(range(1, 21))
+
+
+def test_copia_en_disco_evita_recarga(db_session: Session, modo_analitico, tmp_path, monkeypatch):
+    """Test: Un proceso nuevo retoma la copia guardada y solo lee la ventana y las ventas nuevas"""
+    _poblar(db_session, ventas=30)
+    monkeypatch.setattr(modo_analitico, "ruta", str(tmp_path / "ventas.npz"))
+    modo_analitico.actualizar(db_session)
+    modo_analitico.guardar()
+
+    nuevo = analitica.SnapshotVentas(ruta=modo_analitico.ruta, ventana=5)
+    crud.crear_venta(db_session, schemas.VentaCrear(producto_id=1, cantidad=1), vendedor_id=1)
+
+    assert nuevo.actualizar(db_session) == 1
+    assert nuevo.filas == 31
+    assert nuevo.resumen() == (31, crud.obtener_resumen_ventas(db_session)["monto_total"])
+
+
+def test_sin_modo_columnar_no_importa_numpy():
+    """Test: Con ANALITICA_COLUMNAR=false importar la app no carga numpy ni crea la copia"""
+    entorno = {**os.environ, "ANALITICA_COLUMNAR": "false", "WARMUP_HABILITADO": "false"}
+    codigo = (
+        "import sys, app.main\n"
+        "from app.utils import analitica\n"
+        "print('numpy' in sys.modules, analitica.snapshot_ventas is None, analitica.activa())"
+    )
+    salida = subprocess.run([sys.executable, "-c", codigo], env=entorno, capture_output=True, text=True, check=True)
+
+    assert salida.stdout.split() == ["False", "True", "False"]
@@ -0,0 +1,156 @@
+"""
+Tests para el archivo en frío de ventas y su lectura transparente
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy.orm import Session
+from app import crud, models
+from app.utils.archivo_ventas import archivo_ventas
+from tests.conftest import crear_usuario_y_login
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    """Archivo de ventas en un directorio temporal"""
+    original = archivo_ventas.directorio
+    archivo_ventas.configurar_directorio(tmp_path)
+    yield archivo_ventas
+    archivo_ventas.configurar_directorio(original)
+
+
+def _poblar(db: Session):
+    """Vendedor, producto y ventas en enero 2025 (2), febrero 2025 (1) y octubre 2026 (1)"""
+    db.add(models.Usuario(nombre="Vendedor", email="v@test.com", password="x", rol="vendedor"))
+    db.add(models.Producto(nombre="Producto", precio=Decimal("10.00"), stock=100, activo=True))
+    db.commit()
+    for fecha, total in [
+        (datetime(2025, 1, 5, 10), "10.00"),
+        (datetime(2025, 1, 20, 18), "20.00"),
+        (datetime(2025, 2, 3, 9), "30.00"),
+        (datetime(2026, 10, 1, 12), "40.00"),
+    ]:
+        db.add(models.Venta(producto_id=1, vendedor_id=1, cantidad=1, total=Decimal(total), fecha=fecha))
+    db.commit()
+
+
+def test_archivar_periodos_cerrados_mueve_filas_y_escribe_manifest(db_session: Session, archivo, tmp_path):
+    """Test: Los meses fuera de la retención pasan a segmentos y salen de la tabla"""
+    _poblar(db_session)
+
+    segmentos = archivo.archivar_periodos_cerrados(db_session, meses_retenidos=18, hoy=date(2026, 10, 19))
+
+    assert [s["mes"] for s in segmentos] == ["2025-01", "2025-02"]
+    assert db_session.query(models.Venta).count() == 1
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    enero = manifest["segmentos"][0]
+    assert enero["filas"] == 2
+    assert enero["monto_total"] == "30.00"
+    assert enero["por_vendedor"]["1"] == {"ventas": 2, "monto": "30.00"}
+    assert (tmp_path / enero["archivo"]).exists()
+
+
+def test_reportes_incluyen_ventas_archivadas(db_session: Session, archivo):
+    """Test: Resumen, rankings y comisiones combinan tabla y archivo"""
+    _poblar(db_session)
+    archivo.archivar_periodos_cerrados(db_session, meses_retenidos=18, hoy=date(2026, 10, 19))
+
+    assert crud.obtener_resumen_ventas(db_session) == {"total_ventas": 4, "monto_total": Decimal("100.00")}
+
+    # Rango que corta enero a la mitad: se lee el segmento
+    parcial = crud.obtener_resumen_por_periodo(db_session, datetime(2025, 1, 10), datetime(2025, 2, 28))
+    assert parcial["total_ventas"] == 2
+    assert parcial["monto_total"] == Decimal("50.00")
+
+    top = crud.obtener_top_productos(db_session, limite=5)
+    assert top[0]["cantidad_vendida"] == 4
+    vendedores = crud.obtener_top_vendedores(db_session)
+    assert vendedores[0]["monto_total"] == Decimal("100.00")
+    comisiones = crud.calcular_comisiones(db_session, porcentaje=10.0)
+    assert comisiones[0]["monto_comision"] == Decimal("10.00")
+
+
+def test_exportar_csv_incluye_archivo_y_tabla(client, db_session: Session, archivo):
+    """Test: La exportación CSV lee los segmentos archivados y la tabla"""
+    _poblar(db_session)
+    archivo.archivar_periodos_cerrados(db_session, meses_retenidos=18, hoy=date(2026, 10, 19))
+    token = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+
+    response = client.get(
+        "/reportes/exportar/csv",
+        params={"desde": "2025-01-10T00:00:00"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    filas = list(csv.DictReader(io.StringIO(response.text)))
+    assert [f["total"] for f in filas] == ["20.00", "30.00", "40.00"]
+
+
+def test_exportar_csv_requiere_admin(client):
+    """Test: Un vendedor no puede exportar"""
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+
+    response = client.get("/reportes/exportar/csv", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 403
+
+
+class _Caida(BaseException):
+    """Interrupción del proceso (no la atrapa el manejo de errores)"""
+
+
+def test_caida_tras_el_commit_no_duplica_y_se_recupera(db_session: Session, archivo, monkeypatch, tmp_path):
+    """Test: Si el proceso muere antes de publicar el manifest, las ventas no se cuentan dos veces"""
+    _poblar(db_session)
+
+    def caer(*args):
+        raise _Caida()
+
+    with monkeypatch.context() as m:
+        m.setattr(archivo, "_escribir_manifiesto", caer)
+        with pytest.raises(_Caida):
+            archivo.archivar_mes(db_session, date(2025, 1, 1))
+
+    assert db_session.query(models.Venta).count() == 2
+    assert archivo.segmentos() == []
+    assert crud.obtener_resumen_ventas(db_session)["total_ventas"] == 2
+
+    segmentos = archivo.archivar_periodos_cerrados(db_session, meses_retenidos=18, hoy=date(2026, 10, 19))
+
+    assert [s["mes"] for s in segmentos] == ["2025-01", "2025-02"]
+    assert crud.obtener_resumen_ventas(db_session) == {"total_ventas": 4, "monto_total": Decimal("100.00")}
+    assert not list(tmp_path.glob("*.pendiente.json"))
+
+
+def test_caida_antes_del_commit_descarta_el_segmento(db_session: Session, archivo, monkeypatch, tmp_path):
+    """Test: Si el commit no llegó a hacerse, el segmento pendiente se descarta"""
+    _poblar(db_session)
+
+    with monkeypatch.context() as m:
+        m.setattr(db_session, "commit", lambda: (_ for _ in ()).throw(_Caida()))
+        with pytest.raises(_Caida):
+            archivo.archivar_mes(db_session, date(2025, 1, 1))
+    db_session.rollback()
+
+    assert db_session.query(models.Venta).count() == 4
+    assert archivo.recuperar_pendientes(db_session) == []
+    assert list(tmp_path.iterdir()) == []
+    assert crud.obtener_resumen_ventas(db_session)["total_ventas"] == 4
+
+
+def test_archivar_exige_un_volumen_absoluto(db_session: Session, archivo):
+    """Test: Sin directorio o con una ruta relativa no se archiva nada"""
+    _poblar(db_session)
+
+    for directorio in ("", "archivo_ventas"):
+        archivo.configurar_directorio(directorio)
+        with pytest.raises(RuntimeError, match="volumen persistente"):
+            archivo.archivar_periodos_cerrados(db_session, meses_retenidos=18, hoy=date(2026, 10, 19))
+
+    assert db_session.query(models.Venta).count() == 4
+    assert archivo.segmentos() == []
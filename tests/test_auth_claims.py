@@ -0,0 +1,71 @@
+"""
+Tests para validación de JWT sin consultas a BD
+Verificación de claims uid/rol en el token y revocación por token_version
+"""
+from app import auth
+from tests.conftest import crear_usuario_y_login
+
+
+def test_token_incluye_uid_y_rol(client):
+    """Test: El token de login incluye los claims uid, rol y ver"""
+    token = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+
+    payload = auth.decodificar_token(token)
+    assert payload["sub"] == "admin@test.com"
+    assert payload["rol"] == "admin"
+    assert payload["ver"] == 0
+    assert isinstance(payload["uid"], int)
+
+
+def test_listar_productos_sin_consultas_de_auth(client, contador_consultas):
+    """Test: Un endpoint de lectura solo ejecuta su propia consulta"""
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/productos/listar", headers=headers)  # refresca el registro de versiones
+
+    contador_consultas.clear()
+    response = client.get("/productos/listar", headers=headers)
+
+    assert response.status_code == 200
+    assert len(contador_consultas) == 1
+    assert "usuarios" not in contador_consultas[0]
+
+
+def test_rol_requerido_usa_claims(client):
+    """Test: La autorización por rol se resuelve con el claim del token"""
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+
+    response = client.get("/admin/usuarios", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+def test_revocar_tokens_invalida_token_existente(client):
+    """Test: Tras revocar, el token anterior se rechaza y un login nuevo funciona"""
+    admin_token = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+    vendedor_token = crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+    headers_vendedor = {"Authorization": f"Bearer {vendedor_token}"}
+    assert client.get("/productos/listar", headers=headers_vendedor).status_code == 200
+
+    uid = auth.decodificar_token(vendedor_token)["uid"]
+    response = client.post(
+        f"/admin/usuarios/{uid}/revocar-tokens",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+
+    assert client.get("/productos/listar", headers=headers_vendedor).status_code == 401
+
+    login = client.post("/auth/login", data={"username": "vendedor@test.com", "password": "vend123"})
+    nuevo_token = login.json()["access_token"]
+    assert auth.decodificar_token(nuevo_token)["ver"] == 1
+    response = client.get("/productos/listar", headers={"Authorization": f"Bearer {nuevo_token}"})
+    assert response.status_code == 200
+
+
+def test_token_sin_claims_usa_base_de_datos(client):
+    """Test: Tokens sin uid/rol siguen validándose contra la base de datos"""
+    crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+    token_antiguo = auth.crear_access_token({"sub": "vendedor@test.com"})
+
+    response = client.get("/ventas/listar", headers={"Authorization": f"Bearer {token_antiguo}"})
+    assert response.status_code == 200
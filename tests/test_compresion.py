@@ -0,0 +1,84 @@
+"""
+Tests para la compresión negociada de respuestas
+"""
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from app.utils.compresion import CompresionMiddleware, elegir_codificacion
+
+CUERPO_GRANDE = [{"id": i, "nombre": f"Producto {i}"} for i in range(200)]
+
+app_prueba = FastAPI()
+app_prueba.add_middleware(CompresionMiddleware, minimo=500)
+
+@app_prueba.get("/grande")
+def grande():
+    return CUERPO_GRANDE
+
+@app_prueba.get("/chico")
+def chico():
+    return {"ok": True}
+
+@app_prueba.get("/stream")
+def stream():
+    return StreamingResponse((b"x" * 1000 for _ in range(3)), media_type="text/csv")
+
+@app_prueba.get("/eventos")
+def eventos():
+    return PlainTextResponse("data: x\n\n" * 200, media_type="text/event-stream")
+
+client = TestClient(app_prueba)
+
+
+def test_elegir_codificacion():
+    """Test: Negociación de Accept-Encoding con calidades"""
+    assert elegir_codificacion("gzip, deflate, br", brotli_disponible=True) == "br"
+    assert elegir_codificacion("gzip, deflate, br", brotli_disponible=False) == "gzip"
+    assert elegir_codificacion("br;q=0, gzip", brotli_disponible=True) == "gzip"
+    assert elegir_codificacion("gzip;q=0", brotli_disponible=False) is None
+    assert elegir_codificacion("*", brotli_disponible=False) == "gzip"
+    assert elegir_codificacion("", brotli_disponible=True) is None
+
+
+def test_comprime_respuesta_grande_con_gzip():
+    """Test: Las respuestas sobre el mínimo se comprimen"""
+    response = client.get("/grande", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == CUERPO_GRANDE
+
+
+def test_no_comprime_respuesta_chica():
+    """Test: Las respuestas bajo el mínimo se envían tal cual"""
+    response = client.get("/chico", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_no_comprime_sin_accept_encoding():
+    """Test: Sin Accept-Encoding no hay compresión"""
+    response = client.get("/grande", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_no_comprime_streaming_ni_eventos():
+    """Test: Streaming y text/event-stream pasan sin comprimir"""
+    stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in stream.headers
+    assert stream.content == b"x" * 3000
+
+    eventos = client.get("/eventos", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in eventos.headers
+
+
+def test_api_comprime_con_headers_de_seguridad(client):
+    """Test: La app principal comprime y conserva los headers de seguridad"""
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.json()["info"]["title"] == "Social Sellers API"
@@ -0,0 +1,53 @@
+"""
+Tests para montos de dinero exactos (NUMERIC/Decimal)
+"""
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+
+
+def _crear_vendedor_y_producto(db: Session, precio: str) -> models.Usuario:
+    vendedor = models.Usuario(nombre="Vendedor", email="v@test.com", password="x", rol="vendedor")
+    db.add(vendedor)
+    db.add(models.Producto(nombre="P", precio=Decimal(precio), stock=100, activo=True))
+    db.commit()
+    return vendedor
+
+
+def test_total_de_venta_es_decimal_exacto(db_session: Session):
+    """Test: precio * cantidad se calcula con Decimal"""
+    vendedor = _crear_vendedor_y_producto(db_session, "0.10")
+
+    venta = crud.crear_venta(db_session, schemas.VentaCrear(producto_id=1, cantidad=3), vendedor.id)
+
+    assert venta.total == Decimal("0.30")
+
+
+def test_resumen_suma_en_sql_sin_deriva(db_session: Session):
+    """Test: La suma de muchos montos de 0.10 no acumula error de punto flotante"""
+    vendedor = _crear_vendedor_y_producto(db_session, "0.10")
+    for _ in range(10):
+        crud.crear_venta(db_session, schemas.VentaCrear(producto_id=1, cantidad=1), vendedor.id)
+
+    resumen = crud.obtener_resumen_ventas(db_session)
+
+    assert resumen == {"total_ventas": 10, "monto_total": Decimal("1.00")}
+
+
+def test_comision_redondeada_en_la_base_de_datos(db_session: Session):
+    """Test: La comisión llega redondeada a centavos desde la consulta"""
+    vendedor = _crear_vendedor_y_producto(db_session, "33.33")
+    crud.crear_venta(db_session, schemas.VentaCrear(producto_id=1, cantidad=1), vendedor.id)
+
+    comisiones = crud.calcular_comisiones(db_session, porcentaje=15.0)
+
+    assert comisiones[0]["monto_total_vendido"] == Decimal("33.33")
+    assert comisiones[0]["monto_comision"] == Decimal("5.00")
+
+
+def test_dinero_se_serializa_como_numero():
+    """Test: Los montos Decimal se exponen como números en el JSON"""
+    producto = schemas.ProductoResponse(id=1, nombre="P", precio="12.50", stock=1)
+
+    assert producto.precio == Decimal("12.50")
+    assert producto.model_dump(mode="json")["precio"] == 12.5
@@ -0,0 +1,96 @@
+"""
+Tests para el directorio de vendedores con cache de lectura
+"""
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+from app.utils.directorio_vendedores import DirectorioVendedores, directorio_vendedores
+
+
+def _poblar(db: Session):
+    """Tres vendedores, un producto y una venta por vendedor"""
+    for i in range(1, 4):
+        db.add(models.Usuario(nombre=f"Vendedor {i}", email=f"v{i}@test.com", password="x", rol="vendedor"))
+    db.add(models.Producto(nombre="Producto", precio=Decimal("10.00"), stock=100, activo=True))
+    db.commit()
+    for vendedor_id in (1, 2, 3):
+        db.add(models.Venta(producto_id=1, vendedor_id=vendedor_id, cantidad=vendedor_id,
+                            total=Decimal("10.00") * vendedor_id))
+    db.commit()
+
+
+def test_obtener_varios_lee_faltantes_una_vez(db_session: Session, contador_consultas):
+    """Test: Los perfiles se leen en una consulta y luego salen de memoria"""
+    _poblar(db_session)
+    directorio = DirectorioVendedores(capacidad=10, ttl=60)
+    contador_consultas.clear()
+
+    perfiles = directorio.obtener_varios(db_session, [1, 2, 99])
+    assert len(contador_consultas) == 1
+    assert sorted(perfiles) == [1, 2]
+    assert perfiles[1].nombre == "Vendedor 1"
+    assert not hasattr(perfiles[1], "password")
+
+    assert directorio.obtener(db_session, 2).email == "v2@test.com"
+    assert len(contador_consultas) == 1
+
+    # Los ids inexistentes no se cachean: pueden crearse después
+    assert directorio.obtener(db_session, 99) is None
+    assert len(contador_consultas) == 2
+
+
+def test_capacidad_y_expiracion(db_session: Session):
+    """Test: El LRU respeta la capacidad y los perfiles vencidos se releen"""
+    _poblar(db_session)
+    directorio = DirectorioVendedores(capacidad=2, ttl=60)
+
+    directorio.obtener_varios(db_session, [1, 2, 3])
+    assert directorio.estadisticas()["tamano"] == 2
+
+    vencido = DirectorioVendedores(capacidad=10, ttl=0)
+    vencido.obtener(db_session, 1)
+    vencido.obtener(db_session, 1)
+    assert vencido.estadisticas()["aciertos"] == 0
+
+
+def test_venta_admin_valida_vendedor_desde_el_directorio(db_session: Session, contador_consultas):
+    """Test: Con el perfil en cache la venta admin no consulta usuarios"""
+    _poblar(db_session)
+    directorio_vendedores.obtener(db_session, 2)
+    contador_consultas.clear()
+
+    venta = crud.crear_venta_admin(db_session, schemas.VentaCrearAdmin(
+        producto_id=1, vendedor_id=2, cantidad=1, precio_unitario=Decimal("5.00")
+    ))
+
+    assert venta.total == Decimal("5.00")
+    assert not any("FROM usuarios" in consulta for consulta in contador_consultas)
+
+
+def test_reportes_de_vendedores_sin_join(db_session: Session, contador_consultas):
+    """Test: Ranking y comisiones resuelven los nombres sin JOIN a usuarios"""
+    _poblar(db_session)
+    contador_consultas.clear()
+
+    top = crud.obtener_top_vendedores(db_session, limite=2)
+    comisiones = crud.calcular_comisiones(db_session, porcentaje=10)
+
+    assert [(v["vendedor_id"], v["nombre_vendedor"]) for v in top] == [(3, "Vendedor 3"), (2, "Vendedor 2")]
+    assert [c["monto_comision"] for c in comisiones] == [Decimal("1.00"), Decimal("2.00"), Decimal("3.00")]
+    assert not any("JOIN usuarios" in consulta for consulta in contador_consultas)
+
+    # Con los perfiles en memoria, repetir el reporte no lee usuarios
+    contador_consultas.clear()
+    crud.calcular_comisiones(db_session, porcentaje=10)
+    assert not any("FROM usuarios" in consulta for consulta in contador_consultas)
+
+
+def test_top_vendedores_completa_el_limite_sin_vendedores_inexistentes(db_session: Session):
+    """Test: Un vendedor inexistente con más monto no le quita lugar a los existentes"""
+    _poblar(db_session)
+    db_session.add(models.Venta(producto_id=1, vendedor_id=99, cantidad=50, total=Decimal("500.00")))
+    db_session.commit()
+
+    top = crud.obtener_top_vendedores(db_session, limite=2)
+
+    assert [v["vendedor_id"] for v in top] == [3, 2]
@@ -0,0 +1,50 @@
+"""
+Tests de cantidad de consultas en las escrituras de crud
+Cada escritura debe ser un solo round-trip (sin SELECT posterior al commit)
+"""
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+
+
+def _crear_vendedor(db: Session) -> models.Usuario:
+    usuario = schemas.UsuarioRegistro(nombre="Vendedor", email="v@test.com", password="x12345", rol="vendedor")
+    return crud.crear_usuario(db, usuario, "hash")
+
+
+def test_crear_producto_es_un_insert(db_session: Session, contador_consultas):
+    """Test: Crear un producto ejecuta solo el INSERT"""
+    producto = crud.crear_producto(db_session, schemas.ProductoCrear(nombre="P", precio=10.0, stock=5))
+
+    assert len(contador_consultas) == 1
+    assert contador_consultas[0].startswith("INSERT INTO productos")
+    assert producto.id is not None
+    assert producto.activo is True
+    assert len(contador_consultas) == 1  # Leer atributos no dispara consultas
+
+
+def test_crear_venta_trae_fecha_en_el_insert(db_session: Session, contador_consultas):
+    """Test: La fecha (server default) llega con RETURNING, sin SELECT posterior"""
+    vendedor = _crear_vendedor(db_session)
+    crud.crear_producto(db_session, schemas.ProductoCrear(nombre="P", precio=10.0, stock=5))
+    contador_consultas.clear()
+
+    venta = crud.crear_venta(db_session, schemas.VentaCrear(producto_id=1, cantidad=2), vendedor.id)
+
+    assert venta.id is not None
+    assert venta.fecha is not None
+    assert venta.total == 20.0
+    assert sorted(c.split()[0] for c in contador_consultas) == ["INSERT", "SELECT", "UPDATE"]
+    insert = next(c for c in contador_consultas if c.startswith("INSERT"))
+    assert "RETURNING" in insert
+
+
+def test_actualizar_producto_sin_refresh(db_session: Session, contador_consultas):
+    """Test: Actualizar un producto no vuelve a leerlo después del commit"""
+    crud.crear_producto(db_session, schemas.ProductoCrear(nombre="P", precio=10.0, stock=5))
+    db_session.expunge_all()
+    contador_consultas.clear()
+
+    producto = crud.actualizar_producto(db_session, 1, schemas.ProductoActualizar(stock=8))
+
+    assert producto.stock == 8
+    assert [c.split()[0] for c in contador_consultas] == ["SELECT", "UPDATE"]
@@ -0,0 +1,134 @@
+"""
+Tests para las estadísticas de desempeño por vendedor
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+from app import crud, models
+from app.utils.cache_estadisticas import CacheEstadisticas, cache_estadisticas
+from tests.conftest import crear_usuario_y_login
+
+
+@pytest.fixture(autouse=True)
+def limpiar_cache():
+    cache_estadisticas.limpiar()
+    yield
+    cache_estadisticas.limpiar()
+
+
+def _poblar(db):
+    """Vendedor 1 con ventas hoy, ayer y hace 60 días; vendedor 2 con una venta hoy"""
+    for email in ("v1@test.com", "v2@test.com"):
+        db.add(models.Usuario(nombre=email, email=email, password="x", rol="vendedor"))
+    db.add(models.Producto(nombre="Remera", precio=Decimal("10.00"), stock=100))
+    db.add(models.Producto(nombre="Gorra", precio=Decimal("25.50"), stock=100))
+    db.commit()
+    hoy = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    for vendedor_id, producto_id, cantidad, total, fecha in [
+        (1, 1, 2, "20.00", hoy),
+        (1, 2, 1, "25.50", hoy),
+        (1, 1, 1, "10.00", hoy - timedelta(days=1)),
+        (1, 2, 4, "102.00", hoy - timedelta(days=60)),
+        (2, 2, 1, "25.50", hoy),
+    ]:
+        db.add(models.Venta(producto_id=producto_id, vendedor_id=vendedor_id, cantidad=cantidad,
+                            total=Decimal(total), fecha=fecha))
+    db.commit()
+
+
+def test_estadisticas_en_una_consulta(db_session, contador_consultas):
+    """Test: Totales, ranking y serie salen de una sola consulta agrupada"""
+    _poblar(db_session)
+    contador_consultas.clear()
+
+    estadisticas = crud.obtener_estadisticas_vendedor(db_session, 1, dias=7)
+
+    assert len(contador_consultas) == 1
+    assert estadisticas["total_ventas"] == 3
+    assert estadisticas["unidades_vendidas"] == 4
+    assert estadisticas["monto_total"] == Decimal("55.50")
+    assert estadisticas["ticket_promedio"] == Decimal("18.50")
+    assert [p["nombre_producto"] for p in estadisticas["mejores_productos"]] == ["Remera", "Gorra"]
+    serie = estadisticas["serie_diaria"]
+    assert len(serie) == 7
+    assert [p["total_ventas"] for p in serie[-2:]] == [1, 2]
+    assert sum(p["total_ventas"] for p in serie[:-2]) == 0
+
+
+def test_estadisticas_sin_ventas(db_session):
+    """Test: Un vendedor sin ventas recibe ceros y la serie completa"""
+    _poblar(db_session)
+
+    estadisticas = crud.obtener_estadisticas_vendedor(db_session, 2, dias=3)
+    vacias = crud.obtener_estadisticas_vendedor(db_session, 99, dias=3)
+
+    assert estadisticas["total_ventas"] == 1
+    assert vacias["total_ventas"] == 0
+    assert vacias["ticket_promedio"] == Decimal("0.00")
+    assert len(vacias["serie_diaria"]) == 3
+
+
+def test_endpoint_me_cachea_por_version_de_ventas(client, contador_consultas):
+    """Test: /vendedores/me/estadisticas se sirve del cache hasta que el vendedor registra otra venta"""
+    token_admin = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+    client.post(
+        "/productos/registrar",
+        json={"nombre": "Remera", "precio": 10.0, "stock": 10},
+        headers={"Authorization": f"Bearer {token_admin}"}
+    )
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    inicial = client.get("/vendedores/me/estadisticas", headers=headers)
+    assert inicial.status_code == 200
+    assert inicial.json()["total_ventas"] == 0
+
+    contador_consultas.clear()
+    assert client.get("/vendedores/me/estadisticas", headers=headers).json() == inicial.json()
+    assert not any("GROUP BY" in consulta for consulta in contador_consultas)
+
+    client.post("/ventas/registrar", json={"producto_id": 1, "cantidad": 3}, headers=headers)
+
+    data = client.get("/vendedores/me/estadisticas", headers=headers).json()
+    assert data["total_ventas"] == 1
+    assert data["monto_total"] == 30.0
+    assert data["mejores_productos"][0]["cantidad_vendida"] == 3
+
+
+def test_cache_descarta_otra_version():
+    """Test: Una entrada calculada con otra versión de las ventas no se sirve"""
+    cache_estadisticas.guardar(1, 30, (datetime(2026, 1, 1), 10), {"total_ventas": 5})
+
+    assert cache_estadisticas.obtener(1, 30, (datetime(2026, 1, 1), 10)) == {"total_ventas": 5}
+    assert cache_estadisticas.obtener(1, 30, (datetime(2026, 1, 2), 11)) is None
+    assert cache_estadisticas.obtener(1, 7, (datetime(2026, 1, 1), 10)) is None
+
+
+def test_cache_acotado_desaloja_lo_menos_usado():
+    """Test: Con la capacidad llena se descarta la entrada usada hace más tiempo"""
+    cache = CacheEstadisticas(ttl=60, capacidad=2)
+    cache.guardar(1, 30, None, "a")
+    cache.guardar(1, 7, None, "b")
+    assert cache.obtener(1, 30, None) == "a"
+
+    for dias in range(1, 366):
+        cache.guardar(2, dias, None, dias)
+
+    assert len(cache) == 2
+    assert cache.obtener(1, 30, None) is None
+    assert cache.obtener(2, 365, None) == 365
+
+
+def test_endpoint_admin_por_vendedor(client):
+    """Test: El admin consulta cualquier vendedor; un vendedor no puede"""
+    token_admin = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+
+    admin = client.get("/vendedores/2/estadisticas?dias=7", headers={"Authorization": f"Bearer {token_admin}"})
+    inexistente = client.get("/vendedores/99/estadisticas", headers={"Authorization": f"Bearer {token_admin}"})
+    vendedor = client.get("/vendedores/1/estadisticas", headers={"Authorization": f"Bearer {token}"})
+
+    assert admin.status_code == 200
+    assert len(admin.json()["serie_diaria"]) == 7
+    assert inexistente.status_code == 404
+    assert vendedor.status_code == 403
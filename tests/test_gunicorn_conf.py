@@ -0,0 +1,93 @@
+"""
+Tests para el dimensionamiento de workers de Gunicorn
+"""
+import asyncio
+import runpy
+from pathlib import Path
+import httpx
+import pytest
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+CONFIG = str(Path(__file__).parent.parent / "gunicorn.conf.py")
+
+
+@pytest.fixture(autouse=True)
+def proxy_configurado(monkeypatch):
+    """La configuración exige FORWARDED_ALLOW_IPS"""
+    monkeypatch.setenv("FORWARDED_ALLOW_IPS", "10.0.0.1")
+
+
+def test_workers_forzados_por_web_concurrency(monkeypatch):
+    """Test: WEB_CONCURRENCY fija la cantidad de workers"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert runpy.run_path(CONFIG)["workers"] == 3
+
+
+def test_workers_por_cpu_por_defecto(monkeypatch):
+    """Test: Sin WEB_CONCURRENCY los workers salen de los núcleos dentro del presupuesto de BD"""
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr("os.cpu_count", lambda: 16)
+    monkeypatch.setenv("DB_MAX_CONEXIONES", "60")
+    monkeypatch.setenv("DB_POOL_SIZE", "5")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "10")
+
+    assert runpy.run_path(CONFIG)["workers"] == 4
+
+
+def test_proxy_confiable_obligatorio(monkeypatch):
+    """Test: Sin FORWARDED_ALLOW_IPS la configuración no carga; con ella se usa tal cual"""
+    monkeypatch.delenv("FORWARDED_ALLOW_IPS")
+    with pytest.raises(RuntimeError, match="FORWARDED_ALLOW_IPS"):
+        runpy.run_path(CONFIG)
+
+    monkeypatch.setenv("FORWARDED_ALLOW_IPS", "10.0.0.1,10.0.0.2")
+    assert runpy.run_path(CONFIG)["forwarded_allow_ips"] == "10.0.0.1,10.0.0.2"
+
+
+def test_login_limita_por_cliente_detras_del_proxy(client):
+    """Test: Dos clientes detrás del proxy confiable no comparten el bucket de login por IP"""
+    # Igual que el worker Uvicorn con forwarded_allow_ips de la configuración
+    app = ProxyHeadersMiddleware(client.app, trusted_hosts=runpy.run_path(CONFIG)["forwarded_allow_ips"])
+
+    async def escenario():
+        transporte = httpx.ASGITransport(app=app, client=("10.0.0.1", 443))
+        async with httpx.AsyncClient(transport=transporte, base_url="http://test") as proxy:
+            async def login(ip_cliente, numero):
+                return await proxy.post(
+                    "/auth/login",
+                    data={"username": f"u{numero}@test.com", "password": "incorrecta"},
+                    headers={"X-Forwarded-For": ip_cliente}
+                )
+
+            primero = [await login("203.0.113.7", i) for i in range(21)]
+            segundo = await login("198.51.100.9", 99)
+            return primero, segundo
+
+    primero, segundo = asyncio.run(escenario())
+
+    assert [r.status_code for r in primero[:20]] == [401] * 20
+    assert primero[20].status_code == 429
+    assert segundo.status_code == 401
+
+
+def test_workers_acotados_por_presupuesto_de_bd(monkeypatch):
+    """Test: En modo auto los workers no exceden el presupuesto de conexiones a BD"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "auto")
+    monkeypatch.setattr("os.cpu_count", lambda: 16)
+    monkeypatch.setenv("DB_MAX_CONEXIONES", "40")
+    monkeypatch.setenv("DB_POOL_SIZE", "5")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+
+    assert runpy.run_path(CONFIG)["workers"] == 4
+
+
+def test_workers_por_cpu_y_reciclado_con_jitter(monkeypatch):
+    """Test: En modo auto sin presupuesto de BD se usa un worker por CPU, con reciclado escalonado"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "auto")
+    monkeypatch.delenv("DB_MAX_CONEXIONES", raising=False)
+    monkeypatch.setattr("os.cpu_count", lambda: 2)
+
+    config = runpy.run_path(CONFIG)
+    assert config["workers"] == 2
+    assert config["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert config["max_requests_jitter"] > 0
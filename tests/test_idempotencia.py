@@ -0,0 +1,117 @@
+"""
+Tests para Idempotency-Key en la creación de ventas
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytest
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+from app.utils.idempotencia import huella_request
+from tests.conftest import crear_usuario_y_login
+
+
+def _preparar(client, db_session: Session, stock: int = 10):
+    """Crea un producto y retorna los headers de un vendedor autenticado"""
+    db_session.add(models.Producto(nombre="Producto", precio=10.0, stock=stock, activo=True))
+    db_session.commit()
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_reintento_repite_respuesta_sin_duplicar(client, db_session: Session):
+    """Test: Un reintento con la misma clave no crea otra venta ni descuenta stock"""
+    headers = {**_preparar(client, db_session), "Idempotency-Key": "venta-1"}
+    payload = {"producto_id": 1, "cantidad": 2}
+
+    primera = client.post("/ventas/registrar", json=payload, headers=headers)
+    segunda = client.post("/ventas/registrar", json=payload, headers=headers)
+
+    assert primera.status_code == segunda.status_code == 201
+    assert segunda.json() == primera.json()
+    assert segunda.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in primera.headers
+    assert db_session.query(models.Venta).count() == 1
+    db_session.expire_all()
+    assert db_session.get(models.Producto, 1).stock == 8
+
+
+def test_misma_clave_con_otro_cuerpo_retorna_422(client, db_session: Session):
+    """Test: Reusar la clave con otro contenido es un error del cliente"""
+    headers = {**_preparar(client, db_session), "Idempotency-Key": "venta-1"}
+
+    client.post("/ventas/registrar", json={"producto_id": 1, "cantidad": 1}, headers=headers)
+    response = client.post("/ventas/registrar", json={"producto_id": 1, "cantidad": 3}, headers=headers)
+
+    assert response.status_code == 422
+    assert db_session.query(models.Venta).count() == 1
+
+
+def test_clave_en_proceso_retorna_409(client, db_session: Session):
+    """Test: Un duplicado concurrente recibe 409 mientras el original se procesa"""
+    headers = {**_preparar(client, db_session), "Idempotency-Key": "venta-1"}
+    payload = {"producto_id": 1, "cantidad": 1}
+    usuario = crud.obtener_usuario_por_email(db_session, "vendedor@test.com")
+    crud.reclamar_clave_idempotencia(
+        db_session, usuario.id, "/ventas/registrar", "venta-1",
+        huella_request(schemas.VentaCrear(**payload)), datetime.utcnow() + timedelta(hours=1)
+    )
+    db_session.commit()  # clave confirmada sin respuesta (el original no terminó)
+
+    response = client.post("/ventas/registrar", json=payload, headers=headers)
+
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
+    assert db_session.query(models.Venta).count() == 0
+
+
+def test_error_libera_la_clave(client, db_session: Session):
+    """Test: Si la venta falla la misma clave puede reintentarse"""
+    headers = {**_preparar(client, db_session, stock=1), "Idempotency-Key": "venta-1"}
+    payload = {"producto_id": 1, "cantidad": 2}
+
+    assert client.post("/ventas/registrar", json=payload, headers=headers).status_code == 400
+
+    crud.actualizar_producto(db_session, 1, schemas.ProductoActualizar(stock=5))
+    response = client.post("/ventas/registrar", json=payload, headers=headers)
+
+    assert response.status_code == 201
+    assert db_session.query(models.Venta).count() == 1
+
+
+def test_fallo_al_guardar_respuesta_no_deja_la_clave_tomada(client, db_session: Session):
+    """Test: Clave, venta y respuesta se confirman juntas; un fallo en medio no bloquea el reintento"""
+    headers = {**_preparar(client, db_session), "Idempotency-Key": "venta-1"}
+    payload = {"producto_id": 1, "cantidad": 2}
+
+    with patch("app.crud.guardar_respuesta_idempotencia", side_effect=RuntimeError("caída")):
+        with pytest.raises(RuntimeError):
+            client.post("/ventas/registrar", json=payload, headers=headers)
+
+    assert db_session.query(models.ClaveIdempotencia).count() == 0
+    assert db_session.query(models.Venta).count() == 0
+
+    response = client.post("/ventas/registrar", json=payload, headers=headers)
+
+    assert response.status_code == 201
+    assert db_session.query(models.Venta).count() == 1
+    db_session.expire_all()
+    assert db_session.get(models.Producto, 1).stock == 8
+
+
+def test_reclamar_clave_un_solo_ganador(db_session: Session):
+    """Test: Solo el primer reclamo de una clave gana; las expiradas se reemplazan"""
+    db_session.add(models.Usuario(nombre="V", email="v@test.com", password="x", rol="vendedor"))
+    db_session.commit()
+    expira = datetime.utcnow() + timedelta(hours=1)
+
+    _, primero = crud.reclamar_clave_idempotencia(db_session, 1, "/ventas", "k", "h", expira)
+    db_session.commit()
+    existente, segundo = crud.reclamar_clave_idempotencia(db_session, 1, "/ventas", "k", "h", expira)
+    assert primero is True
+    assert segundo is False
+    assert existente.estado_http is None
+
+    existente.expira = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    _, tras_expirar = crud.reclamar_clave_idempotencia(db_session, 1, "/ventas", "k", "h", expira)
+    assert tras_expirar is True
@@ -0,0 +1,134 @@
+"""
+Tests para el canal de inventario en tiempo real
+Verificación de deltas de stock por WebSocket y reanudación por secuencia
+"""
+import asyncio
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from app import auth
+from app.utils.inventario import CanalInventario, canal_inventario
+from tests.conftest import crear_usuario_y_login
+
+
+@pytest.fixture
+def admin_token(client):
+    """Crea usuario admin y retorna token JWT"""
+    return crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+
+
+@pytest.fixture
+def producto_id(client, admin_token):
+    """Crea producto de prueba vía API y retorna su ID"""
+    producto_data = {"nombre": "Producto WS", "precio": 10.0, "stock": 20, "activo": True}
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    return client.post("/productos/registrar", json=producto_data, headers=headers).json()["id"]
+
+
+def test_canal_deltas_desde_secuencia():
+    """Test: El canal retorna solo los deltas posteriores a la secuencia"""
+    canal = CanalInventario(capacidad=10)
+    canal.publicar(1, 9)
+    canal.publicar(2, 4)
+    canal.publicar(1, 8)
+
+    deltas = canal.deltas_desde(1)
+    assert [(d.producto_id, d.stock) for d in deltas] == [(2, 4), (1, 8)]
+    assert canal.deltas_desde(3) == []
+
+
+def test_canal_pide_resync_si_secuencia_fuera_de_historial():
+    """Test: Secuencias descartadas o futuras requieren resincronización"""
+    canal = CanalInventario(capacidad=2)
+    for stock in range(5):
+        canal.publicar(1, stock)
+
+    assert canal.deltas_desde(1) is None
+    assert [d.secuencia for d in canal.deltas_desde(3)] == [4, 5]
+    assert canal.deltas_desde(99) is None
+
+
+def test_ws_sin_token_valido_rechaza_conexion(client):
+    """Test: El WebSocket rechaza tokens inválidos"""
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/inventario/ws?token=invalido") as ws:
+            ws.receive_json()
+
+
+def test_ws_rechaza_token_revocado(client, admin_token):
+    """Test: El WebSocket aplica la revocación por token_version como los endpoints HTTP"""
+    vendedor_token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+    uid = auth.decodificar_token(vendedor_token)["uid"]
+    client.post(
+        f"/admin/usuarios/{uid}/revocar-tokens",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/inventario/ws?token={vendedor_token}") as ws:
+            ws.receive_json()
+
+
+def test_canal_desuscribir_quita_solo_su_evento():
+    """Test: Desuscribir elimina únicamente el evento indicado"""
+    canal = CanalInventario()
+
+    async def escenario():
+        primero, segundo = canal.suscribir(), canal.suscribir()
+        canal.desuscribir(primero)
+        canal.desuscribir(primero)
+        return segundo
+
+    segundo = asyncio.run(escenario())
+
+    assert canal.total_suscriptores == 1
+    canal.desuscribir(segundo)
+    assert canal.total_suscriptores == 0
+
+
+def test_ws_recibe_delta_al_actualizar_stock(client, admin_token, producto_id):
+    """Test: Un PATCH de stock llega como delta a los clientes conectados"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    with client.websocket_connect(f"/inventario/ws?token={admin_token}") as ws:
+        hola = ws.receive_json()
+        assert hola["tipo"] == "hola"
+
+        client.patch(f"/productos/{producto_id}", json={"stock": 7}, headers=headers)
+
+        mensaje = ws.receive_json()
+        assert mensaje["tipo"] == "deltas"
+        assert mensaje["deltas"][-1]["producto_id"] == producto_id
+        assert mensaje["deltas"][-1]["stock"] == 7
+        assert mensaje["secuencia"] > hola["secuencia"]
+
+
+def test_ws_reanuda_desde_secuencia(client, admin_token, producto_id):
+    """Test: Al reconectar con `desde` se reciben los deltas perdidos"""
+    vendedor_token = crear_usuario_y_login(client, "vendedor@test.com", "vend123", "vendedor")
+    secuencia = canal_inventario.secuencia_actual
+
+    # Venta mientras el cliente está desconectado
+    client.post(
+        "/ventas/registrar",
+        json={"producto_id": producto_id, "cantidad": 3},
+        headers={"Authorization": f"Bearer {vendedor_token}"}
+    )
+
+    url = (
+        f"/inventario/ws?token={vendedor_token}"
+        f"&desde={secuencia}&instancia={canal_inventario.instancia}"
+    )
+    with client.websocket_connect(url) as ws:
+        assert ws.receive_json()["tipo"] == "hola"
+        mensaje = ws.receive_json()
+        assert mensaje["tipo"] == "deltas"
+        assert mensaje["deltas"] == [
+            {"secuencia": secuencia + 1, "producto_id": producto_id, "stock": 17}
+        ]
+
+
+def test_ws_instancia_distinta_pide_resync(client, admin_token):
+    """Test: Una secuencia de otra instancia del servidor provoca resync"""
+    with client.websocket_connect(f"/inventario/ws?token={admin_token}&desde=0&instancia=otra") as ws:
+        assert ws.receive_json()["tipo"] == "hola"
+        assert ws.receive_json()["tipo"] == "resync"
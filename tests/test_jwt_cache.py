@@ -0,0 +1,67 @@
+"""
+Tests para el cache de tokens JWT decodificados
+Verificación de LRU, expiración y métricas
+"""
+import time
+from datetime import timedelta
+from app import auth
+from app.utils.jwt_cache import CacheTokens, cache_tokens
+
+
+def test_cache_retorna_claims_guardados():
+    """Test: Un token guardado se obtiene del cache y cuenta como acierto"""
+    cache = CacheTokens(capacidad=10)
+    claims = {"sub": "a@test.com", "exp": time.time() + 60}
+
+    assert cache.obtener("token-a") is None
+    cache.guardar("token-a", claims)
+    assert cache.obtener("token-a") == claims
+
+    stats = cache.estadisticas()
+    assert stats["aciertos"] == 1
+    assert stats["fallos"] == 1
+    assert stats["tamano"] == 1
+
+
+def test_cache_descarta_tokens_expirados():
+    """Test: Los claims expirados no se retornan"""
+    cache = CacheTokens(capacidad=10)
+    cache.guardar("token-a", {"sub": "a@test.com", "exp": time.time() - 1})
+
+    assert cache.obtener("token-a") is None
+    assert cache.estadisticas()["expirados"] == 1
+    assert cache.estadisticas()["tamano"] == 0
+
+
+def test_cache_expulsa_el_menos_usado():
+    """Test: Al superar la capacidad se expulsa la entrada menos reciente"""
+    cache = CacheTokens(capacidad=2)
+    exp = time.time() + 60
+    cache.guardar("a", {"exp": exp})
+    cache.guardar("b", {"exp": exp})
+    cache.obtener("a")
+    cache.guardar("c", {"exp": exp})
+
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") is not None
+    assert cache.estadisticas()["expulsiones"] == 1
+
+
+def test_cache_deshabilitado_no_guarda():
+    """Test: Con capacidad 0 el cache no guarda entradas"""
+    cache = CacheTokens(capacidad=0)
+    cache.guardar("a", {"exp": time.time() + 60})
+    assert cache.estadisticas()["tamano"] == 0
+
+
+def test_decodificar_token_usa_cache():
+    """Test: Decodificar dos veces el mismo token verifica la firma una sola vez"""
+    token = auth.crear_access_token({"sub": "cache@test.com"}, expires_delta=timedelta(minutes=5))
+    aciertos = cache_tokens.aciertos
+
+    primero = auth.decodificar_token(token)
+    segundo = auth.decodificar_token(token)
+
+    assert primero == segundo
+    assert primero["sub"] == "cache@test.com"
+    assert cache_tokens.aciertos == aciertos + 1
@@ -0,0 +1,142 @@
+"""
+Tests para el ruteo de lecturas a la réplica y la ventana de lectura en primario
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import database
+from app.database import Base
+from app.utils.lectura import COOKIE_PRIMARIA, LecturaConsistenteMiddleware, registro_escrituras
+from tests.conftest import crear_usuario_y_login
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Réplica vacía (con tablas) en otra base en memoria"""
+    engine_replica = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine_replica)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=engine_replica))
+    registro_escrituras.reiniciar()
+    yield engine_replica
+    registro_escrituras.reiniciar()
+    engine_replica.dispose()
+
+
+def _registrar_venta(client):
+    """Crea un vendedor con un producto y una venta; retorna su token"""
+    token_admin = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+    client.post(
+        "/productos/registrar",
+        json={"nombre": "Producto", "precio": 10.0, "stock": 5},
+        headers={"Authorization": f"Bearer {token_admin}"}
+    )
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+    respuesta = client.post(
+        "/ventas/registrar",
+        json={"producto_id": 1, "cantidad": 1},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert respuesta.status_code == 201
+    return token
+
+
+def test_sin_replica_lee_del_primario(client):
+    """Test: Sin READ_DATABASE_URL los listados leen del primario"""
+    token = _registrar_venta(client)
+
+    respuesta = client.get("/ventas/listar", headers={"Authorization": f"Bearer {token}"})
+
+    assert len(respuesta.json()) == 1
+
+
+def test_listado_lee_de_replica(client, replica):
+    """Test: Con réplica y sin escrituras recientes el listado usa la réplica"""
+    token = _registrar_venta(client)
+    registro_escrituras.reiniciar()
+
+    respuesta = client.get("/ventas/listar", headers={"Authorization": f"Bearer {token}"})
+
+    assert respuesta.status_code == 200
+    assert respuesta.json() == []
+
+
+def test_escritura_reciente_lee_del_primario(client, replica):
+    """Test: Tras escribir, las lecturas del mismo usuario van al primario"""
+    token = _registrar_venta(client)
+    registro_escrituras.reiniciar()
+    registro_escrituras.registrar(2)  # uid del vendedor (el admin es 1)
+
+    respuesta = client.get("/ventas/listar", headers={"Authorization": f"Bearer {token}"})
+
+    assert len(respuesta.json()) == 1
+
+
+def test_cookie_de_escritura_lee_del_primario(client, replica):
+    """Test: La cookie de escritura reciente fuerza el primario en cualquier worker"""
+    token = _registrar_venta(client)
+    registro_escrituras.reiniciar()
+    client.cookies.set(COOKIE_PRIMARIA, "1")
+
+    respuesta = client.get("/ventas/listar", headers={"Authorization": f"Bearer {token}"})
+
+    assert len(respuesta.json()) == 1
+
+
+def test_middleware_marca_solo_escrituras_exitosas(client):
+    """Test: El middleware registra al usuario y agrega la cookie solo en escrituras < 400"""
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+    registro_escrituras.reiniciar()
+
+    app = FastAPI()
+    app.add_middleware(LecturaConsistenteMiddleware, ventana=5)
+
+    @app.get("/leer")
+    def leer():
+        return {}
+
+    @app.post("/escribir")
+    def escribir():
+        return {}
+
+    @app.post("/fallar", status_code=400)
+    def fallar():
+        return {}
+
+    with TestClient(app) as cliente:
+        headers = {"Authorization": f"Bearer {token}"}
+        assert "set-cookie" not in cliente.get("/leer", headers=headers).headers
+        assert "set-cookie" not in cliente.post("/fallar", headers=headers).headers
+        assert not registro_escrituras.reciente(1)
+
+        respuesta = cliente.post("/escribir", headers=headers)
+
+    assert f"{COOKIE_PRIMARIA}=1" in respuesta.headers["set-cookie"]
+    assert "Max-Age=5" in respuesta.headers["set-cookie"]
+    assert registro_escrituras.reciente(1)
+    registro_escrituras.reiniciar()
+
+
+def test_middleware_ignora_escrituras_anonimas_y_redondea_la_ventana(client):
+    """Test: Login y registro no reciben la cookie; una ventana de 0.5 s da Max-Age=1"""
+    token = crear_usuario_y_login(client, "vendedor@test.com", "vendedor123")
+    registro_escrituras.reiniciar()
+
+    app = FastAPI()
+    app.add_middleware(LecturaConsistenteMiddleware, ventana=0.5)
+
+    @app.post("/escribir")
+    def escribir():
+        return {}
+
+    with TestClient(app) as cliente:
+        anonima = cliente.post("/escribir")
+        autenticada = cliente.post("/escribir", headers={"Authorization": f"Bearer {token}"})
+
+    assert "set-cookie" not in anonima.headers
+    assert "Max-Age=1;" in autenticada.headers["set-cookie"]
+    registro_escrituras.reiniciar()
@@ -0,0 +1,108 @@
+"""
+Tests para el tiempo límite y la cancelación de consultas de reportes
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolAgotado
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.utils.limites_consulta import LimiteConsulta, consulta_limitada
+from tests.conftest import crear_usuario_y_login
+
+# Consulta que tarda varios segundos en SQLite
+CONSULTA_LENTA = text(
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 100000000) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.fixture
+def app_limitada(db_session):
+    """App mínima con un endpoint lento y uno rápido limitados a 50 ms"""
+    app = FastAPI()
+
+    @app.get("/lenta")
+    def lenta(db: Session = Depends(consulta_limitada(50))):
+        return {"n": db.execute(CONSULTA_LENTA).scalar()}
+
+    @app.get("/rapida")
+    def rapida(db: Session = Depends(consulta_limitada(50))):
+        return {"n": db.execute(text("SELECT 1")).scalar()}
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+def test_consulta_excedida_responde_504(app_limitada):
+    """Test: Una consulta que supera el límite se corta y responde 504"""
+    respuesta = app_limitada.get("/lenta")
+
+    assert respuesta.status_code == 504
+    assert "50 ms" in respuesta.json()["detail"]
+
+
+def test_limite_no_afecta_consultas_rapidas_ni_persiste(app_limitada, db_session):
+    """Test: Las consultas rápidas responden y la conexión queda sin límite"""
+    app_limitada.get("/lenta")
+
+    assert app_limitada.get("/rapida").json() == {"n": 1}
+    assert db_session.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_cancelar_interrumpe_la_consulta_en_curso(db_session):
+    """Test: cancelar() desde otro hilo corta la sentencia (desconexión del cliente)"""
+    limite = LimiteConsulta(db_session, 60_000)
+    limite.aplicar()
+    threading.Timer(0.05, limite.cancelar).start()
+
+    with pytest.raises(OperationalError) as error:
+        db_session.execute(CONSULTA_LENTA)
+
+    assert limite.interrumpio(error.value)
+    assert not limite.vencido()
+    limite.liberar()
+    db_session.rollback()
+
+
+def test_plazo_cuenta_por_sentencia(db_session):
+    """Test: El plazo se reinicia con cada sentencia, no desde que se tomó la sesión"""
+    limite = LimiteConsulta(db_session, 100)
+    limite.aplicar()
+    time.sleep(0.15)
+
+    assert db_session.execute(text("SELECT 1")).scalar() == 1
+    assert not limite.vencido()
+    limite.liberar()
+    db_session.rollback()
+
+
+def test_sin_token_no_toma_conexion(client, monkeypatch):
+    """Test: Un request anónimo responde 401 sin llegar a fijar el límite en una conexión"""
+    aplicar = MagicMock()
+    monkeypatch.setattr(LimiteConsulta, "aplicar", aplicar)
+
+    respuesta = client.get("/reportes/resumen")
+
+    assert respuesta.status_code == 401
+    aplicar.assert_not_called()
+
+
+def test_pool_agotado_responde_503(client, monkeypatch):
+    """Test: Sin conexiones libres en el pool la API responde 503 con Retry-After"""
+    token = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+
+    def sin_conexiones(self):
+        raise PoolAgotado("QueuePool limit reached")
+
+    monkeypatch.setattr(LimiteConsulta, "aplicar", sin_conexiones)
+    respuesta = client.get("/reportes/resumen", headers={"Authorization": f"Bearer {token}"})
+
+    assert respuesta.status_code == 503
+    assert "Retry-After" in respuesta.headers
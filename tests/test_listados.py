@@ -0,0 +1,105 @@
+"""
+Tests para las consultas de listado con proyección de columnas
+"""
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+from tests.conftest import crear_usuario_y_login
+
+
+def _poblar(db: Session):
+    """Crea dos vendedores, un producto y tres ventas"""
+    for email in ("a@test.com", "b@test.com"):
+        db.add(models.Usuario(nombre=email, email=email, password="x", rol="vendedor"))
+    db.add(models.Producto(nombre="Producto", precio=10.0, stock=5, activo=True))
+    db.commit()
+    for vendedor_id in (1, 1, 2):
+        db.add(models.Venta(producto_id=1, vendedor_id=vendedor_id, cantidad=1, total=10.0))
+    db.commit()
+    db.expunge_all()
+
+
+def test_listar_productos_filas_no_carga_entidades(db_session: Session):
+    """Test: Las filas proyectadas no registran entidades en la sesión"""
+    _poblar(db_session)
+
+    filas = crud.listar_productos_filas(db_session)
+
+    assert len(filas) == 1
+    assert not isinstance(filas[0], models.Producto)
+    assert tuple(filas[0]._fields) == tuple(schemas.ProductoResponse.model_fields)
+    assert len(db_session.identity_map) == 0
+
+
+def test_listar_ventas_filas_filtra_por_vendedor(db_session: Session):
+    """Test: El filtro por vendedor retorna solo sus ventas"""
+    _poblar(db_session)
+
+    assert len(crud.listar_ventas_filas(db_session)) == 3
+    propias = crud.listar_ventas_filas(db_session, vendedor_id=1)
+    assert [v.vendedor_id for v in propias] == [1, 1]
+    assert len(db_session.identity_map) == 0
+
+
+def _poblar_usuarios(db: Session):
+    """Crea un admin y cinco vendedores (uno con comodín en el email)"""
+    db.add(models.Usuario(nombre="Admin", email="admin@test.com", password="hash", rol="admin"))
+    for i in range(4):
+        db.add(models.Usuario(nombre=f"V{i}", email=f"vend{i}@test.com", password="hash", rol="vendedor"))
+    db.add(models.Usuario(nombre="Raro", email="ve%x@test.com", password="hash", rol="vendedor"))
+    db.commit()
+    db.expunge_all()
+
+
+def test_listar_usuarios_filas_pagina_sin_password(db_session: Session, contador_consultas):
+    """Test: Las páginas siguen el cursor por id y la consulta no lee el password"""
+    _poblar_usuarios(db_session)
+    contador_consultas.clear()
+
+    primera = crud.listar_usuarios_filas(db_session, limite=2)
+    segunda = crud.listar_usuarios_filas(db_session, limite=2, despues_de=primera[-1].id)
+
+    assert [u.id for u in primera] == [1, 2]
+    assert [u.id for u in segunda] == [3, 4]
+    assert tuple(primera[0]._fields) == tuple(schemas.UsuarioResponse.model_fields)
+    assert not any("password" in consulta for consulta in contador_consultas)
+
+
+def test_listar_usuarios_filtra_por_rol_y_prefijo(db_session: Session):
+    """Test: Los filtros de rol y prefijo se combinan y escapan comodines"""
+    _poblar_usuarios(db_session)
+
+    vendedores = crud.listar_usuarios_filas(db_session, rol="vendedor")
+    assert len(vendedores) == 5
+    assert crud.contar_usuarios(db_session, rol="admin") == 1
+    assert crud.contar_usuarios(db_session, email_prefijo="vend") == 4
+    assert [u.email for u in crud.listar_usuarios_filas(db_session, email_prefijo="ve%")] == ["ve%x@test.com"]
+
+
+def test_endpoint_usuarios_headers_de_paginacion(client, contador_consultas):
+    """Test: /admin/usuarios informa el total y el cursor de la página siguiente"""
+    token = crear_usuario_y_login(client, "admin@test.com", "admin123", "admin")
+    for i in range(3):
+        crear_usuario_y_login(client, f"vend{i}@test.com", "vendedor123")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/admin/usuarios?limite=2&rol=vendedor", headers=headers)
+
+    assert response.status_code == 200
+    assert [u["email"] for u in response.json()] == ["vend0@test.com", "vend1@test.com"]
+    assert "password" not in response.json()[0]
+    assert response.headers["X-Total-Count"] == "3"
+    cursor = response.headers["X-Next-Cursor"]
+
+    contador_consultas.clear()
+    ultima = client.get(f"/admin/usuarios?limite=2&rol=vendedor&despues_de={cursor}", headers=headers)
+    assert [u["email"] for u in ultima.json()] == ["vend2@test.com"]
+    assert "X-Next-Cursor" not in ultima.headers
+    # Las páginas siguientes no repiten el COUNT
+    assert "X-Total-Count" not in ultima.headers
+    assert not any("count(" in consulta.lower() for consulta in contador_consultas)
+
+    # Una primera página incompleta ya es el total
+    contador_consultas.clear()
+    completa = client.get("/admin/usuarios?limite=10&rol=vendedor", headers=headers)
+    assert completa.headers["X-Total-Count"] == "3"
+    assert not any("count(" in consulta.lower() for consulta in contador_consultas)
@@ -0,0 +1,82 @@
+"""
+Tests para el DDL y el mantenimiento de particiones mensuales de ventas
+"""
+from contextlib import contextmanager
+from datetime import date
+from types import SimpleNamespace
+from app.utils import particiones
+from tests.conftest import engine
+
+
+def test_sumar_meses_cruza_anios():
+    """Test: Aritmética de meses hacia adelante y hacia atrás"""
+    assert particiones.sumar_meses(date(2026, 11, 15), 2) == date(2027, 1, 1)
+    assert particiones.sumar_meses(date(2026, 1, 31), -1) == date(2025, 12, 1)
+    assert particiones.sumar_meses(date(2026, 3, 1), 0) == date(2026, 3, 1)
+
+
+def test_ddl_particion_mensual():
+    """Test: La partición cubre el mes completo con límite superior exclusivo"""
+    assert particiones.nombre_particion(date(2026, 2, 10)) == "ventas_2026_02"
+    assert particiones.ddl_crear_particion(date(2026, 12, 31)) == (
+        "CREATE TABLE IF NOT EXISTS ventas_2026_12 PARTITION OF ventas "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+    assert particiones.ddl_desacoplar_particion("ventas_2024_01") == (
+        "ALTER TABLE ventas DETACH PARTITION ventas_2024_01"
+    )
+    assert particiones.ddl_eliminar_particion("ventas_2024_01") == "DROP TABLE ventas_2024_01"
+
+
+def test_meses_entre_incluye_extremos():
+    """Test: Se generan todos los meses entre ambas fechas"""
+    meses = particiones.meses_entre(date(2026, 11, 20), date(2027, 2, 3))
+
+    assert meses == [date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1), date(2027, 2, 1)]
+
+
+def test_particiones_a_desacoplar_respeta_retencion():
+    """Test: Solo se desacoplan los meses fuera del período retenido"""
+    adjuntas = ["ventas_2025_03", "ventas_2025_04", "ventas_2025_05", "ventas_2026_10", "ventas_default"]
+
+    antiguas = particiones.particiones_a_desacoplar(adjuntas, retener=18, hoy=date(2026, 10, 19))
+
+    # 18 meses incluyendo octubre 2026: desde mayo 2025
+    assert antiguas == ["ventas_2025_03", "ventas_2025_04"]
+
+
+def test_mantenimiento_es_noop_fuera_de_postgres():
+    """Test: En SQLite no hay particiones que crear ni desacoplar"""
+    assert particiones.crear_particiones_futuras(engine) == []
+    assert particiones.desacoplar_particiones_antiguas(engine) == []
+
+
+def test_solo_se_retiran_particiones_ya_archivadas(monkeypatch):
+    """Test: Una partición antigua con ventas sin archivar queda adjunta; las vacías se desacoplan y eliminan"""
+    ejecutadas = []
+
+    class Conexion:
+        def execute(self, sentencia, parametros=None):
+            sql = str(sentencia)
+            ejecutadas.append(sql)
+            return SimpleNamespace(scalar=lambda: sql == "SELECT EXISTS (SELECT 1 FROM ventas_2024_01)")
+
+    class Engine:
+        @contextmanager
+        def begin(self):
+            yield Conexion()
+
+    monkeypatch.setattr(particiones, "esta_particionada", lambda conexion: True)
+    monkeypatch.setattr(
+        particiones, "listar_particiones",
+        lambda conexion: ["ventas_2024_01", "ventas_2024_02", "ventas_2026_10", "ventas_default"]
+    )
+
+    retiradas = particiones.desacoplar_particiones_antiguas(Engine(), retener=18, hoy=date(2026, 10, 19))
+
+    assert retiradas == ["ventas_2024_02"]
+    assert "ALTER TABLE ventas DETACH PARTITION ventas_2024_01" not in ejecutadas
+    assert ejecutadas[-2:] == [
+        "ALTER TABLE ventas DETACH PARTITION ventas_2024_02",
+        "DROP TABLE ventas_2024_02",
+    ]
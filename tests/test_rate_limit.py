@@ -0,0 +1,76 @@
+"""
+Tests para el limitador de intentos de login
+Verificación de token buckets por IP y email antes de bcrypt
+"""
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import pytest
+from app.utils.rate_limit import (
+    AlmacenLimites, AlmacenMemoria, AlmacenRedis, LimitadorLogin, crear_almacen, limitador_login
+)
+
+
+def test_bucket_permite_rafaga_y_luego_rechaza():
+    """Test: El bucket permite `capacidad` intentos y luego indica la espera"""
+    almacen = AlmacenMemoria()
+    for _ in range(3):
+        assert almacen.consumir("ip:1.2.3.4", 3, 1.0) == 0
+    espera = almacen.consumir("ip:1.2.3.4", 3, 1.0)
+    assert 0 < espera <= 1.0
+
+
+def test_bucket_se_recarga_con_el_tiempo():
+    """Test: Los tokens se recuperan según la tasa de recarga"""
+    almacen = AlmacenMemoria()
+    with patch("app.utils.rate_limit.time.monotonic", return_value=100.0):
+        almacen.consumir("k", 1, 0.5)
+        assert almacen.consumir("k", 1, 0.5) > 0
+    with patch("app.utils.rate_limit.time.monotonic", return_value=103.0):
+        assert almacen.consumir("k", 1, 0.5) == 0
+
+
+def test_almacen_segun_configuracion(monkeypatch):
+    """Test: Sin URL se usa la memoria del proceso; con URL, Redis"""
+    assert isinstance(crear_almacen(""), AlmacenMemoria)
+
+    cliente = MagicMock()
+    redis = SimpleNamespace(Redis=SimpleNamespace(from_url=MagicMock(return_value=cliente)))
+    monkeypatch.setitem(sys.modules, "redis", redis)
+
+    almacen = crear_almacen("redis://cache:6379/0")
+
+    assert isinstance(almacen, AlmacenRedis)
+    redis.Redis.from_url.assert_called_once_with("redis://cache:6379/0")
+    cliente.register_script.assert_called_once()
+
+
+def test_almacen_es_abstracto():
+    """Test: Un almacén sin consumir/limpiar no se puede instanciar"""
+    with pytest.raises(TypeError):
+        AlmacenLimites()
+
+
+def test_limitador_por_email_independiente_de_ip():
+    """Test: El límite por email aplica aunque el atacante cambie de IP"""
+    limitador = LimitadorLogin(AlmacenMemoria())
+    resultados = [limitador.verificar(f"10.0.0.{i}", "Victima@Test.com ") for i in range(10)]
+
+    assert resultados[:5] == [0] * 5
+    assert all(r >= 1 for r in resultados[5:])
+    assert limitador.rechazados == 5
+
+
+def test_login_rechazado_antes_de_bcrypt(client):
+    """Test: Superado el límite, /auth/login retorna 429 sin verificar credenciales"""
+    login_data = {"username": "atacado@test.com", "password": "incorrecta"}
+    for _ in range(5):
+        assert client.post("/auth/login", data=login_data).status_code == 401
+
+    with patch("app.auth.verificar_credenciales") as mock_verificar:
+        response = client.post("/auth/login", data=login_data)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    mock_verificar.assert_not_called()
+    assert limitador_login.rechazados == 1
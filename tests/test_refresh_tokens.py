@@ -0,0 +1,83 @@
+"""
+Tests para renovación de sesiones con refresh tokens
+Verificación de rotación, detección de reuso y cierre de sesión
+"""
+import pytest
+from unittest.mock import patch
+from app import auth, crud, models
+
+
+@pytest.fixture
+def sesion(client):
+    """Registra un vendedor, hace login y retorna la respuesta del login"""
+    client.post("/auth/registrar", json={
+        "nombre": "Vendedor Refresh",
+        "email": "refresh@test.com",
+        "password": "refresh123",
+        "rol": "vendedor"
+    })
+    response = client.post("/auth/login", data={"username": "refresh@test.com", "password": "refresh123"})
+    return response.json()
+
+
+def test_login_entrega_refresh_token(sesion, db_session):
+    """Test: El login retorna un refresh token que se guarda solo como HMAC"""
+    assert sesion["refresh_token"]
+
+    db_token = db_session.query(models.RefreshToken).one()
+    assert db_token.token_hash == auth.hashear_refresh_token(sesion["refresh_token"])
+    assert db_token.token_hash != sesion["refresh_token"]
+
+
+def test_refresh_rota_token_sin_verificar_password(client, sesion):
+    """Test: /auth/refresh entrega tokens nuevos sin ejecutar bcrypt"""
+    with patch("app.auth.verificar_password") as mock_bcrypt:
+        response = client.post("/auth/refresh", json={"refresh_token": sesion["refresh_token"]})
+
+    assert response.status_code == 200
+    mock_bcrypt.assert_not_called()
+
+    data = response.json()
+    assert data["refresh_token"] != sesion["refresh_token"]
+    me = client.get("/auth/me", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert me.json()["email"] == "refresh@test.com"
+
+
+def test_reuso_de_refresh_token_revoca_la_familia(client, sesion):
+    """Test: Reutilizar un refresh token rotado invalida toda la sesión"""
+    rotado = client.post("/auth/refresh", json={"refresh_token": sesion["refresh_token"]}).json()
+
+    reuso = client.post("/auth/refresh", json={"refresh_token": sesion["refresh_token"]})
+    assert reuso.status_code == 401
+
+    response = client.post("/auth/refresh", json={"refresh_token": rotado["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_refresh_token_invalido(client):
+    """Test: Un refresh token desconocido retorna 401"""
+    response = client.post("/auth/refresh", json={"refresh_token": "no-existe"})
+    assert response.status_code == 401
+
+
+def test_logout_revoca_refresh_token(client, sesion):
+    """Test: Tras /auth/logout el refresh token deja de servir"""
+    response = client.post("/auth/logout", json={"refresh_token": sesion["refresh_token"]})
+    assert response.status_code == 204
+
+    response = client.post("/auth/refresh", json={"refresh_token": sesion["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_rotacion_concurrente_solo_una_gana(sesion, db_session):
+    """Test: Si dos requests leen el mismo token vigente, el segundo en rotar se trata como reuso"""
+    token = sesion["refresh_token"]
+    db_token, usuario = crud.obtener_refresh_token(db_session, auth.hashear_refresh_token(token))
+    db_session.expunge_all()  # lectura del request que pierde la carrera
+
+    assert auth.renovar_sesion(db_session, token) is not None
+    with patch("app.crud.obtener_refresh_token", return_value=(db_token, usuario)):
+        assert auth.renovar_sesion(db_session, token) is None
+
+    vigentes = db_session.query(models.RefreshToken).filter(models.RefreshToken.revocado == False).count()
+    assert vigentes == 0
@@ -0,0 +1,106 @@
+"""
+Tests para el calentamiento al arrancar y el endpoint de readiness
+"""
+import functools
+import inspect
+import re
+from decimal import Decimal
+from pathlib import Path
+from app import auth, crud, models
+from app.utils import calentamiento
+from app.utils.limites_consulta import LimiteConsulta
+from tests.conftest import engine, TestingSessionLocal
+
+
+def test_listo_tras_lifespan(client):
+    """Test: Con el lifespan ejecutado la instancia reporta readiness (sin calentamiento en tests)"""
+    response = client.get("/salud/listo")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["listo"] is True
+    assert data["calentamiento"] == {}
+
+
+def test_no_listo_sin_lifespan(client):
+    """Test: Antes de completar el calentamiento responde 503"""
+    client.app.state.listo = False
+
+    response = client.get("/salud/listo")
+    assert response.status_code == 503
+    assert response.json()["listo"] is False
+
+
+def test_calentar_ejecuta_todos_los_pasos(db_session):
+    """Test: El calentamiento abre conexiones, compila consultas y ceba caches"""
+    resultado = calentamiento.calentar(engine, TestingSessionLocal)
+
+    assert resultado["conexiones"]["resultado"] >= 1
+    assert resultado["consultas"]["resultado"] > 0
+    assert "error" not in resultado["caches"]
+
+
+def _funciones_de_rutas() -> set:
+    """Funciones de crud que llaman los routers (y auth), directamente o a través de otra de crud"""
+    publicas = {n for n, f in vars(crud).items() if inspect.isfunction(f) and f.__module__ == "app.crud"}
+    fuentes = [p.read_text() for p in Path(inspect.getfile(crud)).parent.joinpath("routers").glob("*.py")]
+    fuentes.append(inspect.getsource(auth))
+    pendientes = {n for n in publicas if any(f"crud.{n}(" in fuente for fuente in fuentes)}
+    alcanzadas = set()
+    while pendientes:
+        nombre = pendientes.pop()
+        alcanzadas.add(nombre)
+        cuerpo = inspect.getsource(getattr(crud, nombre))
+        pendientes |= {n for n in publicas - alcanzadas if re.search(rf"\b{n}\(", cuerpo)}
+    return alcanzadas
+
+
+def test_calentar_solo_ejecuta_consultas_de_las_rutas(db_session, monkeypatch):
+    """Test: Cada función de crud que llama el calentamiento la usa alguna ruta"""
+    llamadas = set()
+    en_curso = []
+
+    def espiar(nombre, funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not en_curso:
+                llamadas.add(nombre)
+            en_curso.append(nombre)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                en_curso.pop()
+        return envoltura
+
+    for nombre, funcion in list(vars(crud).items()):
+        if inspect.isfunction(funcion) and funcion.__module__ == "app.crud" and not nombre.startswith("_"):
+            monkeypatch.setattr(crud, nombre, espiar(nombre, funcion))
+
+    resultado = calentamiento.calentar(engine, TestingSessionLocal)
+
+    assert not any("error" in paso for paso in resultado.values())
+    assert {"listar_productos_filas", "obtener_estadisticas_vendedor", "obtener_top_vendedores"} <= llamadas
+    assert llamadas - _funciones_de_rutas() == set()
+
+
+def test_calentar_acota_los_reportes(db_session, monkeypatch):
+    """Test: Un reporte que supera el límite se corta y el arranque sigue"""
+    db_session.add(models.Usuario(nombre="Vendedor", email="v@test.com", password="x", rol="vendedor"))
+    db_session.add(models.Producto(nombre="Producto", precio=Decimal("1.00"), stock=1000, activo=True))
+    db_session.add_all(
+        models.Venta(producto_id=1, vendedor_id=1, cantidad=1, total=Decimal("1.00")) for _ in range(500)
+    )
+    db_session.commit()
+    monkeypatch.setattr(LimiteConsulta, "vencido", lambda self: True)
+
+    resultado = calentamiento.calentar(engine, TestingSessionLocal)
+
+    assert resultado["reportes"]["resultado"] == {"completados": 0, "cortados": 5}
+    assert "error" not in resultado["caches"]
+
+
+def test_calentar_no_falla_si_la_bd_no_esta_lista():
+    """Test: Un paso con error se reporta sin detener el arranque"""
+    resultado = calentamiento.calentar(engine, TestingSessionLocal)
+
+    assert "error" in resultado["consultas"]
@@ -79,3 +79,41 @@ def test_seed_database_is_idempotent():
 
     finally:
         db.close()
+
+def test_sembrar_volumen_genera_datos_reproducibles(tmp_path):
+    """
+    Valida que el seed de volumen inserta las cantidades pedidas,
+    con totales coherentes y datos idénticos para la misma semilla
+    """
+    from datetime import datetime
+    from sqlalchemy import create_engine, func
+    from sqlalchemy.orm import sessionmaker
+    from app.models import Base
+    from app.scripts.seed_database import sembrar_volumen
+
+    resultados = []
+    for nombre in ("a", "b"):
+        engine = create_engine(f"sqlite:///{tmp_path / nombre}.db")
+        Base.metadata.create_all(bind=engine)
+        sembrar_volumen(
+            engine, vendedores=5, productos=20, ventas=1000, dias=30,
+            semilla=7, lote=128, hasta=datetime(2025, 1, 1), progreso=lambda _: None
+        )
+
+        db = sessionmaker(bind=engine)()
+        assert db.query(Usuario).filter(Usuario.rol == "vendedor").count() == 5
+        assert db.query(Producto).count() == 20
+        assert db.query(Venta).count() == 1000
+        assert db.query(func.min(Venta.fecha)).scalar() >= datetime(2024, 12, 2)
+        assert db.query(func.max(Venta.fecha)).scalar() < datetime(2025, 1, 1)
+
+        precios = {p.id: p.precio for p in db.query(Producto).all()}
+        ventas = db.query(Venta).order_by(Venta.id).all()
+        for venta in ventas:
+            assert abs(venta.total - precios[venta.producto_id] * venta.cantidad) < 0.01
+
+        resultados.append([(v.producto_id, v.vendedor_id, v.cantidad, v.fecha) for v in ventas])
+        db.close()
+        engine.dispose()
+
+    assert resultados[0] == resultados[1]
@@ -0,0 +1,33 @@
+"""
+Tests para el middleware ASGI de headers de seguridad
+"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.utils.seguridad import CabecerasSeguridadMiddleware
+
+app_prueba = FastAPI()
+app_prueba.add_middleware(CabecerasSeguridadMiddleware)
+
+@app_prueba.get("/csv")
+def csv():
+    return StreamingResponse(iter([b"id,nombre\n", b"1,Ana\n"]), media_type="text/csv")
+
+
+def test_headers_de_seguridad_en_api(client):
+    """Test: La API agrega los headers de seguridad"""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["content-type"].startswith("application/json")
+
+
+def test_respeta_content_type_y_streaming():
+    """Test: Las respuestas no JSON conservan su Content-Type y su cuerpo en streaming"""
+    response = TestClient(app_prueba).get("/csv")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.text == "id,nombre\n1,Ana\n"
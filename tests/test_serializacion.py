@@ -0,0 +1,40 @@
+"""
+Tests para la serialización directa de filas ORM con orjson
+"""
+import json
+from datetime import datetime
+from decimal import Decimal
+from pydantic import TypeAdapter
+from app import models, schemas
+from app.utils.serializacion import respuesta_filas, serializar_filas
+
+
+def test_serializar_filas_equivale_a_response_model():
+    """Test: La salida coincide con la serialización del response_model"""
+    ventas = [
+        models.Venta(id=1, producto_id=2, vendedor_id=3, cantidad=2, total=39.98,
+                     fecha=datetime(2025, 1, 1, 12, 30, 15, 250)),
+        models.Venta(id=2, producto_id=4, vendedor_id=3, cantidad=1, total=10.0,
+                     fecha=datetime(2025, 1, 2)),
+    ]
+    adaptador = TypeAdapter(list[schemas.VentaResponse])
+    esperado = adaptador.dump_python(adaptador.validate_python(ventas, from_attributes=True), mode="json")
+
+    assert json.loads(serializar_filas(ventas, schemas.VentaResponse)) == esperado
+
+
+def test_serializar_filas_solo_expone_campos_del_schema():
+    """Test: Atributos fuera del schema (como el password) no se serializan"""
+    usuario = models.Usuario(id=1, nombre="Ana", email="ana@test.com", password="hash", rol="admin")
+
+    datos = json.loads(serializar_filas([usuario], schemas.UsuarioResponse))
+    assert datos == [{"nombre": "Ana", "email": "ana@test.com", "id": 1, "rol": "admin"}]
+
+
+def test_respuesta_filas_serializa_decimal():
+    """Test: Los Decimal se serializan como números JSON"""
+    producto = models.Producto(id=1, nombre="P", descripcion=None, precio=Decimal("12.50"), stock=3, activo=True)
+
+    response = respuesta_filas([producto], schemas.ProductoResponse)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)[0]["precio"] == 12.5